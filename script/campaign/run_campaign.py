@@ -0,0 +1,19 @@
+import sys
+
+from context import src
+
+
+"""
+This script runs all optimization sweeps of a campaign specification
+on a single Dask cluster, e.g.,
+
+    python script/campaign/run_campaign.py script/campaign/uniform_amplitude_damping.yaml
+
+See ``src.expand_campaign`` for the format of the campaign specification.
+"""
+
+
+if __name__ == "__main__":
+
+    for campaign_filepath in sys.argv[1:]:
+        src.run_campaign(campaign_filepath)
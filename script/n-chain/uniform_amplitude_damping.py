@@ -1,5 +1,3 @@
-from dask.distributed import Client
-import time
 from pennylane import numpy as np
 import pennylane as qml
 
@@ -21,16 +19,7 @@ local qubit measurements and maximally entangled state preparations.
 
 
 def uniform_amplitude_damping_nodes_fn(n):
-    def noise_nodes(noise_args):
-        return [
-            qnet.NoiseNode(
-                [i, 2 * n + i],
-                lambda settings, wires: qnet.pure_amplitude_damping([noise_args], wires=wires),
-            )
-            for i in range(2 * n)
-        ]
-
-    return noise_nodes
+    return src.qubit_amplitude_damping_nodes_fn(range(2 * n))
 
 
 if __name__ == "__main__":
@@ -38,251 +27,178 @@ if __name__ == "__main__":
     data_dir = "data/n-chain/uniform_amplitude_damping/"
     param_range = np.arange(0, 1.01, 0.05)
 
-    for n in [3, 4]:
+    sweep_kwargs = {
+        "param_range": param_range,
+        "data_dir": data_dir,
+        "quantum_bound": np.sqrt(2),
+        "classical_bound": 1,
+    }
+
+    # a single cluster runs all sweeps, worker memory is bounded instead of restarting workers
+    client = src.sweep_client(n_workers=5, threads_per_worker=1, memory_limit="4GB")
 
-        client = Client(processes=True, n_workers=5, threads_per_worker=1)
+    sweeps = []
+    for n in [3, 4]:
 
         # """
         # Minimal optimal ansatz
         # """
-        # time_start = time.time()
-
-        # ryrz_cnot_local_ry_opt = src.noisy_net_opt_fn(
-        #     src.chain_ryrz_cnot_prep_nodes(n),
-        #     src.chain_local_ry_meas_nodes(n),
-        #     uniform_amplitude_damping_nodes_fn(n),
-        #     qnet.nlocal_chain_cost_22,
-        #     ansatz_kwargs={
-        #         "dev_kwargs": {
-        #             "name": "default.qubit",
-        #         },
-        #     },
-        #     opt_kwargs={
-        #         "sample_width": 5,
-        #         "step_size": 1.3,
-        #         "num_steps": 80,
-        #         "verbose": True,
-        #     },
-        # )
-        # ryrz_cnot_local_ry_jobs = client.map(ryrz_cnot_local_ry_opt, param_range)
-        # ryrz_cnot_local_ry_opt_dicts = client.gather(ryrz_cnot_local_ry_jobs)
-
-        # src.save_optimizations_one_param_scan(
-        #     data_dir,
-        #     "ryrz_cnot_local_ry_n-" + str(n) + "_",
-        #     param_range,
-        #     ryrz_cnot_local_ry_opt_dicts,
-        #     quantum_bound=np.sqrt(2),
-        #     classical_bound=1,
+        # sweeps.append(
+        #     {
+        #         "optimize": src.noisy_net_opt_fn(
+        #             src.chain_ryrz_cnot_prep_nodes(n),
+        #             src.chain_local_ry_meas_nodes(n),
+        #             uniform_amplitude_damping_nodes_fn(n),
+        #             src.factorized_nlocal_chain_cost_22,
+        #             ansatz_kwargs={"dev_kwargs": {"name": "default.qubit",},},
+        #             opt_kwargs={
+        #                 "sample_width": 5,
+        #                 "step_size": 1.3,
+        #                 "num_steps": 80,
+        #                 "verbose": True,
+        #             },
+        #         ),
+        #         "opt_name": "ryrz_cnot_local_ry_n-" + str(n) + "_",
+        #         **sweep_kwargs,
+        #     }
         # )
 
-        # time_elapsed = time.time() - time_start
-        # print("\nelapsed time : ", time_elapsed, "\n")
-
-        # # client.restart()
-
         """
         Minimal optimal ansatz
         """
-        time_start = time.time()
-
-        ryrz_cnot_local_rot_opt = src.noisy_net_opt_fn(
-            src.chain_ryrz_cnot_prep_nodes(n),
-            src.chain_local_rot_meas_nodes(n),
-            uniform_amplitude_damping_nodes_fn(n),
-            qnet.nlocal_chain_cost_22,
-            ansatz_kwargs={"dev_kwargs": {"name": "default.qubit",},},
-            opt_kwargs={"sample_width": 5, "step_size": 1.3, "num_steps": 80, "verbose": True,},
-        )
-        ryrz_cnot_local_rot_jobs = client.map(ryrz_cnot_local_rot_opt, param_range)
-        ryrz_cnot_local_rot_opt_dicts = client.gather(ryrz_cnot_local_rot_jobs)
-
-        src.save_optimizations_one_param_scan(
-            data_dir,
-            "ryrz_cnot_local_rot_n-" + str(n) + "_",
-            param_range,
-            ryrz_cnot_local_rot_opt_dicts,
-            quantum_bound=np.sqrt(2),
-            classical_bound=1,
+        sweeps.append(
+            {
+                "optimize": src.noisy_net_opt_fn(
+                    src.chain_ryrz_cnot_prep_nodes(n),
+                    src.chain_local_rot_meas_nodes(n),
+                    uniform_amplitude_damping_nodes_fn(n),
+                    src.factorized_nlocal_chain_cost_22,
+                    ansatz_kwargs={"dev_kwargs": {"name": "default.qubit",},},
+                    opt_kwargs={
+                        "sample_width": 5,
+                        "step_size": 1.3,
+                        "num_steps": 80,
+                        "verbose": True,
+                    },
+                ),
+                "opt_name": "ryrz_cnot_local_rot_n-" + str(n) + "_",
+                **sweep_kwargs,
+            }
         )
 
-        time_elapsed = time.time() - time_start
-        print("\nelapsed time : ", time_elapsed, "\n")
-
-        client.restart()
-
         """
         ghz local rot
         """
-        time_start = time.time()
-
-        ghz_local_rot_opt = src.noisy_net_opt_fn(
-            src.chain_ghz_prep_nodes(n),
-            src.chain_local_rot_meas_nodes(n),
-            uniform_amplitude_damping_nodes_fn(n),
-            qnet.nlocal_chain_cost_22,
-            ansatz_kwargs={"dev_kwargs": {"name": "default.qubit",},},
-            opt_kwargs={"sample_width": 5, "step_size": 1.4, "num_steps": 80, "verbose": True,},
+        sweeps.append(
+            {
+                "optimize": src.noisy_net_opt_fn(
+                    src.chain_ghz_prep_nodes(n),
+                    src.chain_local_rot_meas_nodes(n),
+                    uniform_amplitude_damping_nodes_fn(n),
+                    src.factorized_nlocal_chain_cost_22,
+                    ansatz_kwargs={"dev_kwargs": {"name": "default.qubit",},},
+                    opt_kwargs={
+                        "sample_width": 5,
+                        "step_size": 1.4,
+                        "num_steps": 80,
+                        "verbose": True,
+                    },
+                ),
+                "opt_name": "ghz_local_rot_n-" + str(n) + "_",
+                **sweep_kwargs,
+            }
         )
-        ghz_local_rot_jobs = client.map(ghz_local_rot_opt, param_range)
-        ghz_local_rot_opt_dicts = client.gather(ghz_local_rot_jobs)
-
-        src.save_optimizations_one_param_scan(
-            data_dir,
-            "ghz_local_rot_n-" + str(n) + "_",
-            param_range,
-            ghz_local_rot_opt_dicts,
-            quantum_bound=np.sqrt(2),
-            classical_bound=1,
-        )
-
-        time_elapsed = time.time() - time_start
-        print("\nelapsed time : ", time_elapsed, "\n")
 
-        client.restart()
-
-        # # local qubit rotation measurements and max entangled states
-        # time_start = time.time()
-
-        # max_ent_local_rot_opt = src.noisy_net_opt_fn(
-        #     src.chain_nlocal_max_entangled_prep_nodes(n),
-        #     src.chain_local_rot_meas_nodes(n),
-        #     uniform_amplitude_damping_nodes_fn(n),
-        #     qnet.nlocal_chain_cost_22,
-        #     ansatz_kwargs={
-        #         "dev_kwargs": {
-        #             "name": "default.qubit",
-        #         },
-        #     },
-        #     opt_kwargs={
-        #         "sample_width": 5,
-        #         "step_size": 1.3,
-        #         "num_steps": 80,
-        #         "verbose": True,
-        #     },
-        # )
-        # max_ent_local_rot_jobs = client.map(max_ent_local_rot_opt, param_range)
-        # max_ent_local_rot_opt_dicts = client.gather(max_ent_local_rot_jobs)
-
-        # src.save_optimizations_one_param_scan(
-        #     data_dir,
-        #     "max_entangled_local_rot_n-" + str(n) + "_",
-        #     param_range,
-        #     max_ent_local_rot_opt_dicts,
-        #     quantum_bound=np.sqrt(2),
-        #     classical_bound=1,
-        # )
-
-        # time_elapsed = time.time() - time_start
-        # print("\nelapsed time : ", time_elapsed, "\n")
-
-        # client.restart()
-
-        # # local qubit rotation measurements and arb states
-        # time_start = time.time()
-
-        # arb_local_rot_opt = src.noisy_net_opt_fn(
-        #     src.chain_nlocal_arbitrary_prep_nodes(n),
-        #     src.chain_local_rot_meas_nodes(n),
-        #     uniform_amplitude_damping_nodes_fn(n),
-        #     qnet.nlocal_chain_cost_22,
-        #     ansatz_kwargs={
-        #         "dev_kwargs": {
-        #             "name": "default.qubit",
-        #         },
-        #     },
-        #     opt_kwargs={
-        #         "sample_width": 5,
-        #         "step_size": 1.4,
-        #         "num_steps": 100,
-        #         "verbose": True,
-        #     },
-        # )
-        # arb_local_rot_jobs = client.map(arb_local_rot_opt, param_range)
-        # arb_local_rot_opt_dicts = client.gather(arb_local_rot_jobs)
-
-        # src.save_optimizations_one_param_scan(
-        #     data_dir,
-        #     "arb_local_rot_n-" + str(n) + "_",
-        #     param_range,
-        #     arb_local_rot_opt_dicts,
-        #     quantum_bound=np.sqrt(2),
-        #     classical_bound=1,
-        # )
-
-        # time_elapsed = time.time() - time_start
-        # print("\nelapsed time : ", time_elapsed, "\n")
-
-        # client.restart()
-
-        # # local qubit rotation measurements and arb states
-        # time_start = time.time()
-
-        # arb_opt = src.noisy_net_opt_fn(
-        #     src.chain_nlocal_arbitrary_prep_nodes(n),
-        #     src.chain_arb_meas_nodes(n),
-        #     uniform_amplitude_damping_nodes_fn(n),
-        #     qnet.nlocal_chain_cost_22,
-        #     ansatz_kwargs={
-        #         "dev_kwargs": {
-        #             "name": "default.qubit",
-        #         },
-        #     },
-        #     opt_kwargs={
-        #         "sample_width": 5,
-        #         "step_size": 1,
-        #         "num_steps": 110,
-        #         "verbose": True,
-        #     },
+        # """
+        # local qubit rotation measurements and max entangled states
+        # """
+        # sweeps.append(
+        #     {
+        #         "optimize": src.noisy_net_opt_fn(
+        #             src.chain_nlocal_max_entangled_prep_nodes(n),
+        #             src.chain_local_rot_meas_nodes(n),
+        #             uniform_amplitude_damping_nodes_fn(n),
+        #             src.factorized_nlocal_chain_cost_22,
+        #             ansatz_kwargs={"dev_kwargs": {"name": "default.qubit",},},
+        #             opt_kwargs={
+        #                 "sample_width": 5,
+        #                 "step_size": 1.3,
+        #                 "num_steps": 80,
+        #                 "verbose": True,
+        #             },
+        #         ),
+        #         "opt_name": "max_entangled_local_rot_n-" + str(n) + "_",
+        #         **sweep_kwargs,
+        #     }
         # )
-        # arb_jobs = client.map(arb_opt, param_range)
-        # arb_opt_dicts = client.gather(arb_jobs)
 
-        # src.save_optimizations_one_param_scan(
-        #     data_dir,
-        #     "arb_arb_n-" + str(n) + "_",
-        #     param_range,
-        #     arb_opt_dicts,
-        #     quantum_bound=np.sqrt(2),
-        #     classical_bound=1,
+        # """
+        # local qubit rotation measurements and arb states
+        # """
+        # sweeps.append(
+        #     {
+        #         "optimize": src.noisy_net_opt_fn(
+        #             src.chain_nlocal_arbitrary_prep_nodes(n),
+        #             src.chain_local_rot_meas_nodes(n),
+        #             uniform_amplitude_damping_nodes_fn(n),
+        #             src.factorized_nlocal_chain_cost_22,
+        #             ansatz_kwargs={"dev_kwargs": {"name": "default.qubit",},},
+        #             opt_kwargs={
+        #                 "sample_width": 5,
+        #                 "step_size": 1.4,
+        #                 "num_steps": 100,
+        #                 "verbose": True,
+        #             },
+        #         ),
+        #         "opt_name": "arb_local_rot_n-" + str(n) + "_",
+        #         **sweep_kwargs,
+        #     }
         # )
 
-        # time_elapsed = time.time() - time_start
-        # print("\nelapsed time : ", time_elapsed, "\n")
-
-        # client.restart()
-
-        # # ghz rotation measurements and arb states
-        # time_start = time.time()
-
-        # max_entangled_opt = src.noisy_net_opt_fn(
-        #     src.chain_nlocal_max_entangled_prep_nodes(n),
-        #     src.chain_arb_meas_nodes(n),
-        #     uniform_amplitude_damping_nodes_fn(n),
-        #     qnet.nlocal_chain_cost_22,
-        #     ansatz_kwargs={
-        #         "dev_kwargs": {
-        #             "name": "default.qubit",
-        #         },
-        #     },
-        #     opt_kwargs={
-        #         "sample_width": 5,
-        #         "step_size": 1.2,
-        #         "num_steps": 100,
-        #         "verbose": True,
-        #     },
+        # """
+        # arbitrary measurements and arb states
+        # """
+        # sweeps.append(
+        #     {
+        #         "optimize": src.noisy_net_opt_fn(
+        #             src.chain_nlocal_arbitrary_prep_nodes(n),
+        #             src.chain_arb_meas_nodes(n),
+        #             uniform_amplitude_damping_nodes_fn(n),
+        #             src.factorized_nlocal_chain_cost_22,
+        #             ansatz_kwargs={"dev_kwargs": {"name": "default.qubit",},},
+        #             opt_kwargs={
+        #                 "sample_width": 5,
+        #                 "step_size": 1,
+        #                 "num_steps": 110,
+        #                 "verbose": True,
+        #             },
+        #         ),
+        #         "opt_name": "arb_arb_n-" + str(n) + "_",
+        #         **sweep_kwargs,
+        #     }
         # )
-        # max_entangled_jobs = client.map(max_entangled_opt, param_range)
-        # max_entangled_opt_dicts = client.gather(max_entangled_jobs)
 
-        # src.save_optimizations_one_param_scan(
-        #     data_dir,
-        #     "max_entangled_arb_n-" + str(n) + "_",
-        #     param_range,
-        #     max_entangled_opt_dicts,
-        #     quantum_bound=np.sqrt(2),
-        #     classical_bound=1,
+        # """
+        # arbitrary measurements and max entangled states
+        # """
+        # sweeps.append(
+        #     {
+        #         "optimize": src.noisy_net_opt_fn(
+        #             src.chain_nlocal_max_entangled_prep_nodes(n),
+        #             src.chain_arb_meas_nodes(n),
+        #             uniform_amplitude_damping_nodes_fn(n),
+        #             src.factorized_nlocal_chain_cost_22,
+        #             ansatz_kwargs={"dev_kwargs": {"name": "default.qubit",},},
+        #             opt_kwargs={
+        #                 "sample_width": 5,
+        #                 "step_size": 1.2,
+        #                 "num_steps": 100,
+        #                 "verbose": True,
+        #             },
+        #         ),
+        #         "opt_name": "max_entangled_arb_n-" + str(n) + "_",
+        #         **sweep_kwargs,
+        #     }
         # )
 
-        # time_elapsed = time.time() - time_start
-        # print("\nelapsed time : ", time_elapsed, "\n")
+    src.run_sweeps(client, sweeps)
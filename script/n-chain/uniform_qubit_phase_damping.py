@@ -21,16 +21,7 @@ local qubit measurements and maximally entangled state preparations.
 
 
 def uniform_phase_damping_nodes_fn(n):
-    def noise_nodes(noise_args):
-        return [
-            qnet.NoiseNode(
-                [i, 2 * n + i],
-                lambda settings, wires: qnet.pure_phase_damping([noise_args], wires=wires),
-            )
-            for i in range(2 * n)
-        ]
-
-    return noise_nodes
+    return src.qubit_phase_damping_nodes_fn(range(2 * n))
 
 
 if __name__ == "__main__":
@@ -49,7 +40,7 @@ if __name__ == "__main__":
             src.chain_ghz_prep_nodes(n),
             src.chain_local_ry_meas_nodes(n),
             uniform_phase_damping_nodes_fn(n),
-            qnet.nlocal_chain_cost_22,
+            src.factorized_nlocal_chain_cost_22,
             ansatz_kwargs={"dev_kwargs": {"name": "default.qubit",},},
             opt_kwargs={"sample_width": 5, "step_size": 1.3, "num_steps": 60, "verbose": True,},
         )
@@ -77,7 +68,7 @@ if __name__ == "__main__":
         #     src.chain_nlocal_max_entangled_prep_nodes(n),
         #     src.chain_local_rot_meas_nodes(n),
         #     uniform_phase_damping_nodes_fn(n),
-        #     qnet.nlocal_chain_cost_22,
+        #     src.factorized_nlocal_chain_cost_22,
         #     ansatz_kwargs={
         #         "dev_kwargs": {
         #             "name": "default.qubit",
@@ -114,7 +105,7 @@ if __name__ == "__main__":
         #     src.chain_nlocal_arbitrary_prep_nodes(n),
         #     src.chain_local_rot_meas_nodes(n),
         #     uniform_phase_damping_nodes_fn(n),
-        #     qnet.nlocal_chain_cost_22,
+        #     src.factorized_nlocal_chain_cost_22,
         #     ansatz_kwargs={
         #         "dev_kwargs": {
         #             "name": "default.qubit",
@@ -151,7 +142,7 @@ if __name__ == "__main__":
         #     src.chain_nlocal_arbitrary_prep_nodes(n),
         #     src.chain_arb_meas_nodes(n),
         #     uniform_phase_damping_nodes_fn(n),
-        #     qnet.nlocal_chain_cost_22,
+        #     src.factorized_nlocal_chain_cost_22,
         #     ansatz_kwargs={
         #         "dev_kwargs": {
         #             "name": "default.qubit",
@@ -188,7 +179,7 @@ if __name__ == "__main__":
         #     src.chain_nlocal_max_entangled_prep_nodes(n),
         #     src.chain_arb_meas_nodes(n),
         #     uniform_phase_damping_nodes_fn(n),
-        #     qnet.nlocal_chain_cost_22,
+        #     src.factorized_nlocal_chain_cost_22,
         #     ansatz_kwargs={
         #         "dev_kwargs": {
         #             "name": "default.qubit",
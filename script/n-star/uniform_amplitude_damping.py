@@ -26,16 +26,7 @@ Otherwise, the noisy qubit acts upon wires=[0] (the end node measurement).
 
 
 def uniform_amplitude_damping_nodes_fn(n):
-    def noise_nodes(noise_args):
-        return [
-            qnet.NoiseNode(
-                [i, 2 * n + i],
-                lambda settings, wires: qnet.pure_amplitude_damping([noise_args], wires=wires),
-            )
-            for i in range(2 * n)
-        ]
-
-    return noise_nodes
+    return src.qubit_amplitude_damping_nodes_fn(range(2 * n))
 
 
 if __name__ == "__main__":
@@ -56,7 +47,7 @@ if __name__ == "__main__":
         #     src.star_ryrz_cnot_prep_nodes(n),
         #     src.star_22_local_ry_meas_nodes(n),
         #     uniform_amplitude_damping_nodes_fn(n),
-        #     qnet.nlocal_star_22_cost_fn,
+        #     src.factorized_nlocal_star_22_cost_fn,
         #     ansatz_kwargs={
         #         "dev_kwargs": {"name": "default.qubit"},
         #     },
@@ -93,7 +84,7 @@ if __name__ == "__main__":
             src.star_ryrz_cnot_prep_nodes(n),
             src.star_22_local_rot_meas_nodes(n),
             uniform_amplitude_damping_nodes_fn(n),
-            qnet.nlocal_star_22_cost_fn,
+            src.factorized_nlocal_star_22_cost_fn,
             ansatz_kwargs={"dev_kwargs": {"name": "default.qubit"},},
             opt_kwargs={"sample_width": 5, "step_size": 1.8, "num_steps": 50, "verbose": True,},
         )
@@ -123,7 +114,7 @@ if __name__ == "__main__":
             src.star_ghz_prep_nodes(n),
             src.star_22_local_rot_meas_nodes(n),
             uniform_amplitude_damping_nodes_fn(n),
-            qnet.nlocal_star_22_cost_fn,
+            src.factorized_nlocal_star_22_cost_fn,
             ansatz_kwargs={"dev_kwargs": {"name": "default.qubit"},},
             opt_kwargs={"sample_width": 5, "step_size": 1.8, "num_steps": 50, "verbose": True,},
         )
@@ -151,7 +142,7 @@ if __name__ == "__main__":
         #     src.star_nlocal_max_entangled_prep_nodes(n),
         #     src.star_22_local_rot_meas_nodes(n),
         #     uniform_amplitude_damping_nodes_fn(n),
-        #     qnet.nlocal_star_22_cost_fn,
+        #     src.factorized_nlocal_star_22_cost_fn,
         #     ansatz_kwargs={
         #         "dev_kwargs": {
         #             "name": "default.qubit",
@@ -188,7 +179,7 @@ if __name__ == "__main__":
         #     src.star_nlocal_max_entangled_prep_nodes(n),
         #     src.star_22_ghz_rot_meas_nodes(n),
         #     uniform_amplitude_damping_nodes_fn(n),
-        #     qnet.nlocal_star_22_cost_fn,
+        #     src.factorized_nlocal_star_22_cost_fn,
         #     ansatz_kwargs={
         #         "dev_kwargs": {
         #             "name": "default.qubit",
@@ -226,7 +217,7 @@ if __name__ == "__main__":
         #     src.star_nlocal_arb_prep_nodes(n),
         #     src.star_22_local_rot_meas_nodes(n),
         #     uniform_amplitude_damping_nodes_fn(n),
-        #     qnet.nlocal_star_22_cost_fn,
+        #     src.factorized_nlocal_star_22_cost_fn,
         #     ansatz_kwargs={
         #         "dev_kwargs": {
         #             "name": "default.qubit",
@@ -263,7 +254,7 @@ if __name__ == "__main__":
         #     src.star_nlocal_arb_prep_nodes(n),
         #     src.star_22_ghz_rot_meas_nodes(n),
         #     uniform_amplitude_damping_nodes_fn(n),
-        #     qnet.nlocal_star_22_cost_fn,
+        #     src.factorized_nlocal_star_22_cost_fn,
         #     ansatz_kwargs={
         #         "dev_kwargs": {
         #             "name": "default.qubit",
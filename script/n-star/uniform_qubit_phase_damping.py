@@ -26,16 +26,7 @@ Otherwise, the noisy qubit acts upon wires=[0] (the end node measurement).
 
 
 def uniform_phase_damping_nodes_fn(n):
-    def noise_nodes(noise_args):
-        return [
-            qnet.NoiseNode(
-                [i, 2 * n + i],
-                lambda settings, wires: qnet.pure_phase_damping([noise_args], wires=wires),
-            )
-            for i in range(2 * n)
-        ]
-
-    return noise_nodes
+    return src.qubit_phase_damping_nodes_fn(range(2 * n))
 
 
 if __name__ == "__main__":
@@ -55,7 +46,7 @@ if __name__ == "__main__":
             src.star_ghz_prep_nodes(n),
             src.star_22_local_ry_meas_nodes(n),
             uniform_phase_damping_nodes_fn(n),
-            qnet.nlocal_star_22_cost_fn,
+            src.factorized_nlocal_star_22_cost_fn,
             ansatz_kwargs={"dev_kwargs": {"name": "default.qubit",},},
             opt_kwargs={"sample_width": 5, "step_size": 1.8, "num_steps": 60, "verbose": True,},
         )
@@ -83,7 +74,7 @@ if __name__ == "__main__":
         #     src.star_nlocal_max_entangled_prep_nodes(n),
         #     src.star_22_local_rot_meas_nodes(n),
         #     uniform_phase_damping_nodes_fn(n),
-        #     qnet.nlocal_star_22_cost_fn,
+        #     src.factorized_nlocal_star_22_cost_fn,
         #     ansatz_kwargs={
         #         "dev_kwargs": {
         #             "name": "default.qubit",
@@ -120,7 +111,7 @@ if __name__ == "__main__":
         #     src.star_nlocal_max_entangled_prep_nodes(n),
         #     src.star_22_ghz_rot_meas_nodes(n),
         #     uniform_phase_damping_nodes_fn(n),
-        #     qnet.nlocal_star_22_cost_fn,
+        #     src.factorized_nlocal_star_22_cost_fn,
         #     ansatz_kwargs={
         #         "dev_kwargs": {
         #             "name": "default.qubit",
@@ -157,7 +148,7 @@ if __name__ == "__main__":
         #     src.star_nlocal_arb_prep_nodes(n),
         #     src.star_22_local_rot_meas_nodes(n),
         #     uniform_phase_damping_nodes_fn(n),
-        #     qnet.nlocal_star_22_cost_fn,
+        #     src.factorized_nlocal_star_22_cost_fn,
         #     ansatz_kwargs={
         #         "dev_kwargs": {
         #             "name": "default.qubit",
@@ -194,7 +185,7 @@ if __name__ == "__main__":
         #     src.star_nlocal_arb_prep_nodes(n),
         #     src.star_22_ghz_rot_meas_nodes(n),
         #     uniform_phase_damping_nodes_fn(n),
-        #     qnet.nlocal_star_22_cost_fn,
+        #     src.factorized_nlocal_star_22_cost_fn,
         #     ansatz_kwargs={
         #         "dev_kwargs": {
         #             "name": "default.qubit",
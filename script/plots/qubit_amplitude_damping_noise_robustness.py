@@ -34,17 +34,6 @@ def uniform_max_entangled_theoretical_star_score1(gamma):
     return np.sqrt(2 * (1 - gamma) ** 2)
 
 
-def uniform_max_entangled_theoretical_star_score2(gamma):
-    return np.sqrt((1 - gamma) ** 2 + (gamma ** 2 + (1 - gamma) ** 2) ** 2)
-
-
-def uniform_max_entangled_theoretical_star_score(gamma):
-    return max(
-        uniform_max_entangled_theoretical_star_score1(gamma),
-        uniform_max_entangled_theoretical_star_score2(gamma),
-    )
-
-
 def uniform_max_entangled_theoretical_chain_score1(gamma, n):
     return np.sqrt(2 * (1 - gamma) ** 2) * np.sqrt(1 - gamma) ** (n - 2)
 
@@ -62,10 +51,6 @@ def uniform_max_entangled_theoretical_chain_score(gamma, n):
     )
 
 
-def single_max_entangled_theoretical_star_score(gamma, n):
-    return np.power(np.sqrt(2) ** (n - 1) * np.sqrt(2 * (1 - gamma)), 1 / n)
-
-
 def lambda_star_score(gamma):
     lambda_star = 0
     if gamma >= 0.5:
@@ -116,23 +101,29 @@ if __name__ == "__main__":
 
     bell_state = np.array([[1, 0, 0, 1], [0, 0, 0, 0], [0, 0, 0, 0], [1, 0, 0, 1]]) / 2
 
+    uniform_ad_states = src.noisy_source_states(qml.AmplitudeDamping, gamma_range)
+    single_ad_states = src.noisy_source_states(qml.AmplitudeDamping, gamma_range, wires=[0])
+
+    catalog = src.DataCatalog("./data/")
+
     """
     Loading CHSH Data
     """
-    chsh_uniform_ad_dir = "./data/chsh/uniform_qubit_amplitude_damping/"
+    chsh_uniform_ad_query = {"topology": "chsh", "noise": "uniform_qubit_amplitude_damping"}
 
-    ent_chsh_ad_regexes = [r"max_ent_.*"]
-    arb_single_chsh_ad_regexes = [r"arb_.*", r"ryrz_cnot_local_ry_.*", r"max_ent_.*"]
-    arb_uniform_chsh_ad_regexes = [
-        r"arb_.*",
-        r"ryrz_cnot_ry_.*",
-        r"max_ent_.*",
-        r"ryrz_cnot_local_rot_.*",
+    ent_uniform_chsh_ad_ansatzes = ["max_ent"]
+    ent_single_chsh_ad_ansatzes = ["max_ent_local_rot"]
+    arb_single_chsh_ad_ansatzes = ["arb_local_rot", "ryrz_cnot_local_ry", "max_ent_local_rot"]
+    arb_uniform_chsh_ad_ansatzes = [
+        "arb",
+        "ryrz_cnot_ry",
+        "max_ent",
+        "ryrz_cnot_local_rot",
     ]
 
     ent_chsh_uniform_ad_data = [
-        src.analyze_data_one_param_scan(src.get_data_files(chsh_uniform_ad_dir, regex))
-        for regex in ent_chsh_ad_regexes
+        src.analyze_data_one_param_scan(catalog.find(**chsh_uniform_ad_query, ansatz=ansatz))
+        for ansatz in ent_uniform_chsh_ad_ansatzes
     ]
     ent_max_chsh_uniform_ad = [
         max(map(lambda opt_data: opt_data["max_scores"][i], ent_chsh_uniform_ad_data)) / 2
@@ -140,19 +131,19 @@ if __name__ == "__main__":
     ]
 
     arb_chsh_uniform_ad_data = [
-        src.analyze_data_one_param_scan(src.get_data_files(chsh_uniform_ad_dir, regex))
-        for regex in arb_uniform_chsh_ad_regexes
+        src.analyze_data_one_param_scan(catalog.find(**chsh_uniform_ad_query, ansatz=ansatz))
+        for ansatz in arb_uniform_chsh_ad_ansatzes
     ]
     arb_max_chsh_uniform_ad = [
         max(map(lambda opt_data: opt_data["max_scores"][i], arb_chsh_uniform_ad_data)) / 2
         for i in range(num_samples)
     ]
 
-    chsh_single_ad_dir = "./data/chsh/single_qubit_amplitude_damping/"
+    chsh_single_ad_query = {"topology": "chsh", "noise": "single_qubit_amplitude_damping"}
 
     ent_chsh_single_ad_data = [
-        src.analyze_data_one_param_scan(src.get_data_files(chsh_single_ad_dir, regex))
-        for regex in ent_chsh_ad_regexes
+        src.analyze_data_one_param_scan(catalog.find(**chsh_single_ad_query, ansatz=ansatz))
+        for ansatz in ent_single_chsh_ad_ansatzes
     ]
     ent_max_chsh_single_ad = [
         max(map(lambda opt_data: opt_data["max_scores"][i], ent_chsh_single_ad_data)) / 2
@@ -160,8 +151,8 @@ if __name__ == "__main__":
     ]
 
     arb_chsh_single_ad_data = [
-        src.analyze_data_one_param_scan(src.get_data_files(chsh_single_ad_dir, regex))
-        for regex in arb_single_chsh_ad_regexes
+        src.analyze_data_one_param_scan(catalog.find(**chsh_single_ad_query, ansatz=ansatz))
+        for ansatz in arb_single_chsh_ad_ansatzes
     ]
     arb_max_chsh_single_ad = [
         max(map(lambda opt_data: opt_data["max_scores"][i], arb_chsh_single_ad_data)) / 2
@@ -176,13 +167,13 @@ if __name__ == "__main__":
     #     src.chsh_max_violation(state) / 2 for state in bell_state_single_noise_states
     # ]
 
-    theoretical_bell_state_uniform_chsh = [
-        uniform_max_entangled_theoretical_star_score(gamma) for gamma in gamma_range
-    ]
+    theoretical_bell_state_uniform_chsh = (
+        src.analytic_max_violation_scan("chsh", uniform_ad_states) / 2
+    )
 
-    theoretical_bell_state_single_chsh = [
-        single_max_entangled_theoretical_star_score(gamma, n=1) for gamma in gamma_range
-    ]
+    theoretical_bell_state_single_chsh = (
+        src.analytic_max_violation_scan("chsh", single_ad_states) / 2
+    )
 
     theoretical_nonmax_uniform_chsh = [
         uniform_nonmax_entangled_theoretical_star_score(gamma) for gamma in gamma_range
@@ -195,20 +186,20 @@ if __name__ == "__main__":
     """
     Loading Bilocal Data
     """
-    bilocal_uniform_ad_dir = "./data/bilocal/uniform_amplitude_damping/"
+    bilocal_uniform_ad_query = {"topology": "bilocal", "noise": "uniform_amplitude_damping"}
 
-    arb_bilocal_uniform_ad_regexes = [
-        r"ryrz_cnot_local_ry_.*",
-        r"ryrz_cnot_local_rot_.*",
-        r"arb_arb_.*",
-        r"max_ent_arb_.*",
-        r"max_ent_local_rot_.*",
+    arb_bilocal_uniform_ad_ansatzes = [
+        "ryrz_cnot_local_ry",
+        "ryrz_cnot_local_rot",
+        "arb_arb",
+        "max_ent_arb",
+        "max_ent_local_rot",
     ]
-    ent_bilocal_uniform_ad_regexes = [r"max_ent_local_rot_.*"]
+    ent_bilocal_uniform_ad_ansatzes = ["max_ent_local_rot"]
 
     ent_bilocal_uniform_ad_data = [
-        src.analyze_data_one_param_scan(src.get_data_files(bilocal_uniform_ad_dir, regex))
-        for regex in ent_bilocal_uniform_ad_regexes
+        src.analyze_data_one_param_scan(catalog.find(**bilocal_uniform_ad_query, ansatz=ansatz))
+        for ansatz in ent_bilocal_uniform_ad_ansatzes
     ]
 
     ent_max_bilocal_uniform_ad = [
@@ -217,8 +208,8 @@ if __name__ == "__main__":
     ]
 
     arb_bilocal_uniform_ad_data = [
-        src.analyze_data_one_param_scan(src.get_data_files(bilocal_uniform_ad_dir, regex))
-        for regex in arb_bilocal_uniform_ad_regexes
+        src.analyze_data_one_param_scan(catalog.find(**bilocal_uniform_ad_query, ansatz=ansatz))
+        for ansatz in arb_bilocal_uniform_ad_ansatzes
     ]
 
     arb_max_bilocal_uniform_ad = [
@@ -226,18 +217,18 @@ if __name__ == "__main__":
         for i in range(num_samples)
     ]
 
-    bilocal_single_ad_dir = "./data/bilocal/single_qubit_amplitude_damping/"
+    bilocal_single_ad_query = {"topology": "bilocal", "noise": "single_qubit_amplitude_damping"}
 
-    arb_bilocal_single_ad_regexes = [
-        r"ryrz_cnot_local_ry_out_.*",
-        r"max_ent_arb_out_.*",
-        r"arb_arb_out_.*",
+    arb_bilocal_single_ad_ansatzes = [
+        "ryrz_cnot_local_ry",
+        "max_ent_arb",
+        "arb_arb",
     ]
-    ent_bilocal_single_ad_regexes = [r"max_ent_local_rot_.*"]
+    ent_bilocal_single_ad_ansatzes = ["max_ent_local_rot"]
 
     ent_bilocal_single_ad_data = [
-        src.analyze_data_one_param_scan(src.get_data_files(bilocal_single_ad_dir, regex))
-        for regex in ent_bilocal_single_ad_regexes
+        src.analyze_data_one_param_scan(catalog.find(**bilocal_single_ad_query, ansatz=ansatz))
+        for ansatz in ent_bilocal_single_ad_ansatzes
     ]
 
     ent_max_bilocal_single_ad = [
@@ -246,8 +237,10 @@ if __name__ == "__main__":
     ]
 
     arb_bilocal_single_ad_data = [
-        src.analyze_data_one_param_scan(src.get_data_files(bilocal_single_ad_dir, regex))
-        for regex in arb_bilocal_single_ad_regexes
+        src.analyze_data_one_param_scan(
+            catalog.find(**bilocal_single_ad_query, ansatz=ansatz, tag="out")
+        )
+        for ansatz in arb_bilocal_single_ad_ansatzes
     ]
 
     arb_max_bilocal_single_ad = [
@@ -263,13 +256,13 @@ if __name__ == "__main__":
     #     src.bilocal_max_violation(state, bell_state) for state in bell_state_single_noise_states
     # ]
 
-    theoretical_bell_state_uniform_bilocal = [
-        uniform_max_entangled_theoretical_star_score(gamma) for gamma in gamma_range
-    ]
+    theoretical_bell_state_uniform_bilocal = src.analytic_max_violation_scan(
+        "bilocal", uniform_ad_states
+    )
 
-    theoretical_bell_state_single_bilocal = [
-        single_max_entangled_theoretical_star_score(gamma, n=2) for gamma in gamma_range
-    ]
+    theoretical_bell_state_single_bilocal = src.analytic_max_violation_scan(
+        "bilocal", single_ad_states, uniform=False
+    )
 
     theoretical_nonmax_uniform_bilocal = [
         uniform_nonmax_entangled_theoretical_star_score(gamma) for gamma in gamma_range
@@ -283,25 +276,25 @@ if __name__ == "__main__":
     Loading n-Chain Data
     """
 
-    chain_uniform_ad_dir = "./data/n-chain/uniform_amplitude_damping/"
+    chain_uniform_ad_query = {"topology": "n-chain", "noise": "uniform_amplitude_damping"}
 
-    arb_n3_chain_uniform_ad_regexes = [
-        r"ryrz_cnot_local_ry_n-3_.*",
-        r"arb_arb_n-3_.*",
-        r"arb_local_rot_n-3_.*",
-        r"max_entangled_local_rot_n-3_.*",
-        r"ghz_local_rot_n-3_.*",
-        r"ryrz_cnot_local_rot_n-3_.*",
+    arb_n3_chain_uniform_ad_ansatzes = [
+        "ryrz_cnot_local_ry",
+        "arb_arb",
+        "arb_local_rot",
+        "max_entangled_local_rot",
+        "ghz_local_rot",
+        "ryrz_cnot_local_rot",
     ]
 
-    ent_n3_chain_uniform_ad_regexes = [
-        r"max_entangled_local_rot_n-3_.*",
-        r"ghz_local_rot_n-3_.*",
+    ent_n3_chain_uniform_ad_ansatzes = [
+        "max_entangled_local_rot",
+        "ghz_local_rot",
     ]
 
     arb_n3_chain_uniform_ad_data = [
-        src.analyze_data_one_param_scan(src.get_data_files(chain_uniform_ad_dir, regex))
-        for regex in arb_n3_chain_uniform_ad_regexes
+        src.analyze_data_one_param_scan(catalog.find(**chain_uniform_ad_query, ansatz=ansatz, n=3))
+        for ansatz in arb_n3_chain_uniform_ad_ansatzes
     ]
 
     arb_max_n3_chain_uniform_ad = [
@@ -310,8 +303,8 @@ if __name__ == "__main__":
     ]
 
     ent_n3_chain_uniform_ad_data = [
-        src.analyze_data_one_param_scan(src.get_data_files(chain_uniform_ad_dir, regex))
-        for regex in ent_n3_chain_uniform_ad_regexes
+        src.analyze_data_one_param_scan(catalog.find(**chain_uniform_ad_query, ansatz=ansatz, n=3))
+        for ansatz in ent_n3_chain_uniform_ad_ansatzes
     ]
 
     ent_max_n3_chain_uniform_ad = [
@@ -319,22 +312,22 @@ if __name__ == "__main__":
         for i in range(num_samples)
     ]
 
-    arb_n4_chain_uniform_ad_regexes = [
-        r"ryrz_cnot_local_ry_n-4_.*",
-        r"arb_arb_n-4_.*",
-        r"arb_local_rot_n-4_.*",
-        r"max_entangled_local_rot_n-4_.*",
-        r"ghz_local_rot_n-4_.*",
-        r"ryrz_cnot_local_rot_n-4_.*",
+    arb_n4_chain_uniform_ad_ansatzes = [
+        "ryrz_cnot_local_ry",
+        "arb_arb",
+        "arb_local_rot",
+        "max_entangled_local_rot",
+        "ghz_local_rot",
+        "ryrz_cnot_local_rot",
     ]
-    ent_n4_chain_uniform_ad_regexes = [
-        r"max_entangled_local_rot_n-4_.*",
-        r"ghz_local_rot_n-4_.*",
+    ent_n4_chain_uniform_ad_ansatzes = [
+        "max_entangled_local_rot",
+        "ghz_local_rot",
     ]
 
     ent_n4_chain_uniform_ad_data = [
-        src.analyze_data_one_param_scan(src.get_data_files(chain_uniform_ad_dir, regex))
-        for regex in ent_n4_chain_uniform_ad_regexes
+        src.analyze_data_one_param_scan(catalog.find(**chain_uniform_ad_query, ansatz=ansatz, n=4))
+        for ansatz in ent_n4_chain_uniform_ad_ansatzes
     ]
 
     ent_max_n4_chain_uniform_ad = [
@@ -343,8 +336,8 @@ if __name__ == "__main__":
     ]
 
     arb_n4_chain_uniform_ad_data = [
-        src.analyze_data_one_param_scan(src.get_data_files(chain_uniform_ad_dir, regex))
-        for regex in arb_n4_chain_uniform_ad_regexes
+        src.analyze_data_one_param_scan(catalog.find(**chain_uniform_ad_query, ansatz=ansatz, n=4))
+        for ansatz in arb_n4_chain_uniform_ad_ansatzes
     ]
 
     arb_max_n4_chain_uniform_ad = [
@@ -352,22 +345,22 @@ if __name__ == "__main__":
         for i in range(num_samples)
     ]
 
-    chain_single_ad_dir = "./data/n-chain/single_qubit_amplitude_damping/"
+    chain_single_ad_query = {"topology": "n-chain", "noise": "single_qubit_amplitude_damping"}
 
-    arb_n3_chain_single_ad_regexes = [
-        r"arb_arb_n-3_.*",
-        r"arb_local_rot_n-3_.*",
-        r"max_entangled_arb_n-3_.*",
-        r"ryrz_cnot_local_ry_n-3_.*",
-        r"max_entangled_local_rot_n-3_.*",
+    arb_n3_chain_single_ad_ansatzes = [
+        "arb_arb",
+        "arb_local_rot",
+        "max_entangled_arb",
+        "ryrz_cnot_local_ry",
+        "max_entangled_local_rot",
     ]
-    ent_n3_chain_single_ad_regexes = [
-        r"max_entangled_local_rot_n-3_.*",
+    ent_n3_chain_single_ad_ansatzes = [
+        "max_entangled_local_rot",
     ]
 
     ent_n3_chain_single_ad_data = [
-        src.analyze_data_one_param_scan(src.get_data_files(chain_single_ad_dir, regex))
-        for regex in ent_n3_chain_single_ad_regexes
+        src.analyze_data_one_param_scan(catalog.find(**chain_single_ad_query, ansatz=ansatz, n=3))
+        for ansatz in ent_n3_chain_single_ad_ansatzes
     ]
 
     ent_max_n3_chain_single_ad = [
@@ -376,8 +369,8 @@ if __name__ == "__main__":
     ]
 
     arb_n3_chain_single_ad_data = [
-        src.analyze_data_one_param_scan(src.get_data_files(chain_single_ad_dir, regex))
-        for regex in arb_n3_chain_single_ad_regexes
+        src.analyze_data_one_param_scan(catalog.find(**chain_single_ad_query, ansatz=ansatz, n=3))
+        for ansatz in arb_n3_chain_single_ad_ansatzes
     ]
 
     arb_max_n3_chain_single_ad = [
@@ -385,20 +378,20 @@ if __name__ == "__main__":
         for i in range(num_samples)
     ]
 
-    arb_n4_chain_single_ad_regexes = [
-        r"ryrz_cnot_local_ry_n-4_.*",
-        r"arb_arb_n-4_.*",
-        r"arb_local_rot_n-4_.*",
-        r"max_entangled_arb_n-4_.*",
-        r"max_entangled_local_rot_n-4_.*",
+    arb_n4_chain_single_ad_ansatzes = [
+        "ryrz_cnot_local_ry",
+        "arb_arb",
+        "arb_local_rot",
+        "max_entangled_arb",
+        "max_entangled_local_rot",
     ]
-    ent_n4_chain_single_ad_regexes = [
-        r"max_entangled_local_rot_n-4_.*",
+    ent_n4_chain_single_ad_ansatzes = [
+        "max_entangled_local_rot",
     ]
 
     ent_n4_chain_single_ad_data = [
-        src.analyze_data_one_param_scan(src.get_data_files(chain_single_ad_dir, regex))
-        for regex in ent_n4_chain_single_ad_regexes
+        src.analyze_data_one_param_scan(catalog.find(**chain_single_ad_query, ansatz=ansatz, n=4))
+        for ansatz in ent_n4_chain_single_ad_ansatzes
     ]
 
     ent_max_n4_chain_single_ad = [
@@ -407,8 +400,8 @@ if __name__ == "__main__":
     ]
 
     arb_n4_chain_single_ad_data = [
-        src.analyze_data_one_param_scan(src.get_data_files(chain_single_ad_dir, regex))
-        for regex in arb_n4_chain_single_ad_regexes
+        src.analyze_data_one_param_scan(catalog.find(**chain_single_ad_query, ansatz=ansatz, n=4))
+        for ansatz in arb_n4_chain_single_ad_ansatzes
     ]
 
     arb_max_n4_chain_single_ad = [
@@ -420,9 +413,9 @@ if __name__ == "__main__":
         uniform_max_entangled_theoretical_chain_score(gamma, n=3) for gamma in gamma_range
     ]
 
-    theoretical_bell_state_single_n3_chain = [
-        single_max_entangled_theoretical_star_score(gamma, n=2) for gamma in gamma_range
-    ]
+    theoretical_bell_state_single_n3_chain = src.analytic_max_violation_scan(
+        "n-chain", single_ad_states, n=3, uniform=False
+    )
 
     theoretical_nonmax_uniform_n3_chain = [
         uniform_nonmax_entangled_theoretical_star_score(gamma) for gamma in gamma_range
@@ -436,9 +429,9 @@ if __name__ == "__main__":
         uniform_max_entangled_theoretical_chain_score(gamma, n=4) for gamma in gamma_range
     ]
 
-    theoretical_bell_state_single_n4_chain = [
-        single_max_entangled_theoretical_star_score(gamma, n=2) for gamma in gamma_range
-    ]
+    theoretical_bell_state_single_n4_chain = src.analytic_max_violation_scan(
+        "n-chain", single_ad_states, n=4, uniform=False
+    )
 
     theoretical_nonmax_uniform_n4_chain = [
         uniform_nonmax_entangled_theoretical_star_score(gamma) for gamma in gamma_range
@@ -452,25 +445,25 @@ if __name__ == "__main__":
     Loading n-Star Data
     """
 
-    star_uniform_ad_dir = "./data/n-star/uniform_amplitude_damping/"
+    star_uniform_ad_query = {"topology": "n-star", "noise": "uniform_amplitude_damping"}
 
-    ent_n3_star_ad_uniform_regexes = [
-        r"max_entangled_local_rot_n-3_.*",
-        r"ghz_local_rot_n-3_.*",
+    ent_n3_star_ad_uniform_ansatzes = [
+        "max_entangled_local_rot",
+        "ghz_local_rot",
     ]
-    arb_n3_star_ad_uniform_regexes = [
-        r"arb_ghz_rot_n-3_.*",
-        r"arb_local_rot_n-3_.*",
-        r"max_entangled_ghz_rot_n-3_.*",
-        r"ryrz_cnot_local_ry_n-3_.*",
-        r"max_entangled_local_rot_n-3_.*",
-        r"ryrz_cnot_local_rot_n-3_.*",
-        r"ghz_local_rot_n-3_.*",
+    arb_n3_star_ad_uniform_ansatzes = [
+        "arb_ghz_rot",
+        "arb_local_rot",
+        "max_entangled_ghz_rot",
+        "ryrz_cnot_local_ry",
+        "max_entangled_local_rot",
+        "ryrz_cnot_local_rot",
+        "ghz_local_rot",
     ]
 
     ent_n3_star_uniform_ad_data = [
-        src.analyze_data_one_param_scan(src.get_data_files(star_uniform_ad_dir, regex))
-        for regex in ent_n3_star_ad_uniform_regexes
+        src.analyze_data_one_param_scan(catalog.find(**star_uniform_ad_query, ansatz=ansatz, n=3))
+        for ansatz in ent_n3_star_ad_uniform_ansatzes
     ]
 
     ent_max_n3_star_uniform_ad = [
@@ -479,8 +472,8 @@ if __name__ == "__main__":
     ]
 
     arb_n3_star_uniform_ad_data = [
-        src.analyze_data_one_param_scan(src.get_data_files(star_uniform_ad_dir, regex))
-        for regex in arb_n3_star_ad_uniform_regexes
+        src.analyze_data_one_param_scan(catalog.find(**star_uniform_ad_query, ansatz=ansatz, n=3))
+        for ansatz in arb_n3_star_ad_uniform_ansatzes
     ]
 
     arb_max_n3_star_uniform_ad = [
@@ -488,23 +481,23 @@ if __name__ == "__main__":
         for i in range(num_samples)
     ]
 
-    arb_n4_star_ad_uniform_regexes = [
-        r"arb_ghz_rot_n-4_.*",
-        r"arb_local_rot_n-4_.*",
-        r"max_entangled_ghz_rot_n-4_.*",
-        r"ryrz_cnot_local_ry_n-4_.*",
-        r"ryrz_cnot_local_rot_n-4_.*",
-        r"max_entangled_local_rot_n-4_.*",
-        r"ghz_local_rot_n-4_.*",
+    arb_n4_star_ad_uniform_ansatzes = [
+        "arb_ghz_rot",
+        "arb_local_rot",
+        "max_entangled_ghz_rot",
+        "ryrz_cnot_local_ry",
+        "ryrz_cnot_local_rot",
+        "max_entangled_local_rot",
+        "ghz_local_rot",
     ]
-    ent_n4_star_ad_uniform_regexes = [
-        r"max_entangled_local_rot_n-4_.*",
-        r"ghz_local_rot_n-4_.*",
+    ent_n4_star_ad_uniform_ansatzes = [
+        "max_entangled_local_rot",
+        "ghz_local_rot",
     ]
 
     ent_n4_star_uniform_ad_data = [
-        src.analyze_data_one_param_scan(src.get_data_files(star_uniform_ad_dir, regex))
-        for regex in ent_n4_star_ad_uniform_regexes
+        src.analyze_data_one_param_scan(catalog.find(**star_uniform_ad_query, ansatz=ansatz, n=4))
+        for ansatz in ent_n4_star_ad_uniform_ansatzes
     ]
 
     ent_max_n4_star_uniform_ad = [
@@ -513,8 +506,8 @@ if __name__ == "__main__":
     ]
 
     arb_n4_star_uniform_ad_data = [
-        src.analyze_data_one_param_scan(src.get_data_files(star_uniform_ad_dir, regex))
-        for regex in arb_n4_star_ad_uniform_regexes
+        src.analyze_data_one_param_scan(catalog.find(**star_uniform_ad_query, ansatz=ansatz, n=4))
+        for ansatz in arb_n4_star_ad_uniform_ansatzes
     ]
 
     arb_max_n4_star_uniform_ad = [
@@ -522,22 +515,22 @@ if __name__ == "__main__":
         for i in range(num_samples)
     ]
 
-    star_single_ad_dir = "./data/n-star/single_qubit_amplitude_damping/"
+    star_single_ad_query = {"topology": "n-star", "noise": "single_qubit_amplitude_damping"}
 
-    ent_n3_star_ad_single_regexes = [
-        r"max_entangled_local_rot_n-3_.*",
+    ent_n3_star_ad_single_ansatzes = [
+        "max_entangled_local_rot",
     ]
-    arb_n3_star_ad_single_regexes = [
-        r"arb_ghz_rot_n-3_.*",
-        r"arb_local_rot_n-3_.*",
-        r"max_entangled_ghz_rot_n-3_.*",
-        r"ryrz_cnot_local_ry_n-3_.*",
-        r"max_entangled_local_rot_n-3_.*",
+    arb_n3_star_ad_single_ansatzes = [
+        "arb_ghz_rot",
+        "arb_local_rot",
+        "max_entangled_ghz_rot",
+        "ryrz_cnot_local_ry",
+        "max_entangled_local_rot",
     ]
 
     ent_n3_star_single_ad_data = [
-        src.analyze_data_one_param_scan(src.get_data_files(star_single_ad_dir, regex))
-        for regex in ent_n3_star_ad_single_regexes
+        src.analyze_data_one_param_scan(catalog.find(**star_single_ad_query, ansatz=ansatz, n=3))
+        for ansatz in ent_n3_star_ad_single_ansatzes
     ]
 
     ent_max_n3_star_single_ad = [
@@ -546,8 +539,8 @@ if __name__ == "__main__":
     ]
 
     arb_n3_star_single_ad_data = [
-        src.analyze_data_one_param_scan(src.get_data_files(star_single_ad_dir, regex))
-        for regex in arb_n3_star_ad_single_regexes
+        src.analyze_data_one_param_scan(catalog.find(**star_single_ad_query, ansatz=ansatz, n=3))
+        for ansatz in arb_n3_star_ad_single_ansatzes
     ]
 
     arb_max_n3_star_single_ad = [
@@ -555,20 +548,20 @@ if __name__ == "__main__":
         for i in range(num_samples)
     ]
 
-    ent_n4_star_ad_single_regexes = [
-        r"max_entangled_local_rot_n-4_.*",
+    ent_n4_star_ad_single_ansatzes = [
+        "max_entangled_local_rot",
     ]
-    arb_n4_star_ad_single_regexes = [
-        r"arb_ghz_rot_n-4_.*",
-        r"arb_local_rot_n-4_.*",
-        r"max_entangled_ghz_rot_n-4_.*",
-        r"ryrz_cnot_local_ry_n-4_.*",
-        r"max_entangled_local_rot_n-4_.*",
+    arb_n4_star_ad_single_ansatzes = [
+        "arb_ghz_rot",
+        "arb_local_rot",
+        "max_entangled_ghz_rot",
+        "ryrz_cnot_local_ry",
+        "max_entangled_local_rot",
     ]
 
     ent_n4_star_single_ad_data = [
-        src.analyze_data_one_param_scan(src.get_data_files(star_single_ad_dir, regex))
-        for regex in ent_n4_star_ad_single_regexes
+        src.analyze_data_one_param_scan(catalog.find(**star_single_ad_query, ansatz=ansatz, n=4))
+        for ansatz in ent_n4_star_ad_single_ansatzes
     ]
 
     ent_max_n4_star_single_ad = [
@@ -577,8 +570,8 @@ if __name__ == "__main__":
     ]
 
     arb_n4_star_single_ad_data = [
-        src.analyze_data_one_param_scan(src.get_data_files(star_single_ad_dir, regex))
-        for regex in arb_n4_star_ad_single_regexes
+        src.analyze_data_one_param_scan(catalog.find(**star_single_ad_query, ansatz=ansatz, n=4))
+        for ansatz in arb_n4_star_ad_single_ansatzes
     ]
 
     arb_max_n4_star_single_ad = [
@@ -586,13 +579,13 @@ if __name__ == "__main__":
         for i in range(num_samples)
     ]
 
-    theoretical_bell_state_uniform_n3_star = [
-        uniform_max_entangled_theoretical_star_score(gamma) for gamma in gamma_range
-    ]
+    theoretical_bell_state_uniform_n3_star = src.analytic_max_violation_scan(
+        "n-star", uniform_ad_states, n=3
+    )
 
-    theoretical_bell_state_single_n3_star = [
-        single_max_entangled_theoretical_star_score(gamma, n=3) for gamma in gamma_range
-    ]
+    theoretical_bell_state_single_n3_star = src.analytic_max_violation_scan(
+        "n-star", single_ad_states, n=3, uniform=False
+    )
 
     theoretical_nonmax_uniform_n3_star = [
         uniform_nonmax_entangled_theoretical_star_score(gamma) for gamma in gamma_range
@@ -602,13 +595,13 @@ if __name__ == "__main__":
         single_nonmax_entangled_theoretical_star_score(gamma, n=3) for gamma in gamma_range
     ]
 
-    theoretical_bell_state_uniform_n4_star = [
-        uniform_max_entangled_theoretical_star_score(gamma) for gamma in gamma_range
-    ]
+    theoretical_bell_state_uniform_n4_star = src.analytic_max_violation_scan(
+        "n-star", uniform_ad_states, n=4
+    )
 
-    theoretical_bell_state_single_n4_star = [
-        single_max_entangled_theoretical_star_score(gamma, n=4) for gamma in gamma_range
-    ]
+    theoretical_bell_state_single_n4_star = src.analytic_max_violation_scan(
+        "n-star", single_ad_states, n=4, uniform=False
+    )
 
     theoretical_nonmax_uniform_n4_star = [
         uniform_nonmax_entangled_theoretical_star_score(gamma) for gamma in gamma_range
@@ -1,4 +1,20 @@
 from src.network_ansatzes import *
 from src.maximal_qubit_violations import *
+from src.analytic_bounds import *
+from src.surrogate_costs import *
 from src.utilities import *
 from src.detector_error_cost_functions import *
+from src.noise_nodes import *
+from src.factorized_network import *
+from src.vectorized_network import *
+from src.result_cache import *
+from src.diff_methods import *
+from src.flat_settings import *
+from src.circuit_cache import *
+from src.adaptive_scan import *
+from src.scan_store import *
+from src.scan_journal import *
+from src.data_catalog import *
+from src.sweep_runner import *
+from src.optimizers import *
+from src.campaign import *
@@ -0,0 +1,147 @@
+from pennylane import numpy as np
+
+
+def _max_score(opt_dict):
+    """The maximal score of an optimization as saved by ``save_optimizations_one_param_scan``."""
+    return float(max(opt_dict["scores"]))
+
+
+def _flagged_intervals(params, scores, classical_bound, kink_tol):
+    """Finds the intervals between adjacent noise parameters in which the maximal score
+    crosses the ``classical_bound`` or the slope of the maximal score changes by more
+    than ``kink_tol``, i.e., the optimal strategy switches.
+
+    Crossings are listed first, followed by the kinks.
+    """
+    crossings = []
+    kinks = []
+    for i in range(len(params) - 1):
+        if classical_bound is not None and (scores[i] - classical_bound) * (
+            scores[i + 1] - classical_bound
+        ) < 0:
+            crossings.append(i)
+
+    slopes = np.diff(scores) / np.diff(params)
+    for i in range(len(slopes) - 1):
+        if np.abs(slopes[i + 1] - slopes[i]) > kink_tol:
+            kinks += [j for j in [i, i + 1] if j not in crossings + kinks]
+
+    return crossings + kinks
+
+
+def adaptive_one_param_scan(
+    optimize,
+    param_range,
+    classical_bound=None,
+    max_evals=50,
+    min_step=0.001,
+    kink_tol=np.inf,
+    client=None,
+    verbose=True,
+):
+    """Scans the ``optimize`` function over a single noise parameter by starting with the
+    coarse ``param_range`` and recursively bisecting the intervals of interest.
+
+    In each round, an interval between adjacent noise parameters is bisected if the maximal
+    score crosses the ``classical_bound`` or if the slope of the maximal score changes by more
+    than ``kink_tol`` at either end of the interval, which indicates that the optimal strategy
+    switches. Intervals narrower than ``min_step`` are not bisected. The intervals in which
+    the classical bound is crossed are bisected first. The scan stops when no interval is
+    flagged or when ``max_evals`` optimizations are evaluated, including the coarse scan.
+
+    The returned noise parameters and optimization dictionaries can be saved with
+    ``save_optimizations_one_param_scan``.
+
+    :param optimize: The ``optimize(noise_args)`` function, e.g., constructed with
+                     ``noisy_net_opt_fn``.
+    :type optimize: Function
+
+    :param param_range: The coarse noise parameters, e.g., ``np.arange(0, 1.01, 0.05)``.
+    :type param_range: List[Float]
+
+    :param classical_bound: The classical bound of the scenario. If ``None``, only the
+                            changes in slope are refined.
+    :type classical_bound: optional, Float
+
+    :param max_evals: The maximum number of optimizations.
+    :type max_evals: optional, Int, default ``50``
+
+    :param min_step: The smallest spacing of the refined noise parameters.
+    :type min_step: optional, Float, default ``0.001``
+
+    :param kink_tol: The change in slope of the maximal score that is refined. By default,
+                     only crossings of the classical bound are refined.
+    :type kink_tol: optional, Float, default ``np.inf``
+
+    :param client: A Dask client on which the optimizations of each round are mapped.
+                   If ``None``, the optimizations are evaluated sequentially.
+    :type client: optional, dask.distributed.Client
+
+    :param verbose: If ``True`` prints out progress.
+    :type verbose: optional, Bool, default ``True``
+
+    :returns: The sorted noise parameters and their optimization dictionaries.
+    :rtype: Tuple[List[Float], List[Dictionary]]
+    """
+
+    def evaluate(new_params):
+        if client is None:
+            return [optimize(noise_args) for noise_args in new_params]
+
+        return client.gather(client.map(optimize, new_params, pure=False))
+
+    new_params = sorted(set(float(param) for param in param_range))[0:max_evals]
+    opt_dicts = dict(zip(new_params, evaluate(new_params)))
+
+    while len(opt_dicts) < max_evals:
+        params = sorted(opt_dicts)
+        scores = [_max_score(opt_dicts[param]) for param in params]
+
+        new_params = [
+            (params[i] + params[i + 1]) / 2
+            for i in _flagged_intervals(params, scores, classical_bound, kink_tol)
+            if params[i + 1] - params[i] >= 2 * min_step
+        ][0 : max_evals - len(opt_dicts)]
+
+        if len(new_params) == 0:
+            break
+
+        if verbose:
+            print("refined noise params : ", new_params)
+
+        opt_dicts.update(zip(new_params, evaluate(new_params)))
+
+    params = sorted(opt_dicts)
+
+    return params, [opt_dicts[param] for param in params]
+
+
+def classical_bound_crossings(param_range, max_scores, classical_bound):
+    """Estimates the noise parameters at which the maximal score crosses the
+    ``classical_bound`` by linear interpolation between adjacent noise parameters.
+
+    :param param_range: The sorted noise parameters.
+    :type param_range: List[Float]
+
+    :param max_scores: The maximal score at each noise parameter.
+    :type max_scores: List[Float]
+
+    :param classical_bound: The classical bound of the scenario.
+    :type classical_bound: Float
+
+    :returns: The noise parameters at which the classical bound is crossed.
+    :rtype: List[Float]
+    """
+    crossings = []
+    for i in range(len(param_range) - 1):
+        diff_a = max_scores[i] - classical_bound
+        diff_b = max_scores[i + 1] - classical_bound
+        if diff_a * diff_b < 0:
+            crossings.append(
+                float(
+                    param_range[i]
+                    + (param_range[i + 1] - param_range[i]) * diff_a / (diff_a - diff_b)
+                )
+            )
+
+    return crossings
@@ -0,0 +1,234 @@
+from pennylane import numpy as np
+
+from src.maximal_qubit_violations import (
+    chsh_violation_criterion,
+    star_max_violation,
+    chain_max_violation,
+)
+
+
+def max_entangled_density_matrix():
+    """Returns the density matrix of the maximally entangled state
+    :math:`|\\Phi^+\\rangle = (|00\\rangle + |11\\rangle)/\\sqrt{2}`.
+
+    :rtype: np.array
+    """
+    return np.array([[1, 0, 0, 1], [0, 0, 0, 0], [0, 0, 0, 0], [1, 0, 0, 1]]) / 2
+
+
+def _two_qubit_kraus(single_qubit_kraus, wire):
+    """Embeds the single-qubit Kraus operators of shape ``(..., 2, 2)`` on the ``wire``
+    of a two-qubit system.
+    """
+    identity = np.eye(2)
+    if wire == 0:
+        return np.einsum("...ij,kl->...ikjl", single_qubit_kraus, identity).reshape(
+            single_qubit_kraus.shape[:-2] + (4, 4)
+        )
+
+    return np.einsum("ij,...kl->...ikjl", identity, single_qubit_kraus).reshape(
+        single_qubit_kraus.shape[:-2] + (4, 4)
+    )
+
+
+def noisy_source_states(channel, param_range, wires=[0, 1], source_state=None):
+    """Applies the single-qubit ``channel`` to the ``wires`` of a two-qubit source state
+    for each noise parameter in ``param_range``.
+
+    :param channel: A single-parameter PennyLane channel, e.g., ``qml.AmplitudeDamping``,
+                    ``qml.PhaseDamping``, or ``qml.DepolarizingChannel``.
+    :type channel: qml.operation.Channel
+
+    :param param_range: The noise parameters of the channel.
+    :type param_range: List[Float]
+
+    :param wires: The wires of the source to which the channel is applied.
+    :type wires: optional, List[Int], default ``[0, 1]``
+
+    :param source_state: The two-qubit density matrix of the noiseless source,
+                         defaults to ``max_entangled_density_matrix()``.
+    :type source_state: optional, np.array
+
+    :returns: The noisy source states with shape ``(len(param_range), 4, 4)``.
+    :rtype: np.array
+    """
+    source_state = max_entangled_density_matrix() if source_state is None else source_state
+
+    # Kraus operators of shape (num_params, num_kraus, 2, 2)
+    kraus_ops = np.array(
+        [channel.compute_kraus_matrices(float(param)) for param in param_range], dtype=complex
+    )
+
+    states = np.tile(np.array(source_state, dtype=complex), (len(param_range), 1, 1))
+    for wire in wires:
+        ops = _two_qubit_kraus(kraus_ops, wire)
+        states = np.einsum("pkij,pjl,pkml->pim", ops, states, np.conj(ops))
+
+    return states
+
+
+def mixed_source_states(noise_state, param_range, source_state=None):
+    """Mixes the two-qubit source state with the ``noise_state`` as
+    :math:`(1 - \\gamma)\\rho + \\gamma\\sigma` for each :math:`\\gamma` in ``param_range``,
+    e.g., white noise for :math:`\\sigma = \\mathbb{I}/4`.
+
+    :param noise_state: The two-qubit density matrix :math:`\\sigma` of the noise.
+    :type noise_state: np.array
+
+    :param param_range: The noise parameters.
+    :type param_range: List[Float]
+
+    :param source_state: The two-qubit density matrix of the noiseless source,
+                         defaults to ``max_entangled_density_matrix()``.
+    :type source_state: optional, np.array
+
+    :returns: The noisy source states with shape ``(len(param_range), 4, 4)``.
+    :rtype: np.array
+    """
+    source_state = max_entangled_density_matrix() if source_state is None else source_state
+    gammas = np.array(param_range, dtype=float)[:, None, None]
+
+    return (1 - gammas) * np.array(source_state) + gammas * np.array(noise_state)
+
+
+def _broadcast_states(source_states):
+    """Broadcasts the states of each source to the shape ``(num_params, 4, 4)``."""
+    return np.array(np.broadcast_arrays(*[np.array(states) for states in source_states]))
+
+
+def chsh_max_violation_scan(states):
+    """Vectorized ``chsh_max_violation`` over an array of two-qubit states.
+
+    :param states: The two-qubit states with shape ``(..., 4, 4)``.
+    :type states: np.array
+
+    :returns: The maximal CHSH score of each state.
+    :rtype: np.array
+    """
+    eigvals = chsh_violation_criterion(states)[2]
+
+    return 2 * np.sqrt(eigvals[..., -1] + eigvals[..., -2])
+
+
+def star_max_violation_scan(source_states):
+    """Vectorized ``star_max_violation`` over a grid of noise parameters.
+
+    :param source_states: The states of each source, either with shape ``(num_params, 4, 4)``
+                          or a single ``(4, 4)`` state that is constant over the grid.
+    :type source_states: List[np.array]
+
+    :returns: The maximal star score at each noise parameter.
+    :rtype: np.array
+    """
+    return star_max_violation(_broadcast_states(source_states))
+
+
+def chain_max_violation_scan(source_states):
+    """Vectorized ``chain_max_violation`` over a grid of noise parameters.
+
+    :param source_states: The states of each source, either with shape ``(num_params, 4, 4)``
+                          or a single ``(4, 4)`` state that is constant over the grid.
+    :type source_states: List[np.array]
+
+    :returns: The maximal chain score at each noise parameter.
+    :rtype: np.array
+    """
+    return chain_max_violation(_broadcast_states(source_states))
+
+
+def analytic_max_violation_scan(topology, noisy_states, n=1, uniform=True, ideal_state=None):
+    """Evaluates the Horodecki-like maximal violation of a network over a grid of noise
+    parameters. The noisy source states are constructed with, e.g., ``noisy_source_states``
+    or ``mixed_source_states``.
+
+    The scores have the normalization of the qNetVO cost functions, i.e., the ``"chsh"``
+    score is bounded by :math:`2\\sqrt{2}` while the ``"bilocal"``, ``"n-star"``, and
+    ``"n-chain"`` scores are bounded by :math:`\\sqrt{2}`.
+
+    :param topology: The network topology, one of ``"chsh"``, ``"bilocal"``, ``"n-star"``,
+                     or ``"n-chain"``.
+    :type topology: String
+
+    :param noisy_states: The noisy source state at each noise parameter with shape
+                         ``(num_params, 4, 4)``.
+    :type noisy_states: np.array
+
+    :param n: The number of sources in the ``"n-star"`` or ``"n-chain"`` network.
+    :type n: optional, Int, default ``1``
+
+    :param uniform: If ``True`` all sources emit the noisy state, otherwise only the first
+                    source is noisy and the remaining sources emit the ``ideal_state``.
+    :type uniform: optional, Bool, default ``True``
+
+    :param ideal_state: The state of the noiseless sources,
+                        defaults to ``max_entangled_density_matrix()``.
+    :type ideal_state: optional, np.array
+
+    :returns: The maximal score at each noise parameter.
+    :rtype: np.array
+
+    :raises ValueError: If the ``topology`` is not supported.
+    """
+    if topology == "chsh":
+        return chsh_max_violation_scan(noisy_states)
+
+    n = 2 if topology == "bilocal" else n
+    ideal_state = max_entangled_density_matrix() if ideal_state is None else ideal_state
+    source_states = [noisy_states] + [noisy_states if uniform else ideal_state] * (n - 1)
+
+    if topology in ["bilocal", "n-star"]:
+        return star_max_violation_scan(source_states)
+    elif topology == "n-chain":
+        return chain_max_violation_scan(source_states)
+
+    raise ValueError("The topology " + topology + " has no analytic maximal violation.")
+
+
+def analytic_opt_fn(topology, noisy_states_fn, n=1, uniform=True, ideal_state=None):
+    """Constructs an ``optimize(noise_args)`` function that returns the analytic maximal
+    violation in place of a variational optimization.
+
+    The returned optimization dictionary can be passed to ``save_optimizations_one_param_scan``
+    and ``run_sweeps`` like those of ``noisy_net_opt_fn``. It holds no settings and should
+    only be used where the analytic bound is tight, e.g., for the maximally entangled sources
+    of the ``max_ent`` ansatzes measured with arbitrary local qubit measurements.
+
+    :param topology: The network topology, one of ``"chsh"``, ``"bilocal"``, ``"n-star"``,
+                     or ``"n-chain"``.
+    :type topology: String
+
+    :param noisy_states_fn: A function ``noisy_states_fn(param_range)`` returning the noisy
+                            source states, e.g.,
+                            ``lambda params: noisy_source_states(qml.AmplitudeDamping, params)``.
+    :type noisy_states_fn: Function
+
+    :param n: The number of sources in the ``"n-star"`` or ``"n-chain"`` network.
+    :type n: optional, Int, default ``1``
+
+    :param uniform: If ``True`` all sources emit the noisy state, otherwise only the first
+                    source is noisy and the remaining sources emit the ``ideal_state``.
+    :type uniform: optional, Bool, default ``True``
+
+    :param ideal_state: The state of the noiseless sources,
+                        defaults to ``max_entangled_density_matrix()``.
+    :type ideal_state: optional, np.array
+
+    :returns: A function ``optimize(noise_args)`` returning an optimization dictionary.
+    :rtype: Function
+    """
+
+    def optimize(noise_args):
+        score = analytic_max_violation_scan(
+            topology, noisy_states_fn([noise_args]), n=n, uniform=uniform, ideal_state=ideal_state
+        )[0]
+
+        return {
+            "opt_score": float(score),
+            "opt_settings": [[], []],
+            "scores": [float(score)],
+            "samples": [0],
+            "settings_history": [[[], []]],
+            "analytic": True,
+        }
+
+    return optimize
@@ -0,0 +1,252 @@
+import importlib
+import os
+
+import yaml
+from pennylane import numpy as np
+import qnetvo as qnet
+
+import src.network_ansatzes
+import src.noise_nodes
+import src.detector_error_cost_functions
+import src.factorized_network
+import src.surrogate_costs
+from src.utilities import noisy_net_opt_fn, noisy_net_continuation_opt_fn, noisy_net_sweep_opt_fn
+from src.sweep_runner import sweep_client, run_sweeps
+
+
+# modules searched, in order, for the functions named in a campaign
+_NAMESPACES = [
+    src.network_ansatzes,
+    src.noise_nodes,
+    src.detector_error_cost_functions,
+    src.factorized_network,
+    src.surrogate_costs,
+    qnet,
+]
+
+
+def resolve_campaign_fn(name):
+    """Finds the function named in a campaign specification.
+
+    A plain name, e.g., ``"star_ghz_prep_nodes"`` or ``"nlocal_star_22_cost_fn"``, is searched
+    for in the ``src`` modules and then in ``qnetvo``. A name of the form ``"module:function"`` is
+    imported from the given module, e.g., a noise node factory defined in a script.
+
+    :param name: The name of the function.
+    :type name: String
+
+    :raises ValueError: If no function of the given name is found.
+    """
+    if ":" in name:
+        module_name, fn_name = name.split(":")
+        return getattr(importlib.import_module(module_name), fn_name)
+
+    for namespace in _NAMESPACES:
+        if hasattr(namespace, name):
+            return getattr(namespace, name)
+
+    raise ValueError("The campaign function " + name + " is not found.")
+
+
+def _param_range(param_range):
+    """Constructs the deduplicated and sorted noise parameter grid from either a
+    list of values or a dictionary of ``"start"``, ``"stop"``, and ``"step"`` values
+    passed to ``np.arange``.
+    """
+    if isinstance(param_range, dict):
+        param_range = np.arange(param_range["start"], param_range["stop"], param_range["step"])
+
+    return np.unique(np.round(np.array(param_range, dtype=float), 10))
+
+
+def _noise_nodes_fn(noise, prep_nodes):
+    """Constructs the ``noise_nodes(noise_args)`` function of a scan. The ``"wires"``
+    of the noise are either a list of wires or ``"all"`` for every prepared wire.
+    """
+    wires = noise.get("wires", "all")
+    if wires == "all":
+        wires = sorted(set(wire for node in prep_nodes for wire in node.wires))
+
+    return resolve_campaign_fn(noise["nodes_fn"])(wires, **noise.get("kwargs", {}))
+
+
+def _sweep_optimize(spec, prep_nodes, meas_nodes, noise_nodes_fn):
+    """Constructs the ``"optimize"`` or ``"optimize_scan"`` entry of a sweep for the
+    ``"scan_mode"`` of its specification."""
+    scan_mode = spec.get("scan_mode", "points")
+    cost_fn = resolve_campaign_fn(spec["cost_fn"])
+    common_kwargs = {
+        "ansatz_kwargs": spec.get("ansatz_kwargs", {}),
+        "opt_kwargs": spec.get("opt_kwargs", {}),
+    }
+
+    if scan_mode == "points":
+        return {
+            "optimize": noisy_net_opt_fn(
+                prep_nodes,
+                meas_nodes,
+                noise_nodes_fn,
+                cost_fn,
+                cache_dir=spec.get("cache_dir", None),
+                seed=spec.get("seed", None),
+                num_starts=spec.get("num_starts", 1),
+                surrogate_cost_fn=(
+                    resolve_campaign_fn(spec["surrogate_cost_fn"])
+                    if "surrogate_cost_fn" in spec
+                    else None
+                ),
+                surrogate_opt_kwargs=spec.get("surrogate_opt_kwargs", {}),
+                cost_kwargs=spec.get("cost_kwargs", {}),
+                **common_kwargs
+            )
+        }
+    elif scan_mode == "continuation":
+        return {
+            "optimize_scan": noisy_net_continuation_opt_fn(
+                prep_nodes,
+                meas_nodes,
+                noise_nodes_fn,
+                cost_fn,
+                bidirectional=spec.get("bidirectional", True),
+                cost_kwargs=spec.get("cost_kwargs", {}),
+                **common_kwargs
+            )
+        }
+    elif scan_mode == "vectorized":
+        return {
+            "optimize_scan": noisy_net_sweep_opt_fn(
+                prep_nodes,
+                meas_nodes,
+                noise_nodes_fn,
+                cost_fn,
+                seed=spec.get("seed", None),
+                **common_kwargs
+            )
+        }
+
+    raise ValueError("The scan mode " + str(scan_mode) + " is not supported.")
+
+
+def expand_campaign(campaign):
+    """Expands a campaign specification into the optimization sweeps run by ``run_sweeps``.
+
+    A campaign is a dictionary, e.g., loaded with ``load_campaign``, with the keys:
+
+    * ``"data_dir"``: The root data directory. Each sweep is saved to
+      ``<data_dir>/<topology>/<noise name>/``.
+    * ``"param_range"``: The noise parameters as a list or as a dictionary with keys
+      ``"start"``, ``"stop"``, and ``"step"``.
+    * ``"scans"``: A list of scans, each with the keys ``"topology"``, ``"n"`` (an int, a list
+      of ints, or omitted if the node factories take no arguments), ``"cost_fn"``, ``"noise"``,
+      and ``"ansatzes"``. The ``"noise"`` is a dictionary with keys ``"name"``,
+      ``"nodes_fn"``, ``"wires"``, and optionally ``"kwargs"``.
+      Each ansatz has a ``"name"``, ``"prep_nodes"``, and ``"meas_nodes"``.
+    * ``"cache_dir"``, ``"seed"``, ``"num_starts"``: (optional) Passed to ``noisy_net_opt_fn``.
+    * ``"scan_mode"``: (optional) Either ``"points"`` (default) where each noise parameter is
+      optimized with ``noisy_net_opt_fn`` as a separate task, ``"continuation"`` where the
+      scan is a single task of ``noisy_net_continuation_opt_fn`` with the optional key
+      ``"bidirectional"``, or ``"vectorized"`` where the scan is a single task of
+      ``noisy_net_sweep_opt_fn``.
+    * ``"scan_store_dir"``: (optional) A scan store to which all sweeps are appended.
+
+    The keys ``"param_range"``, ``"ansatz_kwargs"``, ``"cost_kwargs"``, ``"opt_kwargs"``,
+    ``"surrogate_cost_fn"``, ``"surrogate_opt_kwargs"``, ``"scan_mode"``, ``"quantum_bound"``,
+    and ``"classical_bound"`` may be set on the campaign, a scan, or an ansatz where the most
+    specific value is used. Sweeps that duplicate the data directory and name of a previous
+    sweep are dropped.
+
+    :param campaign: The campaign specification.
+    :type campaign: Dictionary
+
+    :returns: The optimization sweeps of the campaign.
+    :rtype: List[Dictionary]
+
+    :raises ValueError: If the ``"scan_mode"`` is not supported.
+    """
+    sweeps = []
+    sweep_keys = set()
+
+    for scan in campaign["scans"]:
+        ns = scan.get("n", None)
+        ns = ns if isinstance(ns, list) else [ns]
+
+        for n in ns:
+            for ansatz in scan["ansatzes"]:
+                spec = {**campaign, **scan, **ansatz}
+                factory_args = [] if n is None else [n]
+
+                prep_nodes = resolve_campaign_fn(ansatz["prep_nodes"])(*factory_args)
+                meas_nodes = resolve_campaign_fn(ansatz["meas_nodes"])(*factory_args)
+
+                data_dir = os.path.join(
+                    spec["data_dir"], scan["topology"], scan["noise"]["name"], ""
+                )
+                opt_name = ansatz["name"] + ("" if n is None else "_n-" + str(n)) + "_"
+                if (data_dir, opt_name) in sweep_keys:
+                    continue
+
+                sweep_keys.add((data_dir, opt_name))
+                sweeps.append(
+                    {
+                        **_sweep_optimize(
+                            spec,
+                            prep_nodes,
+                            meas_nodes,
+                            _noise_nodes_fn(scan["noise"], prep_nodes),
+                        ),
+                        "param_range": _param_range(spec["param_range"]),
+                        "data_dir": data_dir,
+                        "opt_name": opt_name,
+                        "seed": spec.get("seed", None),
+                        "scan_store_dir": spec.get("scan_store_dir", None),
+                        "quantum_bound": spec.get("quantum_bound", None),
+                        "classical_bound": spec.get("classical_bound", None),
+                    }
+                )
+
+    return sweeps
+
+
+def load_campaign(filepath):
+    """Reads a campaign specification from a YAML file.
+
+    :param filepath: The path of the YAML file.
+    :type filepath: String
+
+    :returns: The campaign specification.
+    :rtype: Dictionary
+    """
+    with open(filepath) as file:
+        return yaml.safe_load(file)
+
+
+def run_campaign(campaign, client=None, resume=True, verbose=True):
+    """Runs all optimization sweeps of a campaign on a single Dask cluster.
+
+    :param campaign: The campaign specification or the path of its YAML file.
+    :type campaign: Dictionary or String
+
+    :param client: The Dask client. If not provided, a client is started with ``sweep_client``
+                   using the keyword arguments in the ``"cluster"`` entry of the campaign.
+    :type client: optional, dask.distributed.Client
+
+    :param resume: If ``True`` continues the sweeps from their journals, see ``run_sweeps``.
+    :type resume: optional, Bool, default ``True``
+
+    :param verbose: If ``True`` prints out progress.
+    :type verbose: optional, Bool, default ``True``
+
+    :returns: The optimization dictionaries of each sweep.
+    :rtype: List[List[Dictionary]]
+    """
+    if isinstance(campaign, str):
+        campaign = load_campaign(campaign)
+
+    sweeps = expand_campaign(campaign)
+    if verbose:
+        print("campaign sweeps : ", [sweep["data_dir"] + sweep["opt_name"] for sweep in sweeps])
+
+    if client is None:
+        client = sweep_client(**campaign.get("cluster", {}))
+
+    return run_sweeps(client, sweeps, resume=resume, verbose=verbose)
@@ -0,0 +1,139 @@
+from collections import OrderedDict
+import threading
+import uuid
+
+import qnetvo as qnet
+
+from src.diff_methods import diff_method_network_ansatz
+
+
+# the network ansatz and cost of each cached noisy circuit, kept per process such that
+# the functions constructed by ``cached_noisy_cost_fn`` remain cheap to send to Dask workers,
+# the least recently used circuits are evicted such that long-lived workers do not accumulate
+# the circuits of every optimization they have run
+_MAX_CACHED_CIRCUITS = 32
+_CIRCUITS = OrderedDict()
+_CIRCUITS_LOCK = threading.Lock()
+
+
+def _cached_circuit(circuit_key, construct_circuit):
+    """Returns the circuit cached for the ``circuit_key`` or caches the circuit returned by
+    ``construct_circuit()``. The cache is only accessed through this module-level function
+    because functions nested in ``cached_noisy_cost_fn`` are pickled by value when they are
+    sent to Dask workers, including the module globals that they reference.
+    """
+    with _CIRCUITS_LOCK:
+        circuit = _CIRCUITS.get(circuit_key)
+        if circuit is not None:
+            _CIRCUITS.move_to_end(circuit_key)
+            return circuit
+
+    circuit = construct_circuit()
+
+    with _CIRCUITS_LOCK:
+        _CIRCUITS[circuit_key] = circuit
+        while len(_CIRCUITS) > _MAX_CACHED_CIRCUITS:
+            _CIRCUITS.popitem(last=False)
+
+    return circuit
+
+
+def _bound_noise_fn(bound_nodes, node_id):
+    """Constructs the quantum function of a noise node that applies the noise node
+    currently bound at ``node_id``.
+    """
+
+    def noise_fn(settings, wires):
+        bound_nodes[node_id].ansatz_fn(settings, wires)
+
+    return noise_fn
+
+
+def cached_noisy_cost_fn(
+    prep_nodes,
+    meas_nodes,
+    noise_nodes_fn,
+    cost_fn,
+    ansatz_kwargs={},
+    cost_kwargs={},
+    qnode_kwargs={},
+):
+    """Constructs a ``noisy_cost(noise_args)`` function returning the network ansatz and
+    cost function of the noisy network for the given ``noise_args``.
+
+    The network ansatz, its device, and the QNodes of the cost function are constructed
+    once and reused for all noise parameters. The noise nodes of the cached ansatz apply
+    the nodes returned by ``noise_nodes_fn(noise_args)``, which are bound each time the
+    returned cost function is evaluated. Hence, the costs of different noise parameters
+    may be evaluated in any order, e.g., by ``noisy_net_continuation_opt_fn``.
+
+    A circuit is cached for each thread and for each set of noise node wires, so noise
+    models whose nodes depend on the ``noise_args`` are supported as well. At most
+    ``_MAX_CACHED_CIRCUITS`` circuits are kept per process, an evicted circuit is
+    constructed again when it is next used.
+
+    :param prep_nodes: A list of qnet.PrepareNode classes for the network ansatz.
+    :type prep_nodes: list[PrepareNode]
+
+    :param meas_nodes: A list of qnet.MeasureNode classes for the network ansatz.
+    :type meas_nodes: list[MeasureNode]
+
+    :param noise_nodes_fn: A function for constructing the noise nodes for the ansatz.
+                           this function must ``noise_args`` as input.
+    :type noise_nodes_fn: function
+
+    :param cost_fn: A cost function factory used to construct an ansatz-specific cost function.
+    :type cost_fn: function
+
+    :param ansatz_kwargs: Keyword arguments for the ``qnet.NetworkAnsatz`` class.
+    :type ansatz_kwargs: optional, dictionary
+
+    :param cost_kwargs: Keyword arguments for the ``cost_fn`` factory function.
+    :type cost_kwargs: optional, dictionary
+
+    :param qnode_kwargs: Keyword arguments passed to the QNode constructors. The
+                         ``"diff_method"`` may also be one of the methods of
+                         ``diff_method_network_ansatz``, e.g., ``"density_backprop"``.
+    :type qnode_kwargs: optional, dictionary
+
+    :returns: A function ``noisy_cost(noise_args)`` returning a tuple of the
+              ``qnet.NetworkAnsatz`` and the cost function.
+    :rtype: Function
+    """
+    cache_id = uuid.uuid4().hex
+
+    def noisy_cost(noise_args):
+        noise_nodes = noise_nodes_fn(noise_args)
+
+        circuit_key = (
+            cache_id,
+            threading.get_ident(),
+            tuple(tuple(node.wires) for node in noise_nodes),
+        )
+
+        def construct_circuit():
+            bound_nodes = list(noise_nodes)
+            ansatz, circuit_qnode_kwargs = diff_method_network_ansatz(
+                prep_nodes,
+                meas_nodes,
+                [
+                    qnet.NoiseNode(node.wires, _bound_noise_fn(bound_nodes, node_id))
+                    for node_id, node in enumerate(noise_nodes)
+                ],
+                ansatz_kwargs=ansatz_kwargs,
+                qnode_kwargs=qnode_kwargs,
+            )
+            return (bound_nodes, ansatz, cost_fn(ansatz, **cost_kwargs, **circuit_qnode_kwargs))
+
+        bound_nodes, ansatz, circuit_cost = _cached_circuit(circuit_key, construct_circuit)
+
+        # the noise is bound for any quantity derived from the ansatz before the cost is called
+        bound_nodes[:] = noise_nodes
+
+        def cost(scenario_settings):
+            bound_nodes[:] = noise_nodes
+            return circuit_cost(scenario_settings)
+
+        return ansatz, cost
+
+    return noisy_cost
@@ -0,0 +1,178 @@
+import json
+import os
+import re
+
+
+_TIMESTAMP_REGEX = re.compile(r"(\d{4}-\d{2}-\d{2}T\d{2}-\d{2}-\d{2}Z)$")
+_N_REGEX = re.compile(r"^n-(\d+)$")
+_TAGS = ["in", "out"]
+
+
+def parse_data_filename(filename):
+    """Parses the name of a data file written by ``save_optimizations_one_param_scan``.
+
+    Data files are named ``<ansatz>[_n-<n>][_<tag>]_<timestamp>.json`` where the
+    ``tag`` is either ``"in"`` or ``"out"``, e.g.,
+    ``"arb_local_rot_n-3_out_2022-02-15T13-03-14Z.json"``.
+    The ``n`` and ``tag`` may appear in either order.
+
+    :param filename: The basename of the data file.
+    :type filename: String
+
+    :returns: A dictionary with keys ``"ansatz"``, ``"n"``, ``"tag"``, and ``"timestamp"``.
+              The ``"n"``, ``"tag"``, and ``"timestamp"`` are ``None`` if not found in the filename.
+    :rtype: Dictionary
+    """
+    stem = filename[:-5] if filename.endswith(".json") else filename
+
+    timestamp = None
+    timestamp_match = _TIMESTAMP_REGEX.search(stem)
+    if timestamp_match:
+        timestamp = timestamp_match.group(1)
+        stem = stem[: timestamp_match.start()]
+
+    n = None
+    tag = None
+    ansatz_tokens = []
+    for token in stem.split("_"):
+        n_match = _N_REGEX.match(token)
+        if n_match:
+            n = int(n_match.group(1))
+        elif token in _TAGS:
+            tag = token
+        elif token != "":
+            ansatz_tokens.append(token)
+
+    return {"ansatz": "_".join(ansatz_tokens), "n": n, "tag": tag, "timestamp": timestamp}
+
+
+class DataCatalog:
+    """An index of the data files held in ``data_dir``.
+
+    Data files are expected at ``<data_dir>/<topology>/<noise>/<filename>.json``, e.g.,
+    ``"./data/n-star/uniform_amplitude_damping/arb_local_rot_n-3_2022-02-14T19-58-21Z.json"``.
+    Each entry records the topology, noise model, ansatz, number of nodes ``n``, tag, timestamp,
+    and parameter grid (``"noise_params"``) of the file.
+
+    The index is stored as JSON in ``index_path`` and is updated incrementally on construction,
+    i.e., only files that are new or modified since the last update are parsed.
+
+    :param data_dir: The root directory of the data files.
+    :type data_dir: optional, String, default ``"./data/"``
+
+    :param index_path: The path of the index file, defaults to ``<data_dir>/catalog.json``.
+    :type index_path: optional, String
+
+    Example usage:
+
+    .. code-block:: python
+
+        catalog = DataCatalog("./data/")
+        data_files = catalog.find(
+            topology="n-star", noise="uniform_amplitude_damping", ansatz="ghz_local_rot", n=3
+        )
+    """
+
+    def __init__(self, data_dir="./data/", index_path=None):
+        self.data_dir = data_dir
+        self.index_path = index_path if index_path else os.path.join(data_dir, "catalog.json")
+
+        self.entries = {}
+        if os.path.isfile(self.index_path):
+            with open(self.index_path) as file:
+                self.entries = json.load(file)
+
+        self.update()
+
+    def update(self):
+        """Indexes new or modified data files and removes deleted files from the index.
+        The index file is rewritten if any entry changed.
+        """
+        found_paths = set()
+        changed = False
+
+        for topology in sorted(os.listdir(self.data_dir)):
+            topology_dir = os.path.join(self.data_dir, topology)
+            if not os.path.isdir(topology_dir):
+                continue
+
+            for noise in sorted(os.listdir(topology_dir)):
+                noise_dir = os.path.join(topology_dir, noise)
+                if not os.path.isdir(noise_dir):
+                    continue
+
+                for filename in os.listdir(noise_dir):
+                    filepath = os.path.join(noise_dir, filename)
+                    if not (filename.endswith(".json") and os.path.isfile(filepath)):
+                        continue
+
+                    rel_path = "/".join([topology, noise, filename])
+                    found_paths.add(rel_path)
+
+                    mtime = os.path.getmtime(filepath)
+                    if rel_path in self.entries and self.entries[rel_path]["mtime"] == mtime:
+                        continue
+
+                    self.entries[rel_path] = self._index_entry(filepath, topology, noise, mtime)
+                    changed = True
+
+        for rel_path in set(self.entries) - found_paths:
+            del self.entries[rel_path]
+            changed = True
+
+        if changed:
+            with open(self.index_path, "w") as file:
+                file.write(json.dumps(self.entries))
+
+    def _index_entry(self, filepath, topology, noise, mtime):
+        """Constructs the index entry for a single data file."""
+        entry = parse_data_filename(os.path.basename(filepath))
+        entry.update({"topology": topology, "noise": noise, "mtime": mtime})
+
+        try:
+            with open(filepath) as file:
+                data_dict = json.load(file)
+        except ValueError:
+            data_dict = {}
+
+        entry["noise_params"] = (
+            data_dict.get("noise_params", []) if isinstance(data_dict, dict) else []
+        )
+
+        return entry
+
+    def find(self, topology=None, noise=None, ansatz=None, n=None, tag=None):
+        """Finds the data files matching all of the specified fields.
+        Each field is either a single value or a list of accepted values,
+        and a field that is ``None`` matches any value.
+
+        :param topology: The network topology, e.g., ``"n-star"``.
+        :type topology: optional, String or List[String]
+
+        :param noise: The noise model, e.g., ``"uniform_amplitude_damping"``.
+        :type noise: optional, String or List[String]
+
+        :param ansatz: The ansatz name, e.g., ``"ghz_local_rot"``.
+        :type ansatz: optional, String or List[String]
+
+        :param n: The number of nodes in the chain or star network.
+        :type n: optional, Int or List[Int]
+
+        :param tag: The tag of the data file, e.g., ``"in"`` or ``"out"``.
+        :type tag: optional, String or List[String]
+
+        :returns: The sorted paths of the matching data files.
+        :rtype: List[String]
+        """
+        query = {"topology": topology, "noise": noise, "ansatz": ansatz, "n": n, "tag": tag}
+        query = {
+            key: val if isinstance(val, (list, tuple, set)) else [val]
+            for key, val in query.items()
+            if val is not None
+        }
+
+        return [
+            os.path.join(self.data_dir, rel_path)
+            for rel_path in sorted(self.entries)
+            if all(self.entries[rel_path][key] in vals for key, vals in query.items())
+        ]
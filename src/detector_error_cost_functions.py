@@ -2,6 +2,49 @@ from pennylane import numpy as np
 from pennylane import math
 import qnetvo as qnet
 
+from src.factorized_network import factorized_batch_joint_probs_fn, _reject_qnode_kwargs
+from src.flat_settings import flat_qnode_settings_fn
+
+
+def _detector_correlator_factor(error_map, num_bits):
+    """The correlator vector of a single detector that outputs the parity of its
+    ``num_bits`` outcome bits followed by the ``error_map``.
+
+    The parity post-processing and detector error are fused such that the
+    correlator of the detector is a dot product of this vector with its outcome
+    probabilities.
+    """
+    error_parity = np.array([1, -1]) @ error_map
+    parity_vec = qnet.parity_vector(num_bits)
+
+    return error_parity[0] * (1 + parity_vec) / 2 + error_parity[1] * (1 - parity_vec) / 2
+
+
+def detector_correlator_vector(error_maps, num_bits):
+    """Constructs the vector whose dot product with the joint probabilities of a network
+    evaluates the correlator of the noisy detectors.
+
+    Each detector outputs the parity of its outcome bits and is then subject to its
+    error map. The post-processing and detector errors act independently on each detector,
+    hence, the correlator vector is the Kronecker product of a vector for each detector,
+    which is constructed in time linear in the number of joint outcomes without forming
+    the dense post-processing maps.
+
+    :param error_maps: The column stochastic error map of each detector.
+    :type error_maps: List[np.array[Float]]
+
+    :param num_bits: The number of outcome bits measured by each detector.
+    :type num_bits: List[Int]
+
+    :returns: A vector with one element for each joint outcome.
+    :rtype: np.array[Float]
+    """
+    correlator_vec = np.ones(1)
+    for error_map, bits in zip(error_maps, num_bits):
+        correlator_vec = np.kron(correlator_vec, _detector_correlator_factor(error_map, bits))
+
+    return correlator_vec
+
 
 def detector_error_chsh_cost_fn(
     chsh_ansatz, error_rates, error_map=np.array([[1, 1], [0, 0]]), **qnode_kwargs
@@ -14,6 +57,9 @@ def detector_error_chsh_cost_fn(
     applied to the probability distribution output from the quantum
     circuit executions.
 
+    The qnode settings of all inputs are gathered from the network settings
+    with index tables precomputed by ``flat_qnode_settings_fn``.
+
     :param chsh_ansatz: Ansatz for the CHSH scenario.
     :type chsh_ansatz: qnetvo.NetworkAnsatz
 
@@ -35,18 +81,23 @@ def detector_error_chsh_cost_fn(
     error_map1 = (1 - p1) * np.eye(2) + p1 * error_map
     error_map2 = (1 - p2) * np.eye(2) + p2 * error_map
 
-    detectors_error = np.kron(error_map1, error_map2)
+    # the detector errors and correlator are fused into a single vector
+    correlator_vec = detector_correlator_vector([error_map1, error_map2], [1, 1])
 
     chsh_probs = qnet.joint_probs_qnode(chsh_ansatz, **qnode_kwargs)
 
+    xy_inputs = [[0, 0], [0, 1], [1, 0], [1, 1]]
+
+    # the qnode settings of all inputs are gathered from the network settings at once
+    chsh_settings = flat_qnode_settings_fn(chsh_ansatz, [([0], xy) for xy in xy_inputs])
+
     def cost(network_settings):
+        settings_batch = chsh_settings(network_settings)
 
         chsh_score = 0
-        for x, y in [[0, 0], [0, 1], [1, 0], [1, 1]]:
+        for (x, y), settings in zip(xy_inputs, settings_batch):
 
-            settings = chsh_ansatz.qnode_settings(network_settings, [0], [x, y])
-            probs = detectors_error @ chsh_probs(settings)
-            correlator = np.sum(probs * np.array([1, -1, -1, 1]))
+            correlator = math.dot(chsh_probs(settings), correlator_vec)
 
             chsh_score += (-1) ** (x * y) * correlator
 
@@ -67,6 +118,10 @@ def detector_error_chain_cost_fn(
     circuit executions. The quantum circuit behavior is post-processed to two
     outcomes before the detector errors are applied.
 
+    The probabilities for all measurement inputs are evaluated in one batch with
+    ``factorized_batch_joint_probs_fn``, hence, the sources are prepared once per
+    cost evaluation.
+
     :param chsh_ansatz: Ansatz for the CHSH scenario.
     :type chsh_ansatz: qnetvo.NetworkAnsatz
 
@@ -79,61 +134,40 @@ def detector_error_chain_cost_fn(
                       with certainty if an error occurs.
     :type error_map: np.array[Float]
 
-    :param qnode_kwargs: Keyword arguments passed through to the qnode constructors.
+    :param qnode_kwargs: Accepted for compatibility with qnode-based cost functions and must
+                         be empty.
     :type qnode_kwargs: Dictionary
+
+    :raises ValueError: If any ``qnode_kwargs`` are passed.
     """
+    _reject_qnode_kwargs("detector_error_chain_cost_fn", qnode_kwargs)
+
     n = len(chain_ansatz.prepare_nodes)
     print("error rates : ", error_rates)
     error_maps = [(1 - gamma) * np.eye(2) + gamma * error_map for gamma in error_rates]
 
-    detector_errors = np.array([[1]])
-    for detector_error in error_maps:
-        detector_errors = np.kron(detector_errors, detector_error)
-
-    chain_probs = qnet.joint_probs_qnode(chain_ansatz, **qnode_kwargs)
-
     prep_inputs = [0] * n
     xy_inputs = [[0, 0], [0, 1], [1, 0], [1, 1]]
 
     I22_xy_inputs = [[x_a] + [0] * (n - 1) + [x_b] for x_a, x_b in xy_inputs]
     J22_xy_inputs = [[x_a] + [1] * (n - 1) + [x_b] for x_a, x_b in xy_inputs]
 
-    post_map = np.eye(2)
-    for i in range(n - 1):
-        post_map = np.kron(post_map, np.array([[1, 0, 0, 1], [0, 1, 1, 0]]))
+    chain_batch_probs = factorized_batch_joint_probs_fn(
+        chain_ansatz, I22_xy_inputs + J22_xy_inputs, prep_inputs=prep_inputs
+    )
 
-    post_map = np.kron(post_map, np.eye(2))
+    # the central detectors output the parity of their two outcome bits, and the
+    # correlator of each noisy probability vector is a dot product with this vector
+    correlator_vec = detector_correlator_vector(error_maps, [1] + [2] * (n - 1) + [1])
 
-    parity_vec = qnet.parity_vector(n + 1)
+    J22_scalars = np.array([1, -1, -1, 1])
 
     def cost(network_settings):
 
-        I22_xy_settings = [
-            chain_ansatz.qnode_settings(network_settings, prep_inputs, meas_inputs)
-            for meas_inputs in I22_xy_inputs
-        ]
-        J22_xy_settings = [
-            chain_ansatz.qnode_settings(network_settings, prep_inputs, meas_inputs)
-            for meas_inputs in J22_xy_inputs
-        ]
-
-        I22_score = 0
-        for I22_settings in I22_xy_settings:
-            I22_probs = detector_errors @ post_map @ chain_probs(I22_settings)
-
-            I22_correlator = math.sum(I22_probs * parity_vec)
-
-            I22_score += I22_correlator
-
-        J22_score = 0
-        J22_scalars = [1, -1, -1, 1]
-        for i in range(len(J22_xy_settings)):
-            J22_scalar = J22_scalars[i]
-            J22_settings = J22_xy_settings[i]
-            J22_probs = detector_errors @ post_map @ chain_probs(J22_settings)
+        correlators = math.dot(chain_batch_probs(network_settings), correlator_vec)
 
-            J22_correlator = math.sum(J22_probs * parity_vec)
-            J22_score += J22_scalar * J22_correlator
+        I22_score = math.sum(correlators[0:4])
+        J22_score = math.sum(J22_scalars * correlators[4:8])
 
         chain_score = math.sqrt(math.abs(I22_score) / 4) + math.sqrt(math.abs(J22_score) / 4)
 
@@ -154,6 +188,18 @@ def detector_error_star_cost_fn(
     circuit executions. The quantum circuit behavior is post-processed to two
     outcomes before the detector errors are applied.
 
+    The probabilities for all measurement inputs are evaluated in one batch with
+    ``factorized_batch_joint_probs_fn``, hence, the sources are prepared once per
+    cost evaluation.
+
+    The scores differ from those of the previous implementation, which evaluated
+    ``qnet.joint_probs_qnode`` on the star ansatz. The device wires of the star,
+    ``[0, n, 1, n + 1, ...]``, are not sorted and for unsorted device wires ``qml.probs``
+    of PennyLane 0.22 returns the probabilities in the wrong order. The present scores agree
+    with ``qml.probs`` on a device with sorted wires. The scores in
+    ``data/n-star/uniform_detector_biased_noise`` are affected by this change, see
+    ``data/n-star/DETECTOR_ERROR_ERRATA.md``.
+
     :param chsh_ansatz: Ansatz for the CHSH scenario.
     :type chsh_ansatz: qnetvo.NetworkAnsatz
 
@@ -166,70 +212,38 @@ def detector_error_star_cost_fn(
                       with certainty if an error occurs.
     :type error_map: np.array[Float]
 
-    :param qnode_kwargs: Keyword arguments passed through to the qnode constructors.
+    :param qnode_kwargs: Accepted for compatibility with qnode-based cost functions and must
+                         be empty.
     :type qnode_kwargs: Dictionary
+
+    :raises ValueError: If any ``qnode_kwargs`` are passed.
     """
+    _reject_qnode_kwargs("detector_error_star_cost_fn", qnode_kwargs)
+
     n = len(star_ansatz.prepare_nodes)
 
     error_maps = [(1 - gamma) * np.eye(2) + gamma * error_map for gamma in error_rates]
 
-    detector_errors = np.array([[1]])
-    for detector_error in error_maps:
-        detector_errors = np.kron(detector_errors, detector_error)
-
-    star_probs = qnet.joint_probs_qnode(star_ansatz, **qnode_kwargs)
-
     prep_inputs = [0] * n
     I22_x_inputs = [[int(bit) for bit in np.binary_repr(x, width=n) + "0"] for x in range(2 ** n)]
     J22_x_inputs = [[int(bit) for bit in np.binary_repr(x, width=n) + "1"] for x in range(2 ** n)]
 
-    post_map = np.eye(2)
-    for i in range(n - 1):
-        post_map = np.kron(post_map, np.eye(2))
-
-    central_parity_vec = qnet.parity_vector(n)
+    star_batch_probs = factorized_batch_joint_probs_fn(
+        star_ansatz, I22_x_inputs + J22_x_inputs, prep_inputs=prep_inputs
+    )
 
-    central_post_map = np.zeros((2, 2 ** n))
-    for i in range(len(central_parity_vec)):
-        val = central_parity_vec[i]
-        if val == 1:
-            central_post_map[0, i] = 1
-        else:
-            central_post_map[1, i] = 1
+    # the central detector outputs the parity of its n outcome bits, and the
+    # correlator of each noisy probability vector is a dot product with this vector
+    correlator_vec = detector_correlator_vector(error_maps, [1] * n + [n])
 
-    post_map = np.kron(post_map, central_post_map)
-
-    parity_vec = qnet.parity_vector(n + 1)
+    J22_scalars = np.array([(-1) ** (math.sum(x_inputs[0:n])) for x_inputs in J22_x_inputs])
 
     def cost(network_settings):
 
-        I22_x_settings = [
-            star_ansatz.qnode_settings(network_settings, prep_inputs, meas_inputs)
-            for meas_inputs in I22_x_inputs
-        ]
-        J22_x_settings = [
-            star_ansatz.qnode_settings(network_settings, prep_inputs, meas_inputs)
-            for meas_inputs in J22_x_inputs
-        ]
-
-        I22_score = 0
-        for I22_settings in I22_x_settings:
-            I22_probs = detector_errors @ post_map @ star_probs(I22_settings)
-
-            I22_correlator = math.sum(I22_probs * parity_vec)
-
-            I22_score += I22_correlator
-
-        J22_score = 0
-        for i in range(len(J22_x_settings)):
-
-            J22_scalar = (-1) ** (math.sum(J22_x_inputs[i][0:n]))
-
-            J22_settings = J22_x_settings[i]
-            J22_probs = detector_errors @ post_map @ star_probs(J22_settings)
+        correlators = math.dot(star_batch_probs(network_settings), correlator_vec)
 
-            J22_correlator = math.sum(J22_probs * parity_vec)
-            J22_score += J22_scalar * J22_correlator
+        I22_score = math.sum(correlators[0 : 2 ** n])
+        J22_score = math.sum(J22_scalars * correlators[2 ** n :])
 
         star_score = (
             np.power(math.abs(I22_score), 1 / n) / 2 + np.power(math.abs(J22_score), 1 / n) / 2
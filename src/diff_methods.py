@@ -0,0 +1,144 @@
+import pennylane as qml
+from pennylane import numpy as np
+from pennylane.devices.default_mixed import DefaultMixed
+import qnetvo as qnet
+
+
+def _reshape(array, shape):
+    """Reshapes the ``array`` where the Kraus operators of a channel are passed as a list of
+    differentiable matrices."""
+    return np.reshape(np.stack(array) if isinstance(array, list) else array, shape)
+
+
+class DefaultMixedAutograd(DefaultMixed):
+    """The ``"default.mixed"`` simulator evaluated with Autograd such that QNodes on this
+    device support ``diff_method="backprop"``.
+
+    The density matrix is evolved with the same tensor contractions as ``"default.mixed"``,
+    hence, the gradient of a cost is evaluated with one forward and one reverse pass
+    through the simulation regardless of the number of settings.
+    """
+
+    short_name = "default.mixed.autograd"
+
+    _dot = staticmethod(np.dot)
+    _abs = staticmethod(np.abs)
+    _reduce_sum = staticmethod(lambda array, axes: np.sum(array, axis=tuple(axes)))
+    _reshape = staticmethod(_reshape)
+    _flatten = staticmethod(lambda array: array.flatten())
+    _gather = staticmethod(lambda array, indices: array[indices])
+    _einsum = staticmethod(np.einsum)
+    _cast = staticmethod(np.asarray)
+    _transpose = staticmethod(np.transpose)
+    _tensordot = staticmethod(np.tensordot)
+    _conj = staticmethod(np.conj)
+    _real = staticmethod(np.real)
+    _imag = staticmethod(np.imag)
+    _roll = staticmethod(np.roll)
+    _stack = staticmethod(np.stack)
+    _outer = staticmethod(np.outer)
+    _diag = staticmethod(np.diag)
+
+    @staticmethod
+    def _asarray(array, dtype=None):
+        res = np.asarray(array, dtype=dtype)
+        if res.dtype is np.dtype("O"):
+            return np.hstack(array).flatten().astype(dtype)
+        return res
+
+    @classmethod
+    def capabilities(cls):
+        capabilities = super().capabilities().copy()
+        capabilities.update(passthru_interface="autograd", supports_reversible_diff=False)
+        return capabilities
+
+
+class DensityBackpropNetworkAnsatz(qnet.NetworkAnsatz):
+    """A ``qnet.NetworkAnsatz`` whose QNodes simulate the network on a
+    ``DefaultMixedAutograd`` device.
+    """
+
+    def device(self):
+        self.dev = DefaultMixedAutograd(wires=self.network_wires)
+        return self.dev
+
+
+def _has_channels(noise_nodes):
+    """Returns ``True`` if any of the ``noise_nodes`` applies a non-unitary channel."""
+    for node in noise_nodes:
+        with qml.tape.QuantumTape() as tape:
+            node.ansatz_fn([], node.wires)
+
+        if any([isinstance(op, qml.operation.Channel) for op in tape.operations]):
+            return True
+
+    return False
+
+
+def diff_method_network_ansatz(
+    prepare_nodes, measure_nodes, noise_nodes=[], ansatz_kwargs={}, qnode_kwargs={}
+):
+    """Constructs the network ansatz simulated with the differentiation method selected by
+    ``qnode_kwargs["diff_method"]`` along with the keyword arguments for its QNodes.
+
+    In addition to the differentiation methods of PennyLane, the following are supported:
+
+    * ``"adjoint"``: The network is simulated on ``"default.qubit"`` and differentiated with the
+      adjoint method. All noise nodes must be unitary, e.g., purified noise with ancilla wires,
+      and the cost function must evaluate expectation values.
+    * ``"density_backprop"``: The network is simulated on a ``DefaultMixedAutograd`` device
+      and the density matrix simulation is differentiated in reverse mode. Any noise nodes and
+      measurements are supported.
+
+    Both methods evaluate the gradient with a cost of roughly one forward and one backward pass
+    through the simulation, whereas the parameter-shift rule requires two circuit evaluations
+    for each setting.
+
+    :param prepare_nodes: A list of qnet.PrepareNode classes for the network ansatz.
+    :type prepare_nodes: list[PrepareNode]
+
+    :param measure_nodes: A list of qnet.MeasureNode classes for the network ansatz.
+    :type measure_nodes: list[MeasureNode]
+
+    :param noise_nodes: A list of qnet.NoiseNode classes for the network ansatz.
+    :type noise_nodes: optional, list[NoiseNode]
+
+    :param ansatz_kwargs: Keyword arguments for the ``qnet.NetworkAnsatz`` class.
+    :type ansatz_kwargs: optional, dictionary
+
+    :param qnode_kwargs: Keyword arguments passed to the QNode constructors.
+    :type qnode_kwargs: optional, dictionary
+
+    :returns: A tuple of the network ansatz and the QNode keyword arguments.
+    :rtype: Tuple[qnet.NetworkAnsatz, Dictionary]
+
+    :raises ValueError: If the ``"adjoint"`` method is used with non-unitary noise.
+    """
+    diff_method = qnode_kwargs.get("diff_method", None)
+
+    if diff_method == "adjoint":
+        if _has_channels(noise_nodes):
+            raise ValueError(
+                "The adjoint method requires unitary noise nodes, "
+                + 'e.g., purified noise with ancilla wires, or use "density_backprop".'
+            )
+
+        ansatz = qnet.NetworkAnsatz(
+            prepare_nodes,
+            measure_nodes,
+            noise_nodes,
+            **{**ansatz_kwargs, "dev_kwargs": {"name": "default.qubit"}}
+        )
+
+        return ansatz, qnode_kwargs
+
+    if diff_method == "density_backprop":
+        ansatz = DensityBackpropNetworkAnsatz(
+            prepare_nodes, measure_nodes, noise_nodes, **ansatz_kwargs
+        )
+
+        return ansatz, {**qnode_kwargs, "interface": "autograd", "diff_method": "backprop"}
+
+    ansatz = qnet.NetworkAnsatz(prepare_nodes, measure_nodes, noise_nodes, **ansatz_kwargs)
+
+    return ansatz, qnode_kwargs
@@ -0,0 +1,677 @@
+import string
+
+import pennylane as qml
+from pennylane import numpy as np
+from pennylane import math
+import qnetvo as qnet
+
+
+def _reject_qnode_kwargs(cost_fn_name, qnode_kwargs):
+    """Raises a ``ValueError`` if ``qnode_kwargs`` are passed to a cost function that is
+    simulated without QNodes, e.g., a device with shots or a ``diff_method`` would be ignored.
+    """
+    if len(qnode_kwargs) > 0:
+        raise ValueError(
+            cost_fn_name
+            + " is simulated without QNodes and does not support the qnode_kwargs "
+            + ", ".join(qnode_kwargs.keys())
+            + "."
+        )
+
+
+def _node_ops(node, settings):
+    """Records the operations applied by the ``node`` quantum function."""
+    with qml.tape.QuantumTape() as tape:
+        node.ansatz_fn(settings, node.wires)
+
+    return tape
+
+
+def _labeled_einsum(operands, out_labels):
+    """Evaluates an ``einsum`` where each operand is a ``(tensor, labels)`` pair.
+    Labels can be any hashable and are mapped to einsum subscripts on each call,
+    therefore, only the labels of a single contraction count toward the subscript limit.
+    """
+    letters = {}
+    for labels in [labels for _, labels in operands] + [out_labels]:
+        for label in labels:
+            if label not in letters:
+                letters[label] = string.ascii_letters[len(letters)]
+
+    in_subscripts = ",".join("".join(letters[label] for label in labels) for _, labels in operands)
+    out_subscripts = "".join(letters[label] for label in out_labels)
+
+    return np.einsum(in_subscripts + "->" + out_subscripts, *[tensor for tensor, _ in operands])
+
+
+def _contract_pair(tensor_a, labels_a, tensor_b, labels_b, open_labels=[]):
+    """Contracts all labels shared by the two tensors except for the ``open_labels``."""
+    shared = set(labels_a) & set(labels_b)
+    out_labels = [label for label in labels_a if label not in shared or label in open_labels]
+    out_labels += [
+        label
+        for label in labels_b
+        if (label not in shared or label in open_labels) and label not in out_labels
+    ]
+
+    return _labeled_einsum([(tensor_a, labels_a), (tensor_b, labels_b)], out_labels), out_labels
+
+
+def _kraus_matrices(op):
+    """Returns the Kraus operators of a channel or the matrix of a unitary operation."""
+    return op.kraus_matrices() if isinstance(op, qml.operation.Channel) else [qml.matrix(op)]
+
+
+def _apply_operators(rho, kraus_ops, op_wires, wires, batched=False):
+    """Applies the channel described by ``kraus_ops`` to the density operator ``rho``
+    of the ``wires``. The channel acts upon the subset ``op_wires``.
+    If ``batched``, the density operator and each Kraus operator have a leading batch axis.
+    """
+    num_wires = len(wires)
+    num_op_wires = len(op_wires)
+    batch_shape = list(math.shape(rho)[0:1]) if batched else []
+    batch_labels = ["batch"] if batched else []
+
+    rho_labels = batch_labels + [("k", w) for w in wires] + [("b", w) for w in wires]
+    out_labels = (
+        batch_labels
+        + [("k'", w) if w in op_wires else ("k", w) for w in wires]
+        + [("b'", w) if w in op_wires else ("b", w) for w in wires]
+    )
+    ket_labels = batch_labels + [("k'", w) for w in op_wires] + [("k", w) for w in op_wires]
+    bra_labels = batch_labels + [("b'", w) for w in op_wires] + [("b", w) for w in op_wires]
+
+    rho_tensor = math.reshape(rho, batch_shape + [2] * (2 * num_wires))
+    new_rho = 0
+    for kraus_op in kraus_ops:
+        kraus_tensor = math.reshape(kraus_op, batch_shape + [2] * (2 * num_op_wires))
+        new_rho = new_rho + _labeled_einsum(
+            [
+                (kraus_tensor, ket_labels),
+                (rho_tensor, rho_labels),
+                (np.conj(kraus_tensor), bra_labels),
+            ],
+            out_labels,
+        )
+
+    return math.reshape(new_rho, batch_shape + [2 ** num_wires, 2 ** num_wires])
+
+
+def network_sources(network_ansatz):
+    """Partitions the network wires into independent sources.
+
+    Each ``PrepareNode`` of the ``network_ansatz`` is a source. Measured wires that are not
+    prepared by any node are treated as sources initialized in the :math:`|0\\rangle` state.
+    Each ``NoiseNode`` is assigned to the source on which it acts.
+
+    :param network_ansatz: The network ansatz to partition.
+    :type network_ansatz: qnetvo.NetworkAnsatz
+
+    :returns: A list of dictionaries with keys ``"wires"``, ``"prep_node"`` (``None`` for
+              unprepared wires), and ``"noise_nodes"``.
+    :rtype: List[Dictionary]
+
+    :raises ValueError: If a noise node acts upon the wires of more than one source.
+    """
+    sources = [
+        {"wires": list(node.wires), "prep_node": node, "noise_nodes": []}
+        for node in network_ansatz.prepare_nodes
+    ]
+
+    prepared_wires = [wire for source in sources for wire in source["wires"]]
+    sources += [
+        {"wires": [wire], "prep_node": None, "noise_nodes": []}
+        for wire in network_ansatz.measure_wires
+        if wire not in prepared_wires
+    ]
+
+    for noise_node in network_ansatz.noise_nodes:
+        noise_sources = [
+            source for source in sources if set(noise_node.wires) <= set(source["wires"])
+        ]
+        if len(noise_sources) != 1:
+            raise ValueError(
+                "Noise node on wires "
+                + str(list(noise_node.wires))
+                + " does not act upon a single source. Noise must be local to a source, "
+                + "e.g., use Kraus noise nodes instead of purified noise with ancilla wires."
+            )
+
+        noise_sources[0]["noise_nodes"].append(noise_node)
+
+    return sources
+
+
+def source_density_matrices_fn(network_ansatz):
+    """Constructs a function that evaluates the (noisy) density matrix prepared by
+    each source in the ``network_ansatz``.
+
+    The state of each source is simulated independently. Noise is applied to the
+    reduced state of the source on which it acts using Kraus operators.
+
+    :param network_ansatz: The network ansatz to simulate.
+    :type network_ansatz: qnetvo.NetworkAnsatz
+
+    :returns: A function ``source_density_matrices(prep_settings)`` where ``prep_settings``
+              are the preparation layer settings (see ``qnetvo.NetworkAnsatz.layer_settings``).
+              The function returns a list of density matrices, one for each source listed in
+              ``network_sources(network_ansatz)``, expressed in the wire order of the source.
+    :rtype: Function
+    """
+    sources = network_sources(network_ansatz)
+
+    prep_settings_ids = {}
+    current_id = 0
+    for node in network_ansatz.prepare_nodes:
+        prep_settings_ids[id(node)] = (current_id, current_id + node.num_settings)
+        current_id += node.num_settings
+
+    def source_density_matrices(prep_settings):
+        states = []
+        for source in sources:
+            wires = source["wires"]
+            prep_node = source["prep_node"]
+
+            if prep_node is None:
+                state = np.array([1, 0])
+            else:
+                start_id, end_id = prep_settings_ids[id(prep_node)]
+                tape = _node_ops(prep_node, prep_settings[start_id:end_id])
+                state = qml.matrix(tape, wire_order=wires)[:, 0]
+
+            rho = np.outer(state, np.conj(state))
+
+            for noise_node in source["noise_nodes"]:
+                for op in _node_ops(noise_node, []).operations:
+                    rho = _apply_operators(rho, _kraus_matrices(op), list(op.wires), wires)
+
+            states.append(rho)
+
+        return states
+
+    return source_density_matrices
+
+
+def measure_node_unitaries_fn(network_ansatz):
+    """Constructs a function that evaluates the unitary applied by each measurement node
+    before the computational basis measurement.
+
+    :param network_ansatz: The network ansatz to simulate.
+    :type network_ansatz: qnetvo.NetworkAnsatz
+
+    :returns: A function ``measure_node_unitaries(meas_settings)`` where ``meas_settings`` are the
+              measurement layer settings. The function returns a list of unitary matrices
+              expressed in the wire order of each measurement node.
+    :rtype: Function
+    """
+
+    def measure_node_unitaries(meas_settings):
+        unitaries = []
+        current_id = 0
+        for node in network_ansatz.measure_nodes:
+            node_settings = meas_settings[current_id : current_id + node.num_settings]
+            current_id += node.num_settings
+
+            tape = _node_ops(node, node_settings)
+            unitaries.append(qml.matrix(tape, wire_order=list(node.wires)))
+
+        return unitaries
+
+    return measure_node_unitaries
+
+
+def measure_node_input_unitaries_fn(network_ansatz, meas_inputs_batch):
+    """Constructs a function that evaluates the unitary applied by each measurement node
+    for each of its classical inputs appearing in ``meas_inputs_batch``.
+
+    Each unitary is evaluated once, regardless of how many input combinations use it.
+
+    :param network_ansatz: The network ansatz to simulate.
+    :type network_ansatz: qnetvo.NetworkAnsatz
+
+    :param meas_inputs_batch: The measurement node inputs of each circuit in the batch.
+    :type meas_inputs_batch: List[List[Int]]
+
+    :returns: A function ``measure_node_input_unitaries(meas_scenario_settings)`` where
+              ``meas_scenario_settings`` are the measurement settings of the scenario settings,
+              i.e., ``scenario_settings[1]``. The function returns a list containing a dictionary
+              for each measurement node that maps each used input to its unitary matrix.
+    :rtype: Function
+    """
+    node_inputs = [
+        sorted(set([meas_inputs[i] for meas_inputs in meas_inputs_batch]))
+        for i in range(len(network_ansatz.measure_nodes))
+    ]
+
+    def measure_node_input_unitaries(meas_scenario_settings):
+        unitaries = []
+        for i, node in enumerate(network_ansatz.measure_nodes):
+            node_unitaries = {}
+            for x in node_inputs[i]:
+                node_settings = network_ansatz.layer_settings(
+                    [meas_scenario_settings[i]], [x], [node]
+                )
+                tape = _node_ops(node, node_settings)
+                node_unitaries[x] = qml.matrix(tape, wire_order=list(node.wires))
+
+            unitaries.append(node_unitaries)
+
+        return unitaries
+
+    return measure_node_input_unitaries
+
+
+def _parity_observable(unitary, parity_diag):
+    """Returns the local parity observable :math:`U^\\dagger Z^{\\otimes m}U`."""
+    return math.dot(np.conj(math.T(unitary)) * parity_diag, unitary)
+
+
+def _povm(unitary):
+    """Returns the POVM elements :math:`U^\\dagger|o\\rangle\\langle o|U` stacked along
+    the first index."""
+    return np.einsum("oi,oj->oij", np.conj(unitary), unitary)
+
+
+def contract_network(
+    source_states, sources, node_operators, node_wires, open_labels=[], batched=False
+):
+    """Contracts the tensor network formed by the source density matrices and
+    the operators of each measurement node.
+
+    Each measurement node operator :math:`O_j` is contracted as :math:`\\text{Tr}[O_j\\rho]`
+    with the joint state of the sources. Sources are added one at a time and each measurement
+    node is contracted as soon as all of its wires are available. For networks such as the
+    :math:`n`-local chain, the cost of contraction therefore scales linearly in :math:`n`.
+
+    If ``batched``, each source state and node operator has a leading batch axis, e.g.,
+    one element for each noise parameter of a scan, and the batch axis is the leading
+    axis of the contracted tensor.
+
+    :param source_states: The density matrix of each source.
+    :type source_states: List[np.array]
+
+    :param sources: The sources as returned by ``network_sources``.
+    :type sources: List[Dictionary]
+
+    :param node_operators: The operator for each measurement node. An operator tensor may
+                           have additional leading open indices, e.g., an outcome index, in
+                           which case the corresponding labels must be listed in ``open_labels``
+                           and prepended to the node operator as ``(tensor, extra_labels)``.
+    :type node_operators: List[np.array or Tuple[np.array, List]]
+
+    :param node_wires: The wires on which each measurement node operator acts.
+    :type node_wires: List[List[Int]]
+
+    :param open_labels: The labels left uncontracted, ordered as in the output tensor.
+    :type open_labels: optional, List
+
+    :param batched: If ``True`` all tensors have a leading batch axis.
+    :type batched: optional, Bool, default ``False``
+
+    :returns: The contracted tensor. A scalar if there are no ``open_labels``.
+    :rtype: np.array
+    """
+    measured_wires = [wire for wires in node_wires for wire in wires]
+    num_batch = 1 if batched else 0
+    batch_labels = ["batch"] if batched else []
+    open_labels = batch_labels + list(open_labels)
+
+    nodes = []
+    for operator, wires in zip(node_operators, node_wires):
+        extra_labels = []
+        if isinstance(operator, tuple):
+            operator, extra_labels = operator
+
+        num_extra = num_batch + len(extra_labels)
+        tensor = math.reshape(
+            operator, list(math.shape(operator)[0:num_extra]) + [2] * (2 * len(wires))
+        )
+        labels = batch_labels + extra_labels + [("b", w) for w in wires] + [("k", w) for w in wires]
+        nodes.append((tensor, labels, set(wires)))
+
+    result = None
+    result_labels = []
+    covered_wires = set()
+    for rho, source in zip(source_states, sources):
+        wires = source["wires"]
+        tensor = math.reshape(rho, list(math.shape(rho)[0:num_batch]) + [2] * (2 * len(wires)))
+        labels = [("k", w) for w in wires] + [("b", w) for w in wires]
+
+        # unmeasured wires are traced out of the source
+        traced_wires = [w for w in wires if w not in measured_wires]
+        if len(traced_wires) > 0:
+            labels = [
+                ("k", w) if w in traced_wires else label for w, label in zip(wires * 2, labels)
+            ]
+            out_labels = batch_labels + [label for label in labels if label[1] not in traced_wires]
+            tensor = _labeled_einsum([(tensor, batch_labels + labels)], out_labels)
+            labels = out_labels
+        else:
+            labels = batch_labels + labels
+
+        if result is None:
+            result, result_labels = tensor, labels
+        else:
+            result, result_labels = _contract_pair(
+                result, result_labels, tensor, labels, open_labels=open_labels
+            )
+
+        covered_wires |= set(wires)
+
+        ready_nodes = [node for node in nodes if node[2] <= covered_wires]
+        nodes = [node for node in nodes if not node[2] <= covered_wires]
+        for tensor, labels, _ in ready_nodes:
+            result, result_labels = _contract_pair(
+                result, result_labels, tensor, labels, open_labels=open_labels
+            )
+
+    return _labeled_einsum([(result, result_labels)], open_labels)
+
+
+def factorized_parity_expval_fn(network_ansatz):
+    """Constructs a function that evaluates the global parity expectation value of
+    the ``network_ansatz`` without simulating the joint state of all network wires.
+
+    The network is simulated as a tensor network of independent source density matrices
+    contracted with the local parity observable :math:`U_j^\\dagger Z^{\\otimes m}U_j`
+    of each measurement node. The returned function is a drop-in replacement for a
+    ``qnetvo.global_parity_expval_qnode``.
+
+    The device of the ``network_ansatz`` is never used. For large networks, the ansatz
+    should be constructed with ``dev_kwargs={"name": "default.qubit"}`` to avoid
+    allocating a ``"default.mixed"`` device for all network wires.
+
+    :param network_ansatz: The network ansatz to simulate. All noise nodes must act locally
+                           upon a single source.
+    :type network_ansatz: qnetvo.NetworkAnsatz
+
+    :returns: A function ``parity_expval(settings)`` where ``settings`` are constructed with
+              ``network_ansatz.qnode_settings``.
+    :rtype: Function
+    """
+    sources = network_sources(network_ansatz)
+    source_density_matrices = source_density_matrices_fn(network_ansatz)
+    measure_node_unitaries = measure_node_unitaries_fn(network_ansatz)
+
+    num_prep_settings = sum([node.num_settings for node in network_ansatz.prepare_nodes])
+    node_wires = [list(node.wires) for node in network_ansatz.measure_nodes]
+    parity_diags = [qnet.parity_vector(len(wires)) for wires in node_wires]
+
+    def parity_expval(settings):
+        states = source_density_matrices(settings[0:num_prep_settings])
+        unitaries = measure_node_unitaries(settings[num_prep_settings:])
+
+        observables = [
+            _parity_observable(unitary, parity_diag)
+            for unitary, parity_diag in zip(unitaries, parity_diags)
+        ]
+
+        return np.real(contract_network(states, sources, observables, node_wires))
+
+    return parity_expval
+
+
+def factorized_joint_probs_fn(network_ansatz):
+    """Constructs a function that evaluates the joint probability distribution over the
+    outcomes of all measurement nodes in the ``network_ansatz`` without simulating the
+    joint state of all network wires.
+
+    Each measurement node contributes the POVM elements :math:`U_j^\\dagger|o\\rangle\\langle o|U_j`
+    which are contracted with the independent source density matrices. The returned function
+    is a drop-in replacement for a ``qnetvo.joint_probs_qnode``.
+
+    :param network_ansatz: The network ansatz to simulate. All noise nodes must act locally
+                           upon a single source.
+    :type network_ansatz: qnetvo.NetworkAnsatz
+
+    :returns: A function ``joint_probs(settings)`` where ``settings`` are constructed with
+              ``network_ansatz.qnode_settings``. The probabilities are ordered as in
+              ``qml.probs(wires=network_ansatz.measure_wires)``.
+    :rtype: Function
+    """
+    sources = network_sources(network_ansatz)
+    source_density_matrices = source_density_matrices_fn(network_ansatz)
+    measure_node_unitaries = measure_node_unitaries_fn(network_ansatz)
+
+    num_prep_settings = sum([node.num_settings for node in network_ansatz.prepare_nodes])
+    node_wires = [list(node.wires) for node in network_ansatz.measure_nodes]
+    outcome_labels = [("o", i) for i in range(len(node_wires))]
+
+    def joint_probs(settings):
+        states = source_density_matrices(settings[0:num_prep_settings])
+        unitaries = measure_node_unitaries(settings[num_prep_settings:])
+
+        povms = [(_povm(unitary), [label]) for unitary, label in zip(unitaries, outcome_labels)]
+
+        probs = contract_network(states, sources, povms, node_wires, open_labels=outcome_labels)
+
+        return math.reshape(np.real(probs), (-1,))
+
+    return joint_probs
+
+
+def factorized_batch_parity_expval_fn(network_ansatz, meas_inputs_batch, prep_inputs=None):
+    """Constructs a function that evaluates the global parity expectation value of the
+    ``network_ansatz`` for each measurement input combination in ``meas_inputs_batch``.
+
+    The sources are prepared once per evaluation and the local parity observable of each
+    measurement node is constructed once per node input. Each input combination then only
+    requires a contraction of the tensor network.
+
+    :param network_ansatz: The network ansatz to simulate. All noise nodes must act locally
+                           upon a single source.
+    :type network_ansatz: qnetvo.NetworkAnsatz
+
+    :param meas_inputs_batch: The measurement node inputs of each circuit in the batch.
+    :type meas_inputs_batch: List[List[Int]]
+
+    :param prep_inputs: The preparation node inputs shared by all circuits in the batch.
+    :type prep_inputs: optional, List[Int], default all ``0``
+
+    :returns: A function ``batch_parity_expval(scenario_settings)`` returning an array of
+              shape ``(len(meas_inputs_batch),)``.
+    :rtype: Function
+    """
+    sources = network_sources(network_ansatz)
+    source_density_matrices = source_density_matrices_fn(network_ansatz)
+    measure_node_input_unitaries = measure_node_input_unitaries_fn(
+        network_ansatz, meas_inputs_batch
+    )
+
+    prep_inputs = prep_inputs or [0] * len(network_ansatz.prepare_nodes)
+    node_wires = [list(node.wires) for node in network_ansatz.measure_nodes]
+    parity_diags = [qnet.parity_vector(len(wires)) for wires in node_wires]
+
+    def batch_parity_expval(scenario_settings):
+        prep_settings = network_ansatz.layer_settings(
+            scenario_settings[0], prep_inputs, network_ansatz.prepare_nodes
+        )
+        states = source_density_matrices(prep_settings)
+        unitaries = measure_node_input_unitaries(scenario_settings[1])
+
+        observables = [
+            {x: _parity_observable(unitary, parity_diag) for x, unitary in node_unitaries.items()}
+            for node_unitaries, parity_diag in zip(unitaries, parity_diags)
+        ]
+
+        expvals = [
+            contract_network(
+                states,
+                sources,
+                [node_observables[x] for node_observables, x in zip(observables, meas_inputs)],
+                node_wires,
+            )
+            for meas_inputs in meas_inputs_batch
+        ]
+
+        return np.real(math.stack(expvals))
+
+    return batch_parity_expval
+
+
+def factorized_batch_joint_probs_fn(network_ansatz, meas_inputs_batch, prep_inputs=None):
+    """Constructs a function that evaluates the joint probability distribution of the
+    ``network_ansatz`` for each measurement input combination in ``meas_inputs_batch``.
+
+    The sources are prepared once per evaluation and the POVM of each measurement node
+    is constructed once per node input. Each input combination then only requires a
+    contraction of the tensor network.
+
+    :param network_ansatz: The network ansatz to simulate. All noise nodes must act locally
+                           upon a single source.
+    :type network_ansatz: qnetvo.NetworkAnsatz
+
+    :param meas_inputs_batch: The measurement node inputs of each circuit in the batch.
+    :type meas_inputs_batch: List[List[Int]]
+
+    :param prep_inputs: The preparation node inputs shared by all circuits in the batch.
+    :type prep_inputs: optional, List[Int], default all ``0``
+
+    :returns: A function ``batch_joint_probs(scenario_settings)`` returning an array of shape
+              ``(len(meas_inputs_batch), num_outcomes)``. The probabilities are ordered as in
+              ``qml.probs(wires=network_ansatz.measure_wires)``.
+    :rtype: Function
+    """
+    sources = network_sources(network_ansatz)
+    source_density_matrices = source_density_matrices_fn(network_ansatz)
+    measure_node_input_unitaries = measure_node_input_unitaries_fn(
+        network_ansatz, meas_inputs_batch
+    )
+
+    prep_inputs = prep_inputs or [0] * len(network_ansatz.prepare_nodes)
+    node_wires = [list(node.wires) for node in network_ansatz.measure_nodes]
+    outcome_labels = [("o", i) for i in range(len(node_wires))]
+
+    def batch_joint_probs(scenario_settings):
+        prep_settings = network_ansatz.layer_settings(
+            scenario_settings[0], prep_inputs, network_ansatz.prepare_nodes
+        )
+        states = source_density_matrices(prep_settings)
+        unitaries = measure_node_input_unitaries(scenario_settings[1])
+
+        povms = [
+            {x: (_povm(unitary), [label]) for x, unitary in node_unitaries.items()}
+            for node_unitaries, label in zip(unitaries, outcome_labels)
+        ]
+
+        probs = [
+            math.reshape(
+                contract_network(
+                    states,
+                    sources,
+                    [node_povms[x] for node_povms, x in zip(povms, meas_inputs)],
+                    node_wires,
+                    open_labels=outcome_labels,
+                ),
+                (-1,),
+            )
+            for meas_inputs in meas_inputs_batch
+        ]
+
+        return np.real(math.stack(probs))
+
+    return batch_joint_probs
+
+
+def _nlocal_chain_22_inputs(network_ansatz):
+    """The measurement inputs of the :math:`I_{22}` and :math:`J_{22}` correlators
+    of the :math:`n`-local chain."""
+    num_interior_nodes = len(network_ansatz.measure_nodes) - 2
+    xy_vals = [[0, 0], [0, 1], [1, 0], [1, 1]]
+
+    I22_xy_inputs = [[x_a] + [0] * num_interior_nodes + [x_b] for x_a, x_b in xy_vals]
+    J22_xy_inputs = [[x_a] + [1] * num_interior_nodes + [x_b] for x_a, x_b in xy_vals]
+
+    return I22_xy_inputs + J22_xy_inputs
+
+
+_CHAIN_J22_SCALARS = np.array([1, -1, -1, 1])
+
+
+def _nlocal_chain_22_cost(expvals):
+    """The :math:`n`-local chain cost of the correlators ``expvals`` evaluated for
+    ``_nlocal_chain_22_inputs``. Additional trailing axes of ``expvals`` are kept."""
+    I22_score = math.sum(expvals[0:4], axis=0)
+    J22_score = np.tensordot(_CHAIN_J22_SCALARS, expvals[4:8], axes=1)
+
+    return -(math.sqrt(math.abs(I22_score) / 4) + math.sqrt(math.abs(J22_score) / 4))
+
+
+def _nlocal_star_22_inputs(n):
+    """The measurement inputs of the :math:`I_{22}` and :math:`J_{22}` correlators
+    of the :math:`n`-local star and the signs of the :math:`J_{22}` correlators."""
+    I22_x_inputs = [[int(bit) for bit in np.binary_repr(x, width=n) + "0"] for x in range(2 ** n)]
+    J22_x_inputs = [[int(bit) for bit in np.binary_repr(x, width=n) + "1"] for x in range(2 ** n)]
+    J22_scalars = np.array([(-1) ** sum(x_inputs[0:n]) for x_inputs in J22_x_inputs])
+
+    return I22_x_inputs + J22_x_inputs, J22_scalars
+
+
+def _nlocal_star_22_cost(expvals, J22_scalars, n):
+    """The :math:`n`-local star cost of the correlators ``expvals`` evaluated for
+    ``_nlocal_star_22_inputs(n)``. Additional trailing axes of ``expvals`` are kept."""
+    I22_score = math.sum(expvals[0 : 2 ** n], axis=0) / (2 ** n)
+    J22_score = np.tensordot(J22_scalars, expvals[2 ** n :], axes=1) / (2 ** n)
+
+    return -(np.power(math.abs(I22_score), 1 / n) + np.power(math.abs(J22_score), 1 / n))
+
+
+def factorized_nlocal_chain_cost_22(network_ansatz, **qnode_kwargs):
+    """Constructs the :math:`n`-local chain cost function as in ``qnetvo.nlocal_chain_cost_22``,
+    but evaluates all correlators with ``factorized_batch_parity_expval_fn``.
+
+    The cost of each evaluation scales linearly with the number of sources in the chain.
+
+    :param network_ansatz: The ansatz for the :math:`n`-local chain network.
+    :type network_ansatz: qnetvo.NetworkAnsatz
+
+    :param qnode_kwargs: Accepted for compatibility with qnode-based cost functions and must
+                         be empty.
+    :type qnode_kwargs: Dictionary
+
+    :returns: A cost function evaluated as ``cost(scenario_settings)``.
+    :rtype: Function
+
+    :raises ValueError: If any ``qnode_kwargs`` are passed.
+    """
+    _reject_qnode_kwargs("factorized_nlocal_chain_cost_22", qnode_kwargs)
+
+    chain_expvals = factorized_batch_parity_expval_fn(
+        network_ansatz, _nlocal_chain_22_inputs(network_ansatz)
+    )
+
+    def cost(scenario_settings):
+        return _nlocal_chain_22_cost(chain_expvals(scenario_settings))
+
+    return cost
+
+
+def factorized_nlocal_star_22_cost_fn(network_ansatz, **qnode_kwargs):
+    """Constructs the :math:`n`-local star cost function as in ``qnetvo.nlocal_star_22_cost_fn``,
+    but evaluates all correlators with ``factorized_batch_parity_expval_fn``.
+
+    The cost of each evaluation scales linearly with the number of sources in the star
+    apart from the central measurement node, which is contracted once per input combination.
+
+    :param network_ansatz: The ansatz for the :math:`n`-local star network.
+    :type network_ansatz: qnetvo.NetworkAnsatz
+
+    :param qnode_kwargs: Accepted for compatibility with qnode-based cost functions and must
+                         be empty.
+    :type qnode_kwargs: Dictionary
+
+    :returns: A cost function evaluated as ``cost(scenario_settings)``.
+    :rtype: Function
+
+    :raises ValueError: If any ``qnode_kwargs`` are passed.
+    """
+    _reject_qnode_kwargs("factorized_nlocal_star_22_cost_fn", qnode_kwargs)
+
+    n = len(network_ansatz.prepare_nodes)
+    x_inputs, J22_scalars = _nlocal_star_22_inputs(n)
+    star_expvals = factorized_batch_parity_expval_fn(network_ansatz, x_inputs)
+
+    def cost(scenario_settings):
+        return _nlocal_star_22_cost(star_expvals(scenario_settings), J22_scalars, n)
+
+    return cost
@@ -0,0 +1,102 @@
+import itertools
+
+from pennylane import numpy as np
+
+
+def qnode_settings_index_map(network_ansatz):
+    """Precomputes the positions of the qnode settings of each input combination in the
+    flat settings of the ``network_ansatz``, i.e., the settings of each node with inputs
+    in row-major order as returned by ``flatten_settings``.
+
+    The settings of nodes with static settings are appended to the flat settings, hence,
+    the qnode settings for the ``prep_inputs`` and ``meas_inputs`` are
+    ``np.concatenate([flat_settings, static_settings])[index_map[(prep_inputs, meas_inputs)]]``
+    and equal ``network_ansatz.qnode_settings(scenario_settings, prep_inputs, meas_inputs)``.
+
+    :param network_ansatz: The network ansatz.
+    :type network_ansatz: qnet.NetworkAnsatz
+
+    :returns: The ``index_map`` dictionary keyed by the tuples of preparation and
+              measurement inputs and the array of ``static_settings``.
+    :rtype: Tuple[Dictionary, np.array]
+    """
+    nodes = network_ansatz.prepare_nodes + network_ansatz.measure_nodes
+    num_prep_nodes = len(network_ansatz.prepare_nodes)
+
+    num_flat_settings = sum(
+        [node.num_in * node.num_settings for node in nodes if len(node.static_settings) == 0]
+    )
+
+    # the settings ids of each node with shape (num_in, num_settings)
+    node_ids = []
+    static_settings = []
+    flat_id = 0
+    static_id = num_flat_settings
+    for node in nodes:
+        if len(node.static_settings) == 0:
+            size = node.num_in * node.num_settings
+            node_ids.append(np.arange(flat_id, flat_id + size).reshape(node.num_in, -1))
+            flat_id += size
+        else:
+            node_static_settings = np.array(node.static_settings, dtype=float)
+            size = node_static_settings.size
+            node_ids.append(np.arange(static_id, static_id + size).reshape(node.num_in, -1))
+            static_settings.append(np.ravel(node_static_settings))
+            static_id += size
+
+    index_map = {}
+    for inputs in itertools.product(*[range(node.num_in) for node in nodes]):
+        inputs_key = (inputs[0:num_prep_nodes], inputs[num_prep_nodes:])
+        index_map[inputs_key] = np.concatenate(
+            [np.zeros(0, dtype=int)] + [node_ids[i][x] for i, x in enumerate(inputs)]
+        ).astype(int)
+
+    return index_map, np.concatenate([np.zeros(0)] + static_settings)
+
+
+def flat_qnode_settings_fn(network_ansatz, inputs_batch=None):
+    """Constructs a function gathering the qnode settings of the ``network_ansatz`` from
+    its scenario settings in a single indexing operation.
+
+    The settings of all nodes are concatenated once per call into a buffer in the layout of
+    ``qnode_settings_index_map`` from which the qnode settings of every input are gathered.
+
+    :param network_ansatz: The network ansatz.
+    :type network_ansatz: qnet.NetworkAnsatz
+
+    :param inputs_batch: A list of ``(prep_inputs, meas_inputs)`` pairs. If provided, the
+                         returned function evaluates the qnode settings of all pairs at once.
+    :type inputs_batch: optional, List[Tuple[List[Int], List[Int]]]
+
+    :returns: A function ``qnode_settings(scenario_settings, prep_inputs, meas_inputs)`` or,
+              if the ``inputs_batch`` is provided, ``batch_qnode_settings(scenario_settings)``
+              returning an array with one row of qnode settings per input pair.
+    :rtype: Function
+    """
+    index_map, static_settings = qnode_settings_index_map(network_ansatz)
+
+    def _settings_buffer(scenario_settings):
+        return np.concatenate(
+            [np.ravel(node_settings) for layer in scenario_settings for node_settings in layer]
+            + [static_settings]
+        )
+
+    if inputs_batch is not None:
+        batch_ids = np.array(
+            [
+                index_map[(tuple(prep_inputs), tuple(meas_inputs))]
+                for prep_inputs, meas_inputs in inputs_batch
+            ],
+            dtype=int,
+        )
+
+        def batch_qnode_settings(scenario_settings):
+            return _settings_buffer(scenario_settings)[batch_ids]
+
+        return batch_qnode_settings
+
+    def qnode_settings(scenario_settings, prep_inputs, meas_inputs):
+        settings_ids = index_map[(tuple(prep_inputs), tuple(meas_inputs))]
+        return _settings_buffer(scenario_settings)[settings_ids]
+
+    return qnode_settings
@@ -2,35 +2,44 @@ from pennylane import numpy as np
 import pennylane as qml
 
 
-def chsh_violation_criterion(operator):
-    """Collect the data needed to use the necessary conditions
-    for violation of the CHSH inequality.
+# the two-qubit Pauli products sigma_i (x) sigma_j with shape (3, 3, 4, 4)
+_PAULIS = np.array([[[0, 1], [1, 0]], [[0, -1j], [1j, 0]], [[1, 0], [0, -1]]])
+_PAULI_PRODS = np.einsum("iab,jcd->ijacbd", _PAULIS, _PAULIS).reshape(3, 3, 4, 4)
+
+
+def correlation_matrix(operator):
+    """Returns the correlation matrix :math:`T_{ij} = Tr[\\rho\\sigma_i\\otimes\\sigma_j]`
+    of a two-qubit density operator or a stack of operators with shape ``(..., 4, 4)``.
+    The correlation matrix is differentiable with respect to the ``operator``.
 
     :param operator: A matrix representing a two-qubit density operator.
     :type operator: np.array
 
-    :returns: A triple containing the correlation matrix `corr_mat`, the symmetric 
-              correlation matrix product `U`, an the eigenvalues of U
+    :returns: The correlation matrix with shape ``(..., 3, 3)``.
+    :rtype: np.array
     """
-    X = np.array([[0, 1], [1, 0]])
-    Y = np.array([[0, -1j], [1j, 0]])
-    Z = np.array([[1, 0], [0, -1]])
+    return np.real(np.einsum("...ab,ijba->...ij", operator, _PAULI_PRODS))
+
 
-    paulis = [X, Y, Z]
+def chsh_violation_criterion(operator):
+    """Collect the data needed to use the necessary conditions
+    for violation of the CHSH inequality.
 
-    corr_mat = np.zeros((3, 3))
-    for i in range(3):
-        pauli_i = paulis[i]
-        for j in range(3):
-            pauli_j = paulis[j]
+    The ``operator`` may be a stack of density operators with shape ``(..., 4, 4)``
+    in which case the criterion is evaluated for all operators at once.
 
-            pauli_op = np.kron(pauli_i, pauli_j)
+    :param operator: A matrix representing a two-qubit density operator.
+    :type operator: np.array
 
-            corr_mat[i, j] = np.real(np.trace(operator @ pauli_op))
+    :returns: A triple containing the correlation matrix `corr_mat`, the symmetric
+              correlation matrix product `U`, an the ascending eigenvalues of U,
+              each with the leading dimensions of the ``operator``.
+    """
+    corr_mat = correlation_matrix(operator)
 
-    U = corr_mat.T @ corr_mat
+    U = np.einsum("...ki,...kj->...ij", corr_mat, corr_mat)
 
-    eigenvals = np.sort(np.linalg.eigvals(U))
+    eigenvals = np.linalg.eigvalsh(U)
 
     return corr_mat, U, eigenvals
 
@@ -79,19 +88,22 @@ def star_max_violation_chsh_prod(states):
 
 def star_max_violation(states):
     """Returns the max star violation for the set of states using the
-    Horodecki-like violation criterion.
+    Horodecki-like violation criterion. Each state may be a stack of
+    density operators with shape ``(..., 4, 4)`` to evaluate many
+    networks at once.
     """
 
     n = len(states)
 
-    states_eigvals = [chsh_violation_criterion(state)[2] for state in states]
+    states_eigvals = chsh_violation_criterion(np.array(states))[2]
 
-    states_eigvals1 = [eigvals[-1] for eigvals in states_eigvals]
+    states_eigvals1 = states_eigvals[..., -1]
 
-    states_eigvals2 = [eigvals[-2] for eigvals in states_eigvals]
+    states_eigvals2 = states_eigvals[..., -2]
 
     return np.sqrt(
-        np.power(np.prod(states_eigvals1), 1 / n) + np.power(np.prod(states_eigvals2), 1 / n)
+        np.power(np.prod(states_eigvals1, axis=0), 1 / n)
+        + np.power(np.prod(states_eigvals2, axis=0), 1 / n)
     )
 
 
@@ -118,22 +130,26 @@ def chain_classical_interior_max_violation(states):
 
     S_bilocal = bilocal_max_violation_chsh_prod(states[0], states[-1])
 
-    interior_states_max_eigvals = [chsh_violation_criterion(state)[2][-1] for state in states[1:n]]
+    interior_states_max_eigvals = chsh_violation_criterion(np.array(states[1:n]))[2][..., -1]
 
     return S_bilocal * np.sqrt(np.prod(interior_states_max_eigvals))
 
 
 def chain_max_violation(states):
     """Returns the max chain violation for the set of states using the
-    Horodecki-like violation criterion.
+    Horodecki-like violation criterion. Each state may be a stack of
+    density operators with shape ``(..., 4, 4)`` to evaluate many
+    networks at once.
     """
 
     n = len(states)
 
-    states_eigvals = [chsh_violation_criterion(state)[2] for state in states]
+    states_eigvals = chsh_violation_criterion(np.array(states))[2]
 
-    states_eigvals1 = [eigvals[-1] for eigvals in states_eigvals]
+    states_eigvals1 = states_eigvals[..., -1]
 
-    states_eigvals2 = [eigvals[-2] for eigvals in states_eigvals]
+    states_eigvals2 = states_eigvals[..., -2]
 
-    return np.sqrt(np.sqrt(np.prod(states_eigvals1)) + np.sqrt(np.prod(states_eigvals2)))
+    return np.sqrt(
+        np.sqrt(np.prod(states_eigvals1, axis=0)) + np.sqrt(np.prod(states_eigvals2, axis=0))
+    )
@@ -97,19 +97,13 @@ def chain_local_ry_meas_nodes(n):
 
 def chain_local_rot_meas_nodes(n):
     meas_nodes = []
-    meas_nodes.append(
-        qnet.MeasureNode(2, 2, [0], lambda settings, wires: qml.Rot(*settings, wires=wires), 3)
-    )
+    meas_nodes.append(qnet.MeasureNode(2, 2, [0], local_rot, 3))
 
     meas_nodes.extend(
         [qnet.MeasureNode(2, 2, [2 * i + 1, 2 * i + 2], local_rot, 6) for i in range(n - 1)]
     )
 
-    meas_nodes.append(
-        qnet.MeasureNode(
-            2, 2, [2 * n - 1], lambda settings, wires: qml.Rot(*settings, wires=wires), 3
-        )
-    )
+    meas_nodes.append(qnet.MeasureNode(2, 2, [2 * n - 1], local_rot, 3))
     return meas_nodes
 
 
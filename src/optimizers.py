@@ -0,0 +1,409 @@
+from datetime import datetime
+import itertools
+import time
+
+import pennylane as qml
+from pennylane import numpy as np
+import qnetvo as qnet
+from scipy.optimize import minimize
+
+
+def flatten_settings(settings):
+    """Concatenates the nested scenario ``settings`` into a single array.
+
+    :param settings: The scenario settings.
+    :type settings: List[List[np.array]]
+
+    :returns: The flattened settings and the shape of each node's settings.
+    :rtype: Tuple[np.array, List[List[Tuple[Int]]]]
+    """
+    shapes = [[np.shape(node_settings) for node_settings in layer] for layer in settings]
+    flat_settings = np.concatenate(
+        [np.zeros(0)] + [np.ravel(node_settings) for layer in settings for node_settings in layer]
+    )
+
+    return flat_settings, shapes
+
+
+def unflatten_settings(flat_settings, shapes):
+    """Restores the nested scenario settings from ``flat_settings``.
+    The unflattening is differentiable with respect to the ``flat_settings``.
+
+    :param flat_settings: The flattened settings.
+    :type flat_settings: np.array
+
+    :param shapes: The shape of each node's settings as returned by ``flatten_settings``.
+    :type shapes: List[List[Tuple[Int]]]
+
+    :returns: The scenario settings.
+    :rtype: List[List[np.array]]
+    """
+    settings = []
+    current_id = 0
+    for layer_shapes in shapes:
+        layer = []
+        for shape in layer_shapes:
+            size = int(np.prod(shape))
+            layer.append(np.reshape(flat_settings[current_id : current_id + size], shape))
+            current_id += size
+
+        settings.append(layer)
+
+    return settings
+
+
+def _flat_descent(cost, init_settings, update_fn, name, num_steps, sample_width, grad_fn, verbose):
+    """Iterates ``update_fn(step, flat_settings, flat_grad)`` over the flattened settings
+    and collects the optimization dictionary in the format of ``qnetvo.gradient_descent``.
+    """
+    if grad_fn is None:
+        grad_fn = qml.grad(cost, argnum=0)
+
+    flat_settings, shapes = flatten_settings(init_settings)
+    settings = init_settings
+
+    scores = []
+    samples = []
+    step_times = []
+    settings_history = [init_settings]
+
+    start_datetime = datetime.utcnow()
+    elapsed = 0
+
+    for step in range(num_steps):
+        if step % sample_width == 0:
+            score = -(cost(settings))
+            scores.append(score)
+            samples.append(step)
+
+            if verbose:
+                print("iteration : ", step, ", score : ", score)
+
+        start = time.time()
+        flat_grad, _ = flatten_settings(grad_fn(settings))
+        flat_settings = np.array(
+            update_fn(step, flat_settings, flat_grad, settings), requires_grad=True
+        )
+        settings = unflatten_settings(flat_settings, shapes)
+        elapsed = time.time() - start
+
+        if step % sample_width == 0:
+            step_times.append(elapsed)
+
+            if verbose:
+                print("elapsed time : ", elapsed)
+
+        settings_history.append(settings)
+
+    opt_score = -(cost(settings))
+    step_times.append(elapsed)
+
+    scores.append(opt_score)
+    samples.append(num_steps)
+
+    return {
+        "datetime": start_datetime.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "opt_score": opt_score,
+        "opt_settings": settings,
+        "scores": scores,
+        "samples": samples,
+        "settings_history": settings_history,
+        "step_times": step_times,
+        "optimizer": name,
+    }
+
+
+def adam(
+    cost,
+    init_settings,
+    num_steps=150,
+    step_size=0.1,
+    sample_width=25,
+    grad_fn=None,
+    verbose=True,
+    beta1=0.9,
+    beta2=0.999,
+    eps=1e-8,
+):
+    """Minimizes the ``cost`` with the Adam optimizer.
+
+    The arguments and returned optimization dictionary are the same as for
+    ``qnetvo.gradient_descent`` where the ``step_size`` is the learning rate of Adam.
+
+    :param beta1: The decay rate of the first moment of the gradient.
+    :type beta1: optional, Float, default ``0.9``
+
+    :param beta2: The decay rate of the second moment of the gradient.
+    :type beta2: optional, Float, default ``0.999``
+
+    :param eps: The offset avoiding division by zero.
+    :type eps: optional, Float, default ``1e-8``
+
+    :returns: An optimization dictionary.
+    :rtype: Dictionary
+    """
+    moments = {}
+
+    def update(step, flat_settings, flat_grad, settings):
+        if step == 0:
+            moments["first"] = np.zeros(len(flat_grad))
+            moments["second"] = np.zeros(len(flat_grad))
+
+        moments["first"] = beta1 * moments["first"] + (1 - beta1) * flat_grad
+        moments["second"] = beta2 * moments["second"] + (1 - beta2) * flat_grad ** 2
+
+        first = moments["first"] / (1 - beta1 ** (step + 1))
+        second = moments["second"] / (1 - beta2 ** (step + 1))
+
+        return flat_settings - step_size * first / (np.sqrt(second) + eps)
+
+    opt_dict = _flat_descent(
+        cost, init_settings, update, "adam", num_steps, sample_width, grad_fn, verbose
+    )
+    opt_dict["step_size"] = step_size
+
+    return opt_dict
+
+
+def natural_gradient_descent(
+    cost,
+    init_settings,
+    metric_fn,
+    num_steps=150,
+    step_size=0.1,
+    sample_width=25,
+    grad_fn=None,
+    verbose=True,
+    lam=0.01,
+):
+    """Minimizes the ``cost`` with natural gradient descent where each gradient
+    is preconditioned by the inverse of the regularized metric tensor.
+
+    The arguments and returned optimization dictionary are the same as for
+    ``qnetvo.gradient_descent``.
+
+    :param metric_fn: A function of the scenario settings returning the metric tensor
+                      with respect to the flattened settings, e.g., constructed with
+                      ``network_metric_tensor_fn``.
+    :type metric_fn: Function
+
+    :param lam: The regularization added to the diagonal of the metric tensor.
+    :type lam: optional, Float, default ``0.01``
+
+    :returns: An optimization dictionary.
+    :rtype: Dictionary
+    """
+
+    def update(step, flat_settings, flat_grad, settings):
+        metric = metric_fn(settings) + lam * np.eye(len(flat_grad))
+
+        return flat_settings - step_size * np.linalg.solve(metric, flat_grad)
+
+    opt_dict = _flat_descent(
+        cost, init_settings, update, "natural_gradient", num_steps, sample_width, grad_fn, verbose,
+    )
+    opt_dict["step_size"] = step_size
+
+    return opt_dict
+
+
+def network_metric_tensor_fn(network_ansatz):
+    """Constructs the Fubini-Study metric tensor of the noiseless network ansatz with
+    respect to the flattened scenario settings.
+
+    The metric tensor is averaged over all combinations of preparation and measurement
+    inputs. It is computed from the Jacobian of the state vector and therefore scales with
+    the Hilbert space dimension of the network, which makes it suited for small networks.
+
+    :param network_ansatz: The network ansatz of the optimized cost function.
+    :type network_ansatz: qnetvo.NetworkAnsatz
+
+    :returns: A function ``metric_fn(settings)`` returning the metric tensor.
+    :rtype: Function
+    """
+    ansatz = qnet.NetworkAnsatz(
+        network_ansatz.prepare_nodes,
+        network_ansatz.measure_nodes,
+        dev_kwargs={"name": "default.qubit"},
+    )
+
+    @qml.qnode(ansatz.dev, interface="autograd", diff_method="backprop")
+    def state(qnode_settings):
+        ansatz.fn(qnode_settings)
+        return qml.state()
+
+    prep_inputs_list = list(
+        itertools.product(*[range(node.num_in) for node in ansatz.prepare_nodes])
+    )
+    meas_inputs_list = list(
+        itertools.product(*[range(node.num_in) for node in ansatz.measure_nodes])
+    )
+
+    def metric_fn(settings):
+        flat_settings, shapes = flatten_settings(settings)
+
+        metric = np.zeros((len(flat_settings), len(flat_settings)))
+        for prep_inputs, meas_inputs in itertools.product(prep_inputs_list, meas_inputs_list):
+
+            def input_state(flat_settings):
+                return state(
+                    ansatz.qnode_settings(
+                        unflatten_settings(flat_settings, shapes), prep_inputs, meas_inputs
+                    )
+                )
+
+            psi = input_state(flat_settings)
+            jac_real = qml.jacobian(lambda x: np.real(input_state(x)))(flat_settings)
+            jac_imag = qml.jacobian(lambda x: np.imag(input_state(x)))(flat_settings)
+            jac = jac_real + 1j * jac_imag
+
+            overlaps = np.conj(psi) @ jac
+            metric = metric + np.real(np.conj(jac).T @ jac - np.outer(np.conj(overlaps), overlaps))
+
+        return metric / (len(prep_inputs_list) * len(meas_inputs_list))
+
+    return metric_fn
+
+
+def lbfgsb(
+    cost,
+    init_settings,
+    num_steps=150,
+    sample_width=1,
+    grad_fn=None,
+    verbose=True,
+    tol=None,
+    **kwargs,
+):
+    """Minimizes the ``cost`` with SciPy's L-BFGS-B quasi-Newton method on the flattened
+    settings.
+
+    Each of the at most ``num_steps`` iterations may evaluate the cost and gradient several
+    times in its line search. Scores are sampled every ``sample_width`` iterations and the
+    returned optimization dictionary has the format of ``qnetvo.gradient_descent`` with the
+    additional keys ``"num_cost_evals"``, ``"num_grad_evals"``, and ``"message"``. The cost
+    evaluations include those of the line search, the sampled scores, and the final score.
+
+    :param tol: The tolerance for termination passed to ``scipy.optimize.minimize``.
+    :type tol: optional, Float, default ``None``
+
+    :param kwargs: Ignored keyword arguments of other optimizers, e.g., the ``step_size``.
+
+    :returns: An optimization dictionary.
+    :rtype: Dictionary
+    """
+    if grad_fn is None:
+        grad_fn = qml.grad(cost, argnum=0)
+
+    flat_settings, shapes = flatten_settings(init_settings)
+
+    scores = []
+    samples = []
+    step_times = []
+    settings_history = [init_settings]
+    evals = {"cost": 0, "grad": 0, "time": time.time()}
+
+    start_datetime = datetime.utcnow()
+
+    def counted_cost(settings):
+        evals["cost"] += 1
+        return cost(settings)
+
+    def fun(x):
+        settings = unflatten_settings(np.array(x, requires_grad=True), shapes)
+        evals["grad"] += 1
+
+        flat_grad, _ = flatten_settings(grad_fn(settings))
+        return float(counted_cost(settings)), np.array(flat_grad, dtype=float, requires_grad=False)
+
+    def callback(x):
+        settings = unflatten_settings(np.array(x, requires_grad=True), shapes)
+        settings_history.append(settings)
+
+        step = len(settings_history) - 1
+        if step % sample_width == 0:
+            score = -(counted_cost(settings))
+            scores.append(score)
+            samples.append(step)
+            step_times.append(time.time() - evals["time"])
+
+            if verbose:
+                print("iteration : ", step, ", score : ", score)
+
+        evals["time"] = time.time()
+
+    scores.append(-(counted_cost(init_settings)))
+    samples.append(0)
+    step_times.append(0)
+
+    result = minimize(
+        fun,
+        np.array(flat_settings, dtype=float, requires_grad=False),
+        jac=True,
+        method="L-BFGS-B",
+        tol=tol,
+        callback=callback,
+        options={"maxiter": num_steps},
+    )
+
+    opt_settings = unflatten_settings(np.array(result.x, requires_grad=True), shapes)
+    opt_score = -(counted_cost(opt_settings))
+
+    scores.append(opt_score)
+    samples.append(len(settings_history) - 1)
+    step_times.append(time.time() - evals["time"])
+
+    return {
+        "datetime": start_datetime.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "opt_score": opt_score,
+        "opt_settings": opt_settings,
+        "scores": scores,
+        "samples": samples,
+        "settings_history": settings_history,
+        "step_times": step_times,
+        "step_size": None,
+        "optimizer": "lbfgsb",
+        "num_cost_evals": evals["cost"],
+        "num_grad_evals": evals["grad"],
+        "message": str(result.message),
+    }
+
+
+OPTIMIZERS = {
+    "gradient_descent": qnet.gradient_descent,
+    "adam": adam,
+    "lbfgsb": lbfgsb,
+    "natural_gradient": natural_gradient_descent,
+}
+
+
+def get_optimizer(name):
+    """Returns the optimizer registered under ``name``.
+
+    Each optimizer is called as ``optimizer(cost, init_settings, **opt_kwargs)`` and returns
+    an optimization dictionary in the format of ``qnetvo.gradient_descent``.
+
+    :param name: The name of the optimizer, e.g., ``"gradient_descent"``, ``"adam"``,
+                 ``"lbfgsb"``, or ``"natural_gradient"``.
+    :type name: String
+
+    :raises ValueError: If no optimizer is registered under ``name``.
+    """
+    if name not in OPTIMIZERS:
+        raise ValueError(
+            "The optimizer " + name + " is not one of " + ", ".join(OPTIMIZERS.keys()) + "."
+        )
+
+    return OPTIMIZERS[name]
+
+
+def register_optimizer(name, optimizer):
+    """Registers an ``optimizer(cost, init_settings, **opt_kwargs)`` function under ``name``.
+
+    :param name: The name of the optimizer.
+    :type name: String
+
+    :param optimizer: The optimizer function.
+    :type optimizer: Function
+    """
+    OPTIMIZERS[name] = optimizer
@@ -0,0 +1,234 @@
+import functools
+import hashlib
+import json
+import os
+import re
+
+from pennylane import numpy as np
+import qnetvo as qnet
+
+
+# the default representation of python objects contains their memory address
+_ADDRESS_REGEX = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+def _const_repr(const):
+    """Represents a constant of a code object independently of the string hash seed."""
+    if isinstance(const, frozenset):
+        return "frozenset(" + repr(sorted([_const_repr(item) for item in const])) + ")"
+
+    return repr(const)
+
+
+def _fn_spec(fn, parents=()):
+    """Describes a quantum function or cost function factory by its name, bytecode,
+    and closure variables such that lambdas defined in a loop or parameterized by
+    a noise strength are distinguished.
+
+    The ``parents`` are the ids of the functions whose closures contain ``fn``, a function
+    that appears in its own closure, e.g., a recursive wrapper, is described by its name only.
+    """
+    if isinstance(fn, functools.partial):
+        return {
+            "partial": _fn_spec(fn.func, parents),
+            "args": _stable_spec(fn.args, parents),
+            "keywords": _stable_spec(fn.keywords, parents),
+        }
+
+    qualname = getattr(fn, "__qualname__", type(fn).__qualname__)
+    spec = {"name": getattr(fn, "__module__", "") + "." + qualname}
+
+    if id(fn) in parents:
+        return spec
+
+    code = getattr(fn, "__code__", None)
+    if code is not None:
+        spec["code"] = hashlib.sha256(code.co_code).hexdigest()
+        spec["consts"] = [
+            _const_repr(const) for const in code.co_consts if not hasattr(const, "co_code")
+        ]
+
+    closure = getattr(fn, "__closure__", None) or []
+    spec["closure"] = [_stable_spec(cell.cell_contents, parents + (id(fn),)) for cell in closure]
+
+    return spec
+
+
+def _node_spec(node, parents=()):
+    """Describes a qnetvo network node by its class, wires, settings, and quantum function."""
+    return {
+        "class": type(node).__name__,
+        "wires": list(node.wires),
+        "num_in": getattr(node, "num_in", None),
+        "num_out": getattr(node, "num_out", None),
+        "num_settings": node.num_settings,
+        "static_settings": _stable_spec(getattr(node, "static_settings", []), parents),
+        "ansatz_fn": _fn_spec(node.ansatz_fn, parents),
+    }
+
+
+def _stable_spec(obj, parents=()):
+    """Converts the arrays, functions, network nodes, and containers in ``obj`` into a JSON
+    serializable description that is the same in every process.
+
+    :raises ValueError: If the representation of an object contains its memory address and,
+                        hence, changes between processes.
+    """
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+
+    if isinstance(obj, dict):
+        return {str(key): _stable_spec(val, parents) for key, val in obj.items()}
+
+    if isinstance(obj, (list, tuple)):
+        return [_stable_spec(item, parents) for item in obj]
+
+    if isinstance(obj, (set, frozenset)):
+        return sorted([_stable_spec(item, parents) for item in obj], key=json.dumps)
+
+    if isinstance(obj, qnet.NoiseNode):
+        return _node_spec(obj, parents)
+
+    if callable(obj):
+        return _fn_spec(obj, parents)
+
+    obj_repr = repr(obj)
+    if _ADDRESS_REGEX.search(obj_repr):
+        raise ValueError(
+            "The "
+            + type(obj).__name__
+            + " object in the optimization has no representation that is stable between "
+            + "processes and cannot be part of a cache key."
+        )
+
+    return obj_repr
+
+
+def _ansatz_kwargs_spec(ansatz_kwargs):
+    """Describes the ``ansatz_kwargs`` without the device wires, which are added to the
+    ``dev_kwargs`` by ``qnet.NetworkAnsatz`` and are determined by the network nodes.
+    """
+    if "dev_kwargs" not in ansatz_kwargs:
+        return ansatz_kwargs
+
+    dev_kwargs = {key: val for key, val in ansatz_kwargs["dev_kwargs"].items() if key != "wires"}
+
+    return {**ansatz_kwargs, "dev_kwargs": dev_kwargs}
+
+
+def opt_cache_key(
+    prep_nodes,
+    meas_nodes,
+    noise_nodes,
+    cost_fn,
+    noise_args,
+    seed=None,
+    cost_kwargs={},
+    opt_kwargs={},
+    ansatz_kwargs={},
+    qnode_kwargs={},
+):
+    """Constructs a content-addressed key identifying a noisy network optimization.
+
+    The key is a hash of the network nodes, the cost function factory, the noise arguments,
+    the random seed used to initialize the settings, and the cost, optimizer, ansatz, and
+    qnode keyword arguments, e.g., the device, its shots, and the differentiation method.
+    Equal keys therefore identify optimizations that reproduce each other.
+
+    Functions are described by their bytecode and closure variables. Objects whose
+    representation contains a memory address cannot be described consistently between
+    processes and raise an error.
+
+    :param prep_nodes: The preparation nodes of the network ansatz.
+    :type prep_nodes: List[qnetvo.PrepareNode]
+
+    :param meas_nodes: The measurement nodes of the network ansatz.
+    :type meas_nodes: List[qnetvo.MeasureNode]
+
+    :param noise_nodes: The noise nodes of the network ansatz.
+    :type noise_nodes: List[qnetvo.NoiseNode]
+
+    :param cost_fn: The cost function factory.
+    :type cost_fn: Function
+
+    :param noise_args: The arguments describing the amount of noise.
+    :type noise_args: Float or List[Float]
+
+    :param seed: The seed of the random initial settings.
+    :type seed: optional, Int, default ``None``
+
+    :param cost_kwargs: Keyword arguments for the ``cost_fn`` factory function.
+    :type cost_kwargs: optional, Dictionary
+
+    :param opt_kwargs: Keyword arguments for the optimizer.
+    :type opt_kwargs: optional, Dictionary
+
+    :param ansatz_kwargs: Keyword arguments for the ``qnet.NetworkAnsatz`` class.
+    :type ansatz_kwargs: optional, Dictionary
+
+    :param qnode_kwargs: Keyword arguments passed to the QNode constructors.
+    :type qnode_kwargs: optional, Dictionary
+
+    :returns: A hexadecimal SHA-256 digest.
+    :rtype: String
+
+    :raises ValueError: If any object in the optimization has no stable representation.
+    """
+    spec = {
+        "prep_nodes": [_node_spec(node) for node in prep_nodes],
+        "meas_nodes": [_node_spec(node) for node in meas_nodes],
+        "noise_nodes": [_node_spec(node) for node in noise_nodes],
+        "cost_fn": _fn_spec(cost_fn),
+        "noise_args": noise_args,
+        "seed": seed,
+        "cost_kwargs": cost_kwargs,
+        "opt_kwargs": opt_kwargs,
+        "ansatz_kwargs": _ansatz_kwargs_spec(ansatz_kwargs),
+        "qnode_kwargs": qnode_kwargs,
+    }
+
+    spec_json = json.dumps(_stable_spec(spec), sort_keys=True)
+
+    return hashlib.sha256(spec_json.encode()).hexdigest()
+
+
+def read_cached_opt_dict(cache_dir, key):
+    """Reads the optimization dictionary stored for ``key`` in the ``cache_dir``.
+
+    :param cache_dir: The directory holding the cached optimizations.
+    :type cache_dir: String
+
+    :param key: The key constructed with ``opt_cache_key``.
+    :type key: String
+
+    :returns: The cached optimization dictionary or ``None`` if there is no entry for ``key``.
+    :rtype: Dictionary
+    """
+    filepath = os.path.join(cache_dir, key + ".json")
+    if not os.path.isfile(filepath):
+        return None
+
+    return qnet.read_optimization_json(filepath)
+
+
+def write_cached_opt_dict(cache_dir, key, opt_dict):
+    """Stores the optimization dictionary for ``key`` in the ``cache_dir``.
+    Failed optimizations, i.e., those with a ``nan`` score, are not stored.
+
+    :param cache_dir: The directory holding the cached optimizations.
+    :type cache_dir: String
+
+    :param key: The key constructed with ``opt_cache_key``.
+    :type key: String
+
+    :param opt_dict: The optimization dictionary to store.
+    :type opt_dict: Dictionary
+    """
+    if np.isnan(opt_dict["opt_score"]):
+        return
+
+    os.makedirs(cache_dir, exist_ok=True)
+    qnet.write_optimization_json(opt_dict, os.path.join(cache_dir, key))
@@ -0,0 +1,192 @@
+import json
+import os
+import re
+
+from pennylane import numpy as np
+import qnetvo as qnet
+
+
+def _json_default(obj):
+    """Serializes the arrays and numpy scalars found in an optimization dictionary."""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+
+    return repr(obj)
+
+
+def _journal_param(noise_param):
+    """The key of a noise parameter in the journal, robust to floating point noise."""
+    return round(float(noise_param), 10)
+
+
+def journal_filepath(data_dir, opt_name):
+    """The path of the journal of the scan saved to ``data_dir`` as ``opt_name``.
+
+    :param data_dir: The directory to which the scan is saved.
+    :type data_dir: String
+
+    :param opt_name: A name identifying the particular optimization.
+    :type opt_name: String
+
+    :rtype: String
+    """
+    return os.path.join(data_dir, opt_name + "journal.jsonl")
+
+
+def append_journal_entry(filepath, noise_param, opt_dict, seed=None):
+    """Appends a completed optimization to the journal of a scan.
+
+    Each entry is a single line of JSON that is flushed to disk before returning,
+    hence, the entries of all completed optimizations survive a crash of the scan.
+
+    :param filepath: The path of the journal, e.g., constructed with ``journal_filepath``.
+    :type filepath: String
+
+    :param noise_param: The noise parameter of the optimization.
+    :type noise_param: Float
+
+    :param opt_dict: The optimization dictionary.
+    :type opt_dict: Dictionary
+
+    :param seed: The seed of the random initial settings.
+    :type seed: optional, Int, default ``None``
+    """
+    opt_dict_json = {
+        **opt_dict,
+        "opt_settings": qnet.settings_to_list(opt_dict["opt_settings"]),
+        "settings_history": [
+            qnet.settings_to_list(settings) for settings in opt_dict["settings_history"]
+        ],
+    }
+    entry = {"noise_param": float(noise_param), "seed": seed, "opt_dict": opt_dict_json}
+
+    with open(filepath, "a") as file:
+        file.write(json.dumps(entry, default=_json_default) + "\n")
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def read_journal(filepath, seed=None):
+    """Reads the completed optimizations from the journal of a scan.
+
+    Entries of failed optimizations, i.e., those with a ``nan`` score, entries of other seeds,
+    and a line truncated by an interrupted write are skipped. If a noise parameter was
+    optimized more than once, the last entry is used.
+
+    :param filepath: The path of the journal.
+    :type filepath: String
+
+    :param seed: The seed of the random initial settings.
+    :type seed: optional, Int, default ``None``
+
+    :returns: A dictionary mapping each completed noise parameter, rounded to 10 decimals,
+              to its optimization dictionary.
+    :rtype: Dictionary
+    """
+    opt_dicts = {}
+    if not os.path.isfile(filepath):
+        return opt_dicts
+
+    with open(filepath) as file:
+        for line in file:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+            opt_dict = entry["opt_dict"]
+            if entry["seed"] != seed or np.isnan(opt_dict["opt_score"]):
+                continue
+
+            opt_dict["opt_settings"] = qnet.settings_to_np(opt_dict["opt_settings"])
+            opt_dict["settings_history"] = [
+                qnet.settings_to_np(settings) for settings in opt_dict["settings_history"]
+            ]
+            opt_dicts[_journal_param(entry["noise_param"])] = opt_dict
+
+    return opt_dicts
+
+
+def journal_opt_dicts(filepath, param_range, seed=None):
+    """Collects the completed optimizations of each noise parameter in ``param_range``
+    from the journal of a scan.
+
+    :param filepath: The path of the journal.
+    :type filepath: String
+
+    :param param_range: The noise parameters of the scan.
+    :type param_range: List[Float]
+
+    :param seed: The seed of the random initial settings.
+    :type seed: optional, Int, default ``None``
+
+    :returns: The optimization dictionary of each noise parameter, ``None`` if incomplete.
+    :rtype: List[Dictionary]
+    """
+    opt_dicts = read_journal(filepath, seed=seed)
+
+    return [opt_dicts.get(_journal_param(noise_param), None) for noise_param in param_range]
+
+
+def retire_journal(filepath, data_filename):
+    """Moves the journal of a saved scan next to its saved data.
+
+    A retired journal is no longer picked up by ``journal_filepath``, hence, the saved scan is
+    never saved again when the campaign is resumed.
+
+    :param filepath: The path of the journal.
+    :type filepath: String
+
+    :param data_filename: The path of the saved data without its file extension, as returned
+                          by ``save_optimizations_one_param_scan``.
+    :type data_filename: String
+
+    :returns: The path of the retired journal.
+    :rtype: String
+    """
+    retired_filepath = data_filename + ".journal.jsonl"
+    os.replace(filepath, retired_filepath)
+
+    return retired_filepath
+
+
+def retired_journal_filepaths(data_dir, opt_name, seed=None):
+    """Finds the retired journals of the scans saved to ``data_dir`` as ``opt_name``.
+
+    :param data_dir: The directory to which the scans are saved.
+    :type data_dir: String
+
+    :param opt_name: A name identifying the particular optimization.
+    :type opt_name: String
+
+    :param seed: Only journals of optimizations with this seed are found.
+    :type seed: optional, Int, default ``None``
+
+    :returns: The paths of the retired journals sorted by the time at which they were saved.
+    :rtype: List[String]
+    """
+    if not os.path.isdir(data_dir):
+        return []
+
+    regex = re.compile(
+        re.escape(opt_name) + r"\d{4}-\d{2}-\d{2}T\d{2}-\d{2}-\d{2}Z\.journal\.jsonl$"
+    )
+
+    filepaths = []
+    for filename in sorted(os.listdir(data_dir)):
+        if not regex.match(filename):
+            continue
+
+        filepath = os.path.join(data_dir, filename)
+        with open(filepath) as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                if entry["seed"] == seed:
+                    filepaths.append(filepath)
+                break
+
+    return filepaths
@@ -0,0 +1,334 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+from src.optimizers import flatten_settings, unflatten_settings
+
+
+_COLUMNS = ["run_ids", "seeds", "noise_params", "max_scores", "opt_settings", "settings_offsets"]
+_FLOAT_COLUMNS = ["noise_params", "max_scores", "opt_settings"]
+
+
+def _atomic_write(filepath, write_fn):
+    """Writes a file with ``write_fn(file)`` to a temporary file that replaces ``filepath``
+    once it is complete, so readers never see a partially written file.
+    """
+    file_dir, filename = os.path.split(filepath)
+    fd, tmp_path = tempfile.mkstemp(dir=file_dir, prefix="." + filename, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            write_fn(file)
+
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _chunk_dir(store_dir):
+    return os.path.join(store_dir, "chunks")
+
+
+def _chunk_names(store_dir):
+    """The names of the run chunks in the store ordered by the time they were appended."""
+    chunk_dir = _chunk_dir(store_dir)
+    if not os.path.isdir(chunk_dir):
+        return []
+
+    return sorted([name for name in os.listdir(chunk_dir) if name.endswith(".npz")])
+
+
+def _current_generation(store_dir):
+    """The directory name of the compacted columns of the store or ``None`` if it has none."""
+    current_path = os.path.join(store_dir, "current")
+    if not os.path.isfile(current_path):
+        return None
+
+    with open(current_path) as file:
+        return file.read().strip()
+
+
+def _read_store_meta(store_dir, generation):
+    """Reads the metadata of the compacted columns or returns the metadata of an empty store."""
+    if generation is None:
+        return {"settings_shapes": [], "run_names": [], "chunks": []}
+
+    with open(os.path.join(store_dir, generation, "meta.json")) as file:
+        return json.load(file)
+
+
+def _settings_shapes(settings):
+    """Returns the shape of each node's settings in the nested list ``settings``."""
+    return [[list(np.shape(node_settings)) for node_settings in layer] for layer in settings]
+
+
+def _read_chunk(store_dir, chunk_name):
+    """Reads the columns and metadata of a single run appended with ``append_scan_store``."""
+    with np.load(os.path.join(_chunk_dir(store_dir), chunk_name)) as chunk:
+        columns = {name: chunk[name] for name in ["noise_params", "max_scores", "opt_settings"]}
+        columns.update(json.loads(str(chunk["meta"])))
+
+    return columns
+
+
+def _concatenate_runs(meta, runs):
+    """Joins the columns of the compacted store ``meta`` with the columns of new ``runs``."""
+    run_names = list(meta["run_names"])
+    settings_shapes = list(meta["settings_shapes"])
+
+    new_columns = {name: [] for name in _COLUMNS}
+    for run in runs:
+        num_points, num_settings = np.shape(run["opt_settings"])
+        new_columns["run_ids"].append(np.full(num_points, len(run_names), dtype=np.int64))
+        new_columns["seeds"].append(np.full(num_points, run["seed"], dtype=np.int64))
+        new_columns["noise_params"].append(run["noise_params"])
+        new_columns["max_scores"].append(run["max_scores"])
+        new_columns["opt_settings"].append(np.ravel(run["opt_settings"]))
+        new_columns["settings_offsets"].append(np.full(num_points, num_settings, dtype=np.int64))
+
+        run_names.append(run["run_name"])
+        settings_shapes.append(run["settings_shapes"])
+
+    return new_columns, run_names, settings_shapes
+
+
+def append_scan_store(store_dir, noise_params, max_scores, opt_settings, seed=-1, run_name=""):
+    """Appends the results of a single optimization run over a one-parameter scan
+    to the columnar store in ``store_dir``.
+
+    Each run is written to its own chunk file that atomically replaces a temporary file,
+    hence, appending takes a time proportional to the size of the run, an interrupted append
+    leaves the store unchanged, and runs may be appended from several processes at once.
+    The chunks are merged into the memory-mapped columns by ``compact_scan_store``.
+
+    The settings of all points in a run must have the same shape, different runs may
+    use different network ansatzes. Failed optimizations with empty settings are stored
+    as ``nan``. If no point of the run has settings, e.g., if all optimizations failed or
+    the scores are analytic bounds, the scores are stored with empty settings.
+
+    :param store_dir: The directory of the scan store. It is created if it does not exist.
+    :type store_dir: String
+
+    :param noise_params: The noise parameter of each point in the scan.
+    :type noise_params: List[Float]
+
+    :param max_scores: The maximum score of each point in the scan.
+    :type max_scores: List[Float]
+
+    :param opt_settings: The optimal scenario settings of each point as nested lists.
+    :type opt_settings: List[List[List[List[Float]]]]
+
+    :param seed: The seed of the run, ``-1`` if unknown.
+    :type seed: optional, Int, default ``-1``
+
+    :param run_name: A name identifying the run, e.g., the name of its JSON file.
+    :type run_name: optional, String, default ``""``
+
+    :raises ValueError: If the points of the run have settings of different shapes.
+    """
+    settings_shapes = None
+    for settings in opt_settings:
+        if sum([np.size(node_settings) for layer in settings for node_settings in layer]) == 0:
+            continue
+
+        if settings_shapes is None:
+            settings_shapes = _settings_shapes(settings)
+        elif _settings_shapes(settings) != settings_shapes:
+            raise ValueError(
+                "The points of run " + run_name + " have settings of different shapes."
+            )
+
+    if settings_shapes is None:
+        settings_shapes = []
+
+    num_settings = sum([int(np.prod(shape)) for layer in settings_shapes for shape in layer])
+    flat_settings = []
+    for settings in opt_settings:
+        flat = np.array(flatten_settings(settings)[0], dtype=np.float64)
+        flat_settings.append(flat if len(flat) == num_settings else np.full(num_settings, np.nan))
+
+    num_points = len(noise_params)
+    meta = {"run_name": run_name, "seed": int(seed), "settings_shapes": settings_shapes}
+
+    chunk_dir = _chunk_dir(store_dir)
+    os.makedirs(chunk_dir, exist_ok=True)
+
+    # chunk names sort in the order in which the runs were appended
+    chunk_name = "{:020d}-{}.npz".format(time.time_ns(), uuid.uuid4().hex)
+    _atomic_write(
+        os.path.join(chunk_dir, chunk_name),
+        lambda file: np.savez(
+            file,
+            noise_params=np.array(noise_params, dtype=np.float64),
+            max_scores=np.array(max_scores, dtype=np.float64),
+            opt_settings=np.reshape(
+                np.array(flat_settings, dtype=np.float64), (num_points, num_settings)
+            ),
+            meta=np.array(json.dumps(meta)),
+        ),
+    )
+
+
+def compact_scan_store(store_dir):
+    """Merges the runs appended to the store in ``store_dir`` into its columns such that
+    ``load_scan_store`` memory-maps all runs in a single read.
+
+    The merged columns are written to a new directory which becomes the current columns
+    of the store by atomically replacing the ``current`` file, so readers see either the
+    previous or the merged columns. Afterwards, the merged chunks and previous columns are
+    removed. Runs may be appended while the store is compacted, however, the store must be
+    compacted by one process at a time.
+
+    :param store_dir: The directory of the scan store.
+    :type store_dir: String
+    """
+    generation = _current_generation(store_dir)
+    meta = _read_store_meta(store_dir, generation)
+
+    # chunks that are already merged remain if a previous compaction was interrupted
+    chunk_names = [name for name in _chunk_names(store_dir) if name not in meta["chunks"]]
+    if len(chunk_names) == 0:
+        return
+
+    new_columns, run_names, settings_shapes = _concatenate_runs(
+        meta, [_read_chunk(store_dir, name) for name in chunk_names]
+    )
+
+    new_generation = "columns-" + uuid.uuid4().hex
+    os.makedirs(os.path.join(store_dir, new_generation))
+    for name in _COLUMNS:
+        columns = [np.zeros(0, dtype=np.float64 if name in _FLOAT_COLUMNS else np.int64)]
+        if generation is not None:
+            columns.append(np.load(os.path.join(store_dir, generation, name + ".npy")))
+        elif name == "settings_offsets":
+            columns.append(np.zeros(1, dtype=np.int64))
+
+        if name == "settings_offsets":
+            # the offsets of the new rows start at the end of the stored settings
+            sizes = np.concatenate([np.zeros(0, dtype=np.int64)] + new_columns[name])
+            columns.append(columns[-1][-1] + np.cumsum(sizes))
+        else:
+            columns += new_columns[name]
+
+        np.save(os.path.join(store_dir, new_generation, name + ".npy"), np.concatenate(columns))
+
+    with open(os.path.join(store_dir, new_generation, "meta.json"), "w") as file:
+        file.write(
+            json.dumps(
+                {
+                    "settings_shapes": settings_shapes,
+                    "run_names": run_names,
+                    "chunks": meta["chunks"] + chunk_names,
+                }
+            )
+        )
+
+    _atomic_write(
+        os.path.join(store_dir, "current"), lambda file: file.write(new_generation.encode())
+    )
+
+    for name in meta["chunks"] + chunk_names:
+        chunk_path = os.path.join(_chunk_dir(store_dir), name)
+        if os.path.isfile(chunk_path):
+            os.remove(chunk_path)
+
+    if generation is not None:
+        shutil.rmtree(os.path.join(store_dir, generation))
+
+
+def load_scan_store(store_dir, mmap_mode="r"):
+    """Loads all runs held in the columnar store in ``store_dir``.
+
+    The returned dictionary contains an array for each of the columns ``"run_ids"``,
+    ``"seeds"``, ``"noise_params"``, and ``"max_scores"`` holding one row per point,
+    the flattened settings of all points in ``"opt_settings"`` where the settings of
+    row ``i`` are ``opt_settings[settings_offsets[i] : settings_offsets[i + 1]]``,
+    as well as the ``"run_names"`` and the ``"settings_shapes"`` of each run.
+    Use ``scan_store_settings`` to restore the settings of a row.
+
+    The columns are memory-mapped if the store is compacted, runs appended since the last
+    ``compact_scan_store`` are read from their chunks and joined in memory.
+
+    :param store_dir: The directory of the scan store.
+    :type store_dir: String
+
+    :param mmap_mode: The memory-map mode passed to ``numpy.load``.
+    :type mmap_mode: optional, String, default ``"r"``
+
+    :returns: The columns and metadata of the store.
+    :rtype: Dictionary
+    """
+    generation = _current_generation(store_dir)
+    meta = _read_store_meta(store_dir, generation)
+    chunk_names = [name for name in _chunk_names(store_dir) if name not in meta["chunks"]]
+
+    if generation is not None:
+        store = {
+            name: np.load(os.path.join(store_dir, generation, name + ".npy"), mmap_mode=mmap_mode)
+            for name in _COLUMNS
+        }
+    else:
+        store = {name: np.zeros(0, dtype=np.float64) for name in _COLUMNS}
+        store["run_ids"] = store["seeds"] = np.zeros(0, dtype=np.int64)
+        store["settings_offsets"] = np.zeros(1, dtype=np.int64)
+
+    new_columns, run_names, settings_shapes = _concatenate_runs(
+        meta, [_read_chunk(store_dir, name) for name in chunk_names]
+    )
+    if len(chunk_names) > 0:
+        for name in _COLUMNS:
+            if name == "settings_offsets":
+                sizes = np.concatenate(new_columns[name])
+                new_columns[name] = [store[name][-1] + np.cumsum(sizes)]
+
+            store[name] = np.concatenate([store[name]] + new_columns[name])
+
+    store["run_names"] = run_names
+    store["settings_shapes"] = settings_shapes
+
+    return store
+
+
+def scan_store_settings(store, row_id):
+    """Returns the optimal scenario settings of a row in the ``store`` as nested lists,
+    i.e., in the layout of the ``"opt_settings"`` of the JSON data files.
+    """
+    offsets = store["settings_offsets"]
+    settings = unflatten_settings(
+        store["opt_settings"][offsets[row_id] : offsets[row_id + 1]],
+        store["settings_shapes"][store["run_ids"][row_id]],
+    )
+
+    return [[node_settings.tolist() for node_settings in layer] for layer in settings]
+
+
+def json_to_scan_store(data_files, store_dir):
+    """Converts JSON data files written by ``save_optimizations_one_param_scan`` into
+    a columnar store. Each file is appended as a separate run named by its filename
+    and the store is compacted once all files are appended.
+
+    :param data_files: The paths of the JSON data files to convert.
+    :type data_files: List[String]
+
+    :param store_dir: The directory of the scan store.
+    :type store_dir: String
+    """
+    for filepath in sorted(data_files):
+        with open(filepath) as file:
+            data_dict = json.load(file)
+
+        append_scan_store(
+            store_dir,
+            data_dict["noise_params"],
+            data_dict["max_scores"],
+            data_dict["opt_settings"],
+            seed=data_dict.get("seed", -1),
+            run_name=os.path.basename(filepath),
+        )
+
+    compact_scan_store(store_dir)
@@ -0,0 +1,246 @@
+import itertools
+
+import pennylane as qml
+from pennylane import numpy as np
+import qnetvo as qnet
+
+from src.network_ansatzes import local_rot, local_rzry
+from src.maximal_qubit_violations import correlation_matrix
+
+
+def _rot_bloch_vector(phi, theta):
+    """The Bloch vector of the observable :math:`U^{\\dagger}ZU` measured after the
+    rotation :math:`U = R_Z(\\omega)R_Y(\\theta)R_Z(\\phi)` of a qubit.
+    """
+    return np.stack([-np.sin(theta) * np.cos(phi), np.sin(theta) * np.sin(phi), np.cos(theta)])
+
+
+# the two-qubit Pauli products with shape (16, 4, 4) starting with the identity
+_PAULIS = [np.eye(2), [[0, 1], [1, 0]], [[0, -1j], [1j, 0]], [[1, 0], [0, -1]]]
+_PAULI_BASIS = np.array([np.kron(pauli_i, pauli_j) for pauli_i in _PAULIS for pauli_j in _PAULIS])
+
+# the Bloch vector of the k-th wire of a local measurement node given its settings
+_BLOCH_VECTOR_FNS = {
+    local_rot: lambda settings, k: _rot_bloch_vector(settings[3 * k], settings[3 * k + 1]),
+    local_rzry: lambda settings, k: _rot_bloch_vector(settings[2 * k], settings[2 * k + 1]),
+    qnet.local_RY: lambda settings, k: _rot_bloch_vector(0, settings[k]),
+}
+
+
+def _shares_wires(node_a, node_b):
+    """Returns ``True`` if the two network nodes act on a common wire."""
+    return len(set(node_a.wires) & set(node_b.wires)) > 0
+
+
+def _source_state_fn(prep_node):
+    """Constructs a QNode returning the pure two-qubit state vector prepared by ``prep_node``."""
+
+    @qml.qnode(qml.device("default.qubit", wires=2), diff_method="backprop")
+    def source_state(settings):
+        prep_node.ansatz_fn(settings, qml.wires.Wires([0, 1]))
+        return qml.state()
+
+    return source_state
+
+
+def _source_noise_fn(prep_node, noise_nodes):
+    """Constructs the noise channel ``noise(rho)`` applied to the two-qubit state emitted by
+    the ``prep_node`` by all noise nodes acting on its wires. Ancilla wires are traced out.
+
+    The noise parameters are constant, hence the channel is evaluated once on the two-qubit
+    Pauli basis and applied to any state by linearity.
+    """
+    source_noise_nodes = [node for node in noise_nodes if _shares_wires(node, prep_node)]
+    if len(source_noise_nodes) == 0:
+        return lambda rho: rho
+
+    dev_wires = qml.wires.Wires.all_wires(
+        [qml.wires.Wires(node.wires) for node in [prep_node] + source_noise_nodes]
+    )
+
+    # the source wires are relabeled to 0 and 1 followed by the ancilla wires
+    wire_map = {wire: i for i, wire in enumerate(dev_wires)}
+
+    @qml.qnode(qml.device("default.mixed", wires=len(dev_wires)))
+    def noisy_state(rho):
+        qml.QubitDensityMatrix(rho, wires=[0, 1])
+        for node in source_noise_nodes:
+            node.ansatz_fn(np.array([]), qml.wires.Wires([wire_map[wire] for wire in node.wires]))
+
+        return qml.density_matrix(wires=[0, 1])
+
+    # the channel output of each Pauli, where (I + P)/4 is a valid density matrix
+    noisy_identity = 4 * noisy_state(np.eye(4) / 4)
+    noisy_paulis = np.array(
+        [noisy_identity]
+        + [4 * noisy_state((np.eye(4) + pauli) / 4) - noisy_identity for pauli in _PAULI_BASIS[1:]]
+    )
+
+    def noise(rho):
+        pauli_coeffs = np.einsum("ab,kba->k", rho, _PAULI_BASIS) / 4
+        return np.einsum("k,kab->ab", pauli_coeffs, noisy_paulis)
+
+    return noise
+
+
+def surrogate_correlator_fn(network_ansatz):
+    """Constructs a differentiable function evaluating the global parity correlators of the
+    ``network_ansatz`` without simulating the full network.
+
+    Each source emits a two-qubit state and each qubit is measured by a local rotation,
+    hence the correlator factorizes into the product over sources of
+    :math:`\\vec{a}^T T \\vec{b}` where :math:`T` is the correlation matrix of the noisy
+    source state and :math:`\\vec{a}` and :math:`\\vec{b}` are the Bloch vectors of the
+    observables measured on its qubits. Only the two-qubit source states are simulated.
+
+    The measurement nodes must apply ``local_rot``, ``local_rzry``, or ``qnet.local_RY``,
+    each source must prepare two qubits using its first input, and each noise node
+    may act on the wires of at most one source.
+
+    :param network_ansatz: The network ansatz.
+    :type network_ansatz: qnet.NetworkAnsatz
+
+    :returns: A function ``correlators(scenario_settings)`` returning a function
+              ``correlator(meas_inputs)`` of the measurement inputs.
+    :rtype: Function
+
+    :raises ValueError: If the network ansatz does not have the required structure.
+    """
+    for node in network_ansatz.measure_nodes:
+        if node.ansatz_fn not in _BLOCH_VECTOR_FNS:
+            raise ValueError(
+                "The surrogate cost requires local rotation measurements, "
+                + "found "
+                + getattr(node.ansatz_fn, "__name__", repr(node.ansatz_fn))
+                + "."
+            )
+
+    for node in network_ansatz.noise_nodes:
+        if sum([_shares_wires(node, prep_node) for prep_node in network_ansatz.prepare_nodes]) > 1:
+            raise ValueError("The surrogate cost requires noise nodes local to a single source.")
+
+    # the measurement node and position of each measured wire
+    wire_ids = {}
+    for node_id, node in enumerate(network_ansatz.measure_nodes):
+        for k, wire in enumerate(node.wires):
+            wire_ids[wire] = (node_id, k)
+
+    source_wire_ids = []
+    for prep_node in network_ansatz.prepare_nodes:
+        if len(prep_node.wires) != 2:
+            raise ValueError("The surrogate cost requires two-qubit sources.")
+
+        source_wire_ids.append([wire_ids[wire] for wire in prep_node.wires])
+
+    source_state_fns = [_source_state_fn(prep_node) for prep_node in network_ansatz.prepare_nodes]
+    source_noise_fns = [
+        _source_noise_fn(prep_node, network_ansatz.noise_nodes)
+        for prep_node in network_ansatz.prepare_nodes
+    ]
+
+    def correlators(scenario_settings):
+        corr_mats = []
+        for i, (source_state, source_noise) in enumerate(zip(source_state_fns, source_noise_fns)):
+            psi = source_state(scenario_settings[0][i][0])
+            corr_mats.append(correlation_matrix(source_noise(np.outer(psi, np.conj(psi)))))
+
+        bloch_vectors = [
+            [
+                [
+                    _BLOCH_VECTOR_FNS[node.ansatz_fn](node_settings, k)
+                    for k in range(len(node.wires))
+                ]
+                for node_settings in scenario_settings[1][node_id]
+            ]
+            for node_id, node in enumerate(network_ansatz.measure_nodes)
+        ]
+
+        def correlator(meas_inputs):
+            corr = 1
+            for corr_mat, ((node_a, k_a), (node_b, k_b)) in zip(corr_mats, source_wire_ids):
+                a = bloch_vectors[node_a][meas_inputs[node_a]][k_a]
+                b = bloch_vectors[node_b][meas_inputs[node_b]][k_b]
+
+                corr = corr * (a @ corr_mat @ b)
+
+            return corr
+
+        return correlator
+
+    return correlators
+
+
+def chsh_surrogate_cost_fn(network_ansatz):
+    """Constructs a surrogate of ``qnet.chsh_inequality_cost`` from the
+    correlators of ``surrogate_correlator_fn``.
+
+    :param network_ansatz: The network ansatz.
+    :type network_ansatz: qnet.NetworkAnsatz
+
+    :returns: A cost function ``cost(scenario_settings)``.
+    :rtype: Function
+    """
+    correlators = surrogate_correlator_fn(network_ansatz)
+
+    def cost(scenario_settings):
+        correlator = correlators(scenario_settings)
+
+        return -sum(
+            [(-1) ** (x * y) * correlator([x, y]) for x, y in itertools.product([0, 1], repeat=2)]
+        )
+
+    return cost
+
+
+def nlocal_chain_surrogate_cost_fn(network_ansatz):
+    """Constructs a surrogate of ``qnet.nlocal_chain_cost_22`` from the
+    correlators of ``surrogate_correlator_fn``.
+
+    :param network_ansatz: The :math:`n`-local chain network ansatz.
+    :type network_ansatz: qnet.NetworkAnsatz
+
+    :returns: A cost function ``cost(scenario_settings)``.
+    :rtype: Function
+    """
+    correlators = surrogate_correlator_fn(network_ansatz)
+    num_interior_nodes = len(network_ansatz.measure_nodes) - 2
+
+    def cost(scenario_settings):
+        correlator = correlators(scenario_settings)
+
+        I22 = 0
+        J22 = 0
+        for x, y in itertools.product([0, 1], repeat=2):
+            I22 = I22 + correlator([x] + [0] * num_interior_nodes + [y])
+            J22 = J22 + (-1) ** (x + y) * correlator([x] + [1] * num_interior_nodes + [y])
+
+        return -(np.sqrt(np.abs(I22) / 4) + np.sqrt(np.abs(J22) / 4))
+
+    return cost
+
+
+def nlocal_star_surrogate_cost_fn(network_ansatz):
+    """Constructs a surrogate of ``qnet.nlocal_star_22_cost_fn`` from the
+    correlators of ``surrogate_correlator_fn``.
+
+    :param network_ansatz: The :math:`n`-local star network ansatz.
+    :type network_ansatz: qnet.NetworkAnsatz
+
+    :returns: A cost function ``cost(scenario_settings)``.
+    :rtype: Function
+    """
+    correlators = surrogate_correlator_fn(network_ansatz)
+    n = len(network_ansatz.prepare_nodes)
+
+    def cost(scenario_settings):
+        correlator = correlators(scenario_settings)
+
+        I22 = 0
+        J22 = 0
+        for x in itertools.product([0, 1], repeat=n):
+            I22 = I22 + correlator(list(x) + [0])
+            J22 = J22 + (-1) ** sum(x) * correlator(list(x) + [1])
+
+        return -(np.power(np.abs(I22 / 2 ** n), 1 / n) + np.power(np.abs(J22 / 2 ** n), 1 / n))
+
+    return cost
@@ -0,0 +1,246 @@
+import os
+import time
+
+from dask.distributed import Client, as_completed
+
+from src.utilities import save_optimizations_one_param_scan
+from src.scan_journal import (
+    journal_filepath,
+    append_journal_entry,
+    journal_opt_dicts,
+    retire_journal,
+    retired_journal_filepaths,
+)
+
+
+def sweep_client(n_workers=5, threads_per_worker=1, memory_limit="4GB", **client_kwargs):
+    """Starts a long-lived local Dask cluster for running a campaign of optimization sweeps.
+
+    Worker memory is bounded by the ``memory_limit``. A worker that exceeds its limit is
+    restarted by its nanny so a campaign does not need to call ``client.restart()`` between
+    sweeps, and PennyLane and qNetVO are imported once per worker rather than once per sweep.
+
+    :param n_workers: The number of worker processes.
+    :type n_workers: optional, Int, default ``5``
+
+    :param threads_per_worker: The number of threads in each worker process.
+    :type threads_per_worker: optional, Int, default ``1``
+
+    :param memory_limit: The memory limit of each worker, e.g., ``"4GB"``.
+    :type memory_limit: optional, String, default ``"4GB"``
+
+    :param client_kwargs: Additional keyword arguments for the ``dask.distributed.Client``.
+
+    :returns: A Dask client connected to the local cluster.
+    :rtype: dask.distributed.Client
+    """
+    return Client(
+        processes=True,
+        n_workers=n_workers,
+        threads_per_worker=threads_per_worker,
+        memory_limit=memory_limit,
+        **client_kwargs
+    )
+
+
+def _nan_opt_dict():
+    """The empty optimization dictionary of a point without a completed optimization."""
+    return {
+        "opt_score": float("nan"),
+        "opt_settings": [[], []],
+        "scores": [float("nan")],
+        "samples": [0],
+        "settings_history": [[[], []]],
+    }
+
+
+def _failed_opt_dict(err):
+    """The empty optimization dictionary of a task that failed on its worker."""
+    print("An error occurred on a Dask worker.")
+    print(err)
+
+    return _nan_opt_dict()
+
+
+def _save_sweep(sweep, opt_dicts, time_start, verbose):
+    """Saves a completed sweep with ``save_optimizations_one_param_scan`` and returns
+    the path of the saved data without its file extension."""
+    data_filename = save_optimizations_one_param_scan(
+        sweep["data_dir"],
+        sweep["opt_name"],
+        sweep["param_range"],
+        opt_dicts,
+        quantum_bound=sweep.get("quantum_bound", None),
+        classical_bound=sweep.get("classical_bound", None),
+        scan_store_dir=sweep.get("scan_store_dir", None),
+        seed=sweep.get("seed", None),
+    )
+
+    if verbose:
+        print("\ncompleted sweep : ", sweep["opt_name"])
+        print("elapsed time : ", time.time() - time_start, "\n")
+
+    return data_filename
+
+
+def run_sweeps(client, sweeps, resume=True, verbose=True):
+    """Runs a campaign of one-parameter optimization sweeps on a single Dask cluster.
+
+    All ``(sweep, noise parameter)`` tasks are submitted to the cluster at once such that
+    workers never idle between sweeps. Each completed task is appended to the journal of its
+    sweep, see ``journal_filepath``, as soon as it finishes. Once all points of a sweep are
+    complete, the sweep is saved with ``save_optimizations_one_param_scan`` from its journal
+    and the journal is retired next to the saved data, see ``retire_journal``.
+
+    If ``resume`` is ``True``, the noise parameters already completed in the journal of a
+    sweep are not optimized again, hence, an interrupted campaign is continued by running
+    it again. Sweeps that were already saved, i.e., that have a retired journal with the same
+    seed, are skipped and not saved again. Otherwise, existing journals are discarded and
+    all sweeps are optimized again.
+
+    Each sweep is a dictionary with the keys:
+
+    * ``"optimize"``: The ``optimize(noise_args)`` function, e.g., constructed
+      with ``noisy_net_opt_fn``. Each noise parameter is a separate task.
+    * ``"optimize_scan"``: (alternative to ``"optimize"``) An ``optimize_scan(param_range)``
+      function returning an optimization dictionary for each noise parameter, e.g.,
+      constructed with ``noisy_net_continuation_opt_fn``. The remaining noise parameters
+      of the sweep are optimized together in a single task.
+    * ``"param_range"``: The noise parameters to scan over.
+    * ``"data_dir"``: The directory to which the data is saved.
+    * ``"opt_name"``: A name identifying the particular optimization.
+    * ``"seed"``: (optional) The seed of the optimization, recorded in the journal
+      and the saved data.
+    * ``"scan_store_dir"``: (optional) A scan store to which the sweep is appended.
+    * ``"quantum_bound"``: (optional) The theoretical quantum bound for the scenario.
+    * ``"classical_bound"``: (optional) The theoretical classical bound for the scenario.
+
+    :param client: The Dask client, e.g., constructed with ``sweep_client``.
+    :type client: dask.distributed.Client
+
+    :param sweeps: The optimization sweeps of the campaign.
+    :type sweeps: List[Dictionary]
+
+    :param resume: If ``True`` skips the noise parameters completed in the sweep journals.
+    :type resume: optional, Bool, default ``True``
+
+    :param verbose: If ``True`` prints out progress.
+    :type verbose: optional, Bool, default ``True``
+
+    :returns: The optimization dictionaries of each sweep.
+    :rtype: List[List[Dictionary]]
+    """
+    time_start = time.time()
+
+    journal_filepaths = []
+    sweeps_opt_dicts = []
+    saved = []
+    for sweep in sweeps:
+        os.makedirs(sweep["data_dir"], exist_ok=True)
+        filepath = journal_filepath(sweep["data_dir"], sweep["opt_name"])
+        if not resume and os.path.isfile(filepath):
+            os.remove(filepath)
+
+        retired_filepaths = (
+            retired_journal_filepaths(
+                sweep["data_dir"], sweep["opt_name"], seed=sweep.get("seed", None)
+            )
+            if resume
+            else []
+        )
+        if len(retired_filepaths) > 0:
+            # the sweep was already saved, its last saved run is returned without saving it again
+            filepath = retired_filepaths[-1]
+
+        saved.append(len(retired_filepaths) > 0)
+        journal_filepaths.append(filepath)
+        sweeps_opt_dicts.append(
+            journal_opt_dicts(filepath, sweep["param_range"], seed=sweep.get("seed", None))
+        )
+
+    future_ids = {}
+    num_remaining = []
+    for sweep_id, sweep in enumerate(sweeps):
+        if saved[sweep_id]:
+            sweeps_opt_dicts[sweep_id] = [
+                opt_dict if opt_dict is not None else _nan_opt_dict()
+                for opt_dict in sweeps_opt_dicts[sweep_id]
+            ]
+            num_remaining.append(0)
+
+            if verbose:
+                print("skipped saved sweep : ", sweep["opt_name"])
+
+            continue
+
+        point_ids = [
+            point_id
+            for point_id, opt_dict in enumerate(sweeps_opt_dicts[sweep_id])
+            if opt_dict is None
+        ]
+        num_remaining.append(len(point_ids))
+
+        if verbose and len(point_ids) < len(sweep["param_range"]):
+            print(
+                "resumed sweep : ",
+                sweep["opt_name"],
+                ", remaining points : ",
+                len(point_ids),
+                "/",
+                len(sweep["param_range"]),
+            )
+
+        params = [sweep["param_range"][point_id] for point_id in point_ids]
+        if "optimize_scan" in sweep:
+            if len(point_ids) > 0:
+                future = client.submit(sweep["optimize_scan"], params, pure=False)
+                future_ids[future] = (sweep_id, point_ids)
+        else:
+            futures = client.map(sweep["optimize"], params, pure=False)
+            for point_id, future in zip(point_ids, futures):
+                future_ids[future] = (sweep_id, [point_id])
+
+    def complete_sweep(sweep_id):
+        sweep = sweeps[sweep_id]
+        opt_dicts = journal_opt_dicts(
+            journal_filepaths[sweep_id], sweep["param_range"], seed=sweep.get("seed", None)
+        )
+
+        # failed points are not completed in the journal and are optimized again on resume
+        sweeps_opt_dicts[sweep_id] = [
+            journal_opt_dict if journal_opt_dict is not None else opt_dict
+            for journal_opt_dict, opt_dict in zip(opt_dicts, sweeps_opt_dicts[sweep_id])
+        ]
+
+        data_filename = _save_sweep(sweep, sweeps_opt_dicts[sweep_id], time_start, verbose)
+        retire_journal(journal_filepaths[sweep_id], data_filename)
+
+    for sweep_id in range(len(sweeps)):
+        if num_remaining[sweep_id] == 0 and not saved[sweep_id]:
+            complete_sweep(sweep_id)
+
+    for future in as_completed(list(future_ids)):
+        sweep_id, point_ids = future_ids.pop(future)
+        sweep = sweeps[sweep_id]
+
+        try:
+            result = future.result()
+            opt_dicts = result if "optimize_scan" in sweep else [result]
+        except Exception as err:
+            opt_dicts = [_failed_opt_dict(err)] * len(point_ids)
+
+        for point_id, opt_dict in zip(point_ids, opt_dicts):
+            sweeps_opt_dicts[sweep_id][point_id] = opt_dict
+            append_journal_entry(
+                journal_filepaths[sweep_id],
+                sweep["param_range"][point_id],
+                opt_dict,
+                seed=sweep.get("seed", None),
+            )
+
+        num_remaining[sweep_id] -= len(point_ids)
+
+        if num_remaining[sweep_id] == 0:
+            complete_sweep(sweep_id)
+
+    return sweeps_opt_dicts
@@ -1,13 +1,30 @@
 import qnetvo as qnet
+import pennylane as qml
 from datetime import datetime
+import time
 from pennylane import numpy as np
 import matplotlib.pyplot as plt
 
-from os import listdir
+from os import listdir, makedirs
 from os.path import isfile, join
+import uuid
 import re
 import json
 
+from src.result_cache import opt_cache_key, read_cached_opt_dict, write_cached_opt_dict
+from src.scan_store import append_scan_store
+from src.optimizers import get_optimizer, network_metric_tensor_fn, flatten_settings
+from src.circuit_cache import cached_noisy_cost_fn
+from src.vectorized_network import (
+    stack_scenario_settings,
+    unstack_scenario_settings,
+    get_vectorized_cost_fn,
+)
+
+
+# optimizers whose steps depend on a state accumulated over previous steps
+_STATEFUL_OPTIMIZERS = ["adam", "lbfgsb"]
+
 
 def hardware_opt(
     cost,
@@ -18,6 +35,8 @@ def hardware_opt(
     grad_fn=None,
     tmp_filepath="./",
     init_opt_dict={},
+    optimizer="gradient_descent",
+    opt_kwargs={},
 ):
     """Performs a gradient descent optimization on quantum hardware.
     Each epoch of the gradient descent is saved as a tmp file in case
@@ -47,15 +66,40 @@ def hardware_opt(
 
     :param init_opt_dict: The optimization dictionary used as a warm start.
     :type init_opt_dict: optional, Dictionary, default ``{}``
+
+    :param optimizer: The name of the optimizer applied in each epoch, see ``get_optimizer``.
+                      Each epoch is a separate single-step optimization, hence, optimizers
+                      that keep a state between steps, i.e., ``"adam"`` and ``"lbfgsb"``,
+                      are not supported.
+    :type optimizer: optional, String, default ``"gradient_descent"``
+
+    :param opt_kwargs: Additional keyword arguments for the optimizer.
+    :type opt_kwargs: optional, Dictionary, default ``{}``
+
+    :raises ValueError: If the ``optimizer`` keeps a state between steps.
     """
+    if optimizer in _STATEFUL_OPTIMIZERS:
+        raise ValueError(
+            "The optimizer "
+            + optimizer
+            + " keeps a state between steps and cannot be restarted in each epoch of "
+            + "hardware_opt."
+        )
+
     warm_start = False if init_opt_dict == {} else True
     opt_dict = init_opt_dict
 
     settings = opt_dict["settings_history"][-1] if warm_start else init_settings
 
     for i in range(current_step, num_steps):
-        tmp_opt_dict = qnet.gradient_descent(
-            cost, settings, step_size=step_size, num_steps=1, sample_width=1, grad_fn=grad_fn,
+        tmp_opt_dict = get_optimizer(optimizer)(
+            cost,
+            settings,
+            step_size=step_size,
+            num_steps=1,
+            sample_width=1,
+            grad_fn=grad_fn,
+            **opt_kwargs,
         )
 
         # aggregate data into optimization dictionary
@@ -80,7 +124,14 @@ def hardware_opt(
 
 
 def detector_error_opt_fn(
-    network_ansatz, cost_fn, cost_kwargs={}, qnode_kwargs={}, opt_kwargs={}, verbose=True,
+    network_ansatz,
+    cost_fn,
+    cost_kwargs={},
+    qnode_kwargs={},
+    opt_kwargs={},
+    verbose=True,
+    cache_dir=None,
+    seed=None,
 ):
     """Constructs an ansatz-specific ``optimze`` function for cost function
     catered for detector noise.
@@ -97,17 +148,31 @@ def detector_error_opt_fn(
     :param qnode_kwargs: Keyword arguments to pass to qnode constructors.
     :type qnode_kwargs: Dictionary
 
-    :param opt_kwargs: Keyword arguments to pass to ``qnetvo.gradient_descent``.
+    :param opt_kwargs: Keyword arguments to pass to the optimizer. The ``"optimizer"`` key
+                       selects the optimizer by name, see ``get_optimizer``, and defaults
+                       to ``qnetvo.gradient_descent``.
     :type opt_kwargs: Dictionary
 
     :param verbose: If ``True`` prints out progress.
     :type verbose: Bool
 
+    :param cache_dir: A directory in which optimizations are cached. If provided, an
+                      optimization found in the cache is returned without running it.
+                      The cache is bypassed if no ``seed`` is provided because unseeded
+                      optimizations start from fresh random settings on every call.
+                      See ``opt_cache_key`` for how cached optimizations are identified.
+    :type cache_dir: optional, String, default ``None``
+
+    :param seed: The seed of the random initial settings.
+    :type seed: optional, Int, default ``None``
+
     :returns: An ``optimize(*noise_args)`` function that constructs a detector
               error cost function for the ``network_ansatz`` and ``noise_args``.
     :rtype: Function
     """
 
+    use_cache = cache_dir is not None and seed is not None
+
     def optimize(*noise_args):
         """Constructs a cost function for the ``network_ansatz``
         and ``noise_args`` descibing detector errors
@@ -115,10 +180,38 @@ def detector_error_opt_fn(
 
         cost_kwargs["error_rates"] = noise_args
 
+        if use_cache:
+            cache_key = opt_cache_key(
+                network_ansatz.prepare_nodes,
+                network_ansatz.measure_nodes,
+                network_ansatz.noise_nodes,
+                cost_fn,
+                noise_args,
+                seed=seed,
+                cost_kwargs=cost_kwargs,
+                opt_kwargs=opt_kwargs,
+                ansatz_kwargs={"dev_kwargs": network_ansatz.dev_kwargs},
+                qnode_kwargs=qnode_kwargs,
+            )
+            opt_dict = read_cached_opt_dict(cache_dir, cache_key)
+            if opt_dict is not None:
+                if verbose:
+                    print("cached noise args : ", noise_args)
+
+                return opt_dict
+
+        if seed is not None:
+            np.random.seed(seed)
+
         cost = cost_fn(network_ansatz, **cost_kwargs, **qnode_kwargs)
         init_settings = network_ansatz.rand_scenario_settings()
 
-        opt_dict = _gradient_descent_wrapper(cost, init_settings, **opt_kwargs)
+        opt_dict = _gradient_descent_wrapper(
+            cost, init_settings, **_network_opt_kwargs(opt_kwargs, network_ansatz)
+        )
+
+        if use_cache:
+            write_cached_opt_dict(cache_dir, cache_key, opt_dict)
 
         if verbose:
             print("noise args : ", noise_args)
@@ -139,6 +232,11 @@ def noisy_net_opt_fn(
     qnode_kwargs={},
     opt_kwargs={},
     verbose=True,
+    cache_dir=None,
+    seed=None,
+    num_starts=1,
+    surrogate_cost_fn=None,
+    surrogate_opt_kwargs={},
 ):
     """Constructs an ``optimize`` function parameterized by the ``noise_args``, a list
     of arguments describing the amount of noise.
@@ -162,32 +260,156 @@ def noisy_net_opt_fn(
     :param cost_kwargs: Keyword arguments for the ``cost_fn`` factory function.
     :type cost_kwargs: optional, dictionary
 
-    :param qnode_kwargs: Keyword arguments passed to the QNode constructors.
+    :param qnode_kwargs: Keyword arguments passed to the QNode constructors. The
+                         ``"diff_method"`` ``"adjoint"`` or ``"density_backprop"`` selects
+                         a reverse-mode gradient, see ``diff_method_network_ansatz``.
     :type qnode_kwargs: optional, dictionary
 
-    :param opt_kwargs: Keyword arguments for the ``qnet.gradient_descent`` function.
+    :param opt_kwargs: Keyword arguments for the optimizer. The ``"optimizer"`` key selects
+                       the optimizer by name, see ``get_optimizer``, and defaults to
+                       ``qnet.gradient_descent``. The ``"keep_history"`` and ``"history_dir"``
+                       keys bound the returned settings history, see
+                       ``retain_settings_history``.
     :type opt_kwargs: optional, dictionary
 
     :param verbose: If ``True`` prints out progress.
     :type verbose: Bool
 
+    :param cache_dir: A directory in which optimizations are cached. If provided, an
+                      optimization found in the cache is returned without running it.
+                      The cache is bypassed if no ``seed`` is provided because unseeded
+                      optimizations start from fresh random settings on every call.
+                      See ``opt_cache_key`` for how cached optimizations are identified.
+    :type cache_dir: optional, String, default ``None``
+
+    :param seed: The seed of the random initial settings.
+    :type seed: optional, Int, default ``None``
+
+    :param num_starts: The number of random initial settings that are optimized independently.
+                       If the ``cost_fn`` has a vectorized counterpart, see
+                       ``get_vectorized_cost_fn``, and the ``opt_kwargs`` only hold keywords
+                       of plain gradient descent, all starts are optimized simultaneously
+                       with ``batch_gradient_descent``, otherwise the starts are optimized
+                       one after another. The optimization with the largest score is returned
+                       with the additional keys ``"start_opt_scores"`` and
+                       ``"start_opt_settings"`` holding the optimum of each start.
+    :type num_starts: optional, Int, default ``1``
+
+    :param surrogate_cost_fn: A factory of a cheap surrogate of the cost function, e.g.,
+                              ``nlocal_chain_surrogate_cost_fn``. If provided, the initial
+                              settings are pre-optimized on the surrogate cost before the
+                              ``cost_fn`` refines them. The surrogate score of each start is
+                              added to the optimization dictionary as ``"surrogate_opt_scores"``.
+    :type surrogate_cost_fn: optional, Function, default ``None``
+
+    :param surrogate_opt_kwargs: Keyword arguments for the optimizer of the surrogate cost.
+    :type surrogate_opt_kwargs: optional, dictionary
+
     :returns: An ``optimize(noise_args)`` function that constructs a cost
               function for a noisy network ansatz.
     :rtype: Function
     """
+    cache_opt_kwargs = opt_kwargs if num_starts == 1 else {**opt_kwargs, "num_starts": num_starts}
+    noisy_cost = cached_noisy_cost_fn(
+        prep_nodes,
+        meas_nodes,
+        noise_nodes_fn,
+        cost_fn,
+        ansatz_kwargs=ansatz_kwargs,
+        cost_kwargs=cost_kwargs,
+        qnode_kwargs=qnode_kwargs,
+    )
+
+    if surrogate_cost_fn is not None:
+        cache_opt_kwargs = {
+            **cache_opt_kwargs,
+            "surrogate_cost_fn": surrogate_cost_fn.__name__,
+            "surrogate_opt_kwargs": surrogate_opt_kwargs,
+        }
+
+    vectorized_cost_fn = None
+    if (
+        num_starts > 1
+        and len(cost_kwargs) == 0
+        and len(qnode_kwargs) == 0
+        and all(key in _BATCH_OPT_KWARGS for key in opt_kwargs)
+    ):
+        vectorized_cost_fn = get_vectorized_cost_fn(cost_fn)
+
+    use_cache = cache_dir is not None and seed is not None
 
     def optimize(noise_args):
         """Constructs a cost function for the provided ``noise_args``
         and finds the optimal network settings.
         """
-        noise_nodes = noise_nodes_fn(noise_args)
+        if use_cache:
+            cache_key = opt_cache_key(
+                prep_nodes,
+                meas_nodes,
+                noise_nodes_fn(noise_args),
+                cost_fn,
+                noise_args,
+                seed=seed,
+                cost_kwargs=cost_kwargs,
+                opt_kwargs=cache_opt_kwargs,
+                ansatz_kwargs=ansatz_kwargs,
+                qnode_kwargs=qnode_kwargs,
+            )
+            opt_dict = read_cached_opt_dict(cache_dir, cache_key)
+            if opt_dict is not None:
+                if verbose:
+                    print("cached noise args : ", noise_args)
 
-        ansatz = qnet.NetworkAnsatz(prep_nodes, meas_nodes, noise_nodes, **ansatz_kwargs)
-        cost = cost_fn(ansatz, **cost_kwargs, **qnode_kwargs)
-        init_settings = ansatz.rand_scenario_settings()
-        # init_settings = ansatz.tf_rand_scenario_settings()
+                return opt_dict
 
-        opt_dict = _gradient_descent_wrapper(cost, init_settings, **opt_kwargs)
+        if seed is not None:
+            np.random.seed(seed)
+
+        ansatz, cost = noisy_cost(noise_args)
+
+        if num_starts == 1:
+            init_settings = [ansatz.rand_scenario_settings()]
+            # init_settings = [ansatz.tf_rand_scenario_settings()]
+        else:
+            init_settings = [ansatz.rand_scenario_settings() for i in range(num_starts)]
+
+        if surrogate_cost_fn is not None:
+            surrogate_cost = surrogate_cost_fn(ansatz)
+            surrogate_opt_dicts = [
+                _surrogate_pre_optimization(surrogate_cost, settings, surrogate_opt_kwargs)
+                for settings in init_settings
+            ]
+            init_settings = [
+                surrogate_opt_dict["opt_settings"] for surrogate_opt_dict in surrogate_opt_dicts
+            ]
+
+        if vectorized_cost_fn is not None:
+            opt_dicts = _batch_gradient_descent_wrapper(
+                vectorized_cost_fn([ansatz] * num_starts), init_settings, **opt_kwargs
+            )
+        else:
+            network_opt_kwargs = _network_opt_kwargs(opt_kwargs, ansatz)
+            opt_dicts = [
+                _gradient_descent_wrapper(cost, settings, **network_opt_kwargs)
+                for settings in init_settings
+            ]
+
+        if num_starts == 1:
+            opt_dict = opt_dicts[0]
+        else:
+            opt_dict = max(opt_dicts, key=_opt_score)
+            opt_dict["start_opt_scores"] = [float(start["opt_score"]) for start in opt_dicts]
+            opt_dict["start_opt_settings"] = [
+                qnet.settings_to_list(start["opt_settings"]) for start in opt_dicts
+            ]
+
+        if surrogate_cost_fn is not None:
+            opt_dict["surrogate_opt_scores"] = [
+                float(surrogate_opt_dict["opt_score"]) for surrogate_opt_dict in surrogate_opt_dicts
+            ]
+
+        if use_cache:
+            write_cached_opt_dict(cache_dir, cache_key, opt_dict)
 
         if verbose:
             print("noise args : ", noise_args)
@@ -198,15 +420,716 @@ def noisy_net_opt_fn(
     return optimize
 
 
-def _gradient_descent_wrapper(*opt_args, **opt_kwargs):
+def noisy_net_continuation_opt_fn(
+    prep_nodes,
+    meas_nodes,
+    noise_nodes_fn,
+    cost_fn,
+    ansatz_kwargs={},
+    cost_kwargs={},
+    qnode_kwargs={},
+    opt_kwargs={},
+    bidirectional=True,
+    verbose=True,
+):
+    """Constructs a ``continuation_optimize`` function that sweeps through the noise
+    parameters of a scan, seeding each optimization with the optimum of its neighbour.
+
+    The first noise parameter is seeded with random settings. Each optimization runs
+    ``_gradient_descent_wrapper``, hence, any optimizer of ``get_optimizer`` can be used.
+    A warm-started optimization should stop once converged, e.g., ``opt_kwargs`` should
+    include a convergence criterion of ``early_stopping_gradient_descent`` such as
+    ``plateau_tol``. If ``bidirectional``, the scan is swept a second time in reverse
+    order and the better of the two optimizations is kept for each noise parameter.
+    This avoids following a suboptimal branch of strategies across the scan.
+
+    The whole scan is a single task, e.g., of a sweep with an ``"optimize_scan"``
+    function in ``run_sweeps``.
+
+    :param prep_nodes: A list of qnet.PrepareNode classes for the network ansatz.
+    :type prep_nodes: list[PrepareNode]
+
+    :param meas_nodes: A list of qnet.MeasureNode classes for the network ansatz.
+    :type meas_nodes: list[MeasureNode]
+
+    :param noise_nodes_fn: A function for constructing the noise nodes for the ansatz.
+                           this function must ``noise_args`` as input.
+    :type noise_nodes_fn: function
+
+    :param cost_fn: A cost function factory used to construct an ansatz-specific cost function.
+    :type cost_fn: function
+
+    :param ansatz_kwargs: Keyword arguments for the ``qnet.NetworkAnsatz`` class.
+    :type ansatz_kwargs: optional, dictionary
+
+    :param cost_kwargs: Keyword arguments for the ``cost_fn`` factory function.
+    :type cost_kwargs: optional, dictionary
+
+    :param qnode_kwargs: Keyword arguments passed to the QNode constructors.
+    :type qnode_kwargs: optional, dictionary
+
+    :param opt_kwargs: Keyword arguments for the optimization of each noise parameter,
+                       see ``_gradient_descent_wrapper``.
+    :type opt_kwargs: optional, dictionary
+
+    :param bidirectional: If ``True`` the scan is swept forward and backward.
+    :type bidirectional: optional, Bool, default ``True``
+
+    :param verbose: If ``True`` prints out progress.
+    :type verbose: Bool
+
+    :returns: A ``continuation_optimize(param_range)`` function that returns a list containing
+              an optimization dictionary for each noise parameter in ``param_range``.
+    :rtype: Function
+    """
+
+    noisy_cost = cached_noisy_cost_fn(
+        prep_nodes,
+        meas_nodes,
+        noise_nodes_fn,
+        cost_fn,
+        ansatz_kwargs=ansatz_kwargs,
+        cost_kwargs=cost_kwargs,
+        qnode_kwargs=qnode_kwargs,
+    )
+
+    def continuation_optimize(param_range):
+        """Constructs a cost function for each of the ``noise_args`` in ``param_range``
+        and finds the optimal network settings by continuation.
+        """
+        ansatz_costs = [noisy_cost(noise_args) for noise_args in param_range]
+        ansatz = ansatz_costs[0][0]
+
+        ids = list(range(len(param_range)))
+        opt_dicts = _continuation_sweep(
+            ansatz_costs, ids, ansatz.rand_scenario_settings(), opt_kwargs
+        )
+
+        if bidirectional:
+            reverse_init_settings = (
+                ansatz.rand_scenario_settings()
+                if np.isnan(opt_dicts[ids[-1]]["opt_score"])
+                else opt_dicts[ids[-1]]["opt_settings"]
+            )
+            reverse_opt_dicts = _continuation_sweep(
+                ansatz_costs, ids[::-1], reverse_init_settings, opt_kwargs
+            )
+
+            opt_dicts = [
+                max(opt_dict_pair, key=_opt_score)
+                for opt_dict_pair in zip(opt_dicts, reverse_opt_dicts)
+            ]
+
+        if verbose:
+            for noise_args, opt_dict in zip(param_range, opt_dicts):
+                print("noise args : ", noise_args)
+                print("max score : ", opt_dict["opt_score"])
+
+        return opt_dicts
+
+    return continuation_optimize
+
+
+def noisy_net_sweep_opt_fn(
+    prep_nodes,
+    meas_nodes,
+    noise_nodes_fn,
+    cost_fn,
+    ansatz_kwargs={},
+    opt_kwargs={},
+    seed=None,
+    verbose=True,
+):
+    """Constructs a ``sweep_optimize`` function that optimizes all noise parameters of a scan
+    simultaneously in a single vectorized gradient descent.
+
+    The noise parameter is the batch axis of the vectorized counterpart of the ``cost_fn``,
+    see ``get_vectorized_cost_fn``, hence, the network is compiled once and each step of
+    ``batch_gradient_descent`` differentiates the costs of all unconverged noise parameters
+    in a single pass. Each noise parameter starts from its own random settings, may use its
+    own step size, and is masked out of the batch once converged.
+
+    The whole scan is a single task, e.g., of a sweep with an ``"optimize_scan"``
+    function in ``run_sweeps``.
+
+    :param prep_nodes: A list of qnet.PrepareNode classes for the network ansatz.
+    :type prep_nodes: list[PrepareNode]
+
+    :param meas_nodes: A list of qnet.MeasureNode classes for the network ansatz.
+    :type meas_nodes: list[MeasureNode]
+
+    :param noise_nodes_fn: A function for constructing the noise nodes for the ansatz.
+                           this function must ``noise_args`` as input.
+    :type noise_nodes_fn: function
+
+    :param cost_fn: A cost function factory with a vectorized counterpart, e.g.,
+                    ``factorized_nlocal_chain_cost_22``.
+    :type cost_fn: function
+
+    :param ansatz_kwargs: Keyword arguments for the ``qnet.NetworkAnsatz`` class.
+    :type ansatz_kwargs: optional, dictionary
+
+    :param opt_kwargs: Keyword arguments for the ``batch_gradient_descent`` function. The
+                       ``step_size`` may be a list holding the step size of each noise
+                       parameter. The ``keep_history`` and ``history_dir`` keywords are passed
+                       to ``retain_settings_history``.
+    :type opt_kwargs: optional, dictionary
+
+    :param seed: The seed of the random initial settings.
+    :type seed: optional, Int, default ``None``
+
+    :param verbose: If ``True`` prints out progress.
+    :type verbose: Bool
+
+    :returns: A ``sweep_optimize(param_range)`` function that returns a list containing
+              an optimization dictionary for each noise parameter in ``param_range``.
+    :rtype: Function
+
+    :raises ValueError: If the ``cost_fn`` has no vectorized counterpart.
+    """
+    vectorized_cost_fn = get_vectorized_cost_fn(cost_fn)
+    if vectorized_cost_fn is None:
+        raise ValueError(
+            "The cost function " + cost_fn.__name__ + " has no vectorized counterpart."
+        )
+
+    def sweep_optimize(param_range):
+        """Constructs the vectorized cost function of the ``param_range``
+        and finds the optimal network settings of each noise parameter.
+        """
+        if seed is not None:
+            np.random.seed(seed)
+
+        network_ansatzes = [
+            qnet.NetworkAnsatz(prep_nodes, meas_nodes, noise_nodes_fn(noise_args), **ansatz_kwargs)
+            for noise_args in param_range
+        ]
+        init_settings = [
+            network_ansatz.rand_scenario_settings() for network_ansatz in network_ansatzes
+        ]
+
+        opt_dicts = _batch_gradient_descent_wrapper(
+            vectorized_cost_fn(network_ansatzes), init_settings, **opt_kwargs
+        )
+
+        if verbose:
+            for noise_args, opt_dict in zip(param_range, opt_dicts):
+                print("noise args : ", noise_args)
+                print("max score : ", opt_dict["opt_score"])
+
+        return opt_dicts
+
+    return sweep_optimize
+
+
+def _opt_score(opt_dict):
+    """Returns the optimal score of the ``opt_dict`` where failed optimizations score ``-inf``."""
+    return -np.inf if np.isnan(opt_dict["opt_score"]) else opt_dict["opt_score"]
+
+
+def _continuation_sweep(ansatz_costs, ids, init_settings, opt_kwargs):
+    """Optimizes the ``(ansatz, cost)`` pairs of ``ansatz_costs`` in the order of ``ids``
+    where each optimization is seeded with the optimal settings of the previous one.
+    """
+    opt_dicts = [None] * len(ansatz_costs)
+
+    settings = init_settings
+    for i in ids:
+        ansatz, cost = ansatz_costs[i]
+        opt_dicts[i] = _gradient_descent_wrapper(
+            cost, settings, **_network_opt_kwargs(opt_kwargs, ansatz)
+        )
+
+        # a failed optimization does not seed its neighbour
+        if not np.isnan(opt_dicts[i]["opt_score"]):
+            settings = opt_dicts[i]["opt_settings"]
+
+    return opt_dicts
+
+
+def _settings_step(settings, grad, step_size):
+    """Returns the scenario ``settings`` shifted by ``-step_size * grad``."""
+    return [
+        [
+            np.array(node_settings - step_size * node_grad, requires_grad=True)
+            for node_settings, node_grad in zip(layer_settings, layer_grad)
+        ]
+        for layer_settings, layer_grad in zip(settings, grad)
+    ]
+
+
+def _batch_subset(batch_settings, batch_ids):
+    """Selects the elements ``batch_ids`` of the ``batch_settings``."""
+    return [[node_settings[batch_ids] for node_settings in layer] for layer in batch_settings]
+
+
+def _batch_settings_step(batch_settings, batch_grad, batch_ids, step_sizes):
+    """Returns the ``batch_settings`` where the elements ``batch_ids`` are shifted by
+    ``-step_size * grad`` with the step size of each element."""
+    new_batch_settings = []
+    for layer_settings, layer_grad in zip(batch_settings, batch_grad):
+        new_layer = []
+        for node_settings, node_grad in zip(layer_settings, layer_grad):
+            new_node_settings = np.array(node_settings, requires_grad=True)
+            new_node_settings[batch_ids] = (
+                node_settings[batch_ids] - step_sizes[batch_ids, None, None] * node_grad
+            )
+            new_layer.append(new_node_settings)
+
+        new_batch_settings.append(new_layer)
+
+    return new_batch_settings
+
+
+def batch_gradient_descent(
+    batch_cost,
+    init_settings,
+    num_steps=150,
+    step_size=0.1,
+    sample_width=25,
+    tol=None,
+    verbose=True,
+):
+    """Minimizes a batch of cost functions simultaneously with vectorized gradient descent.
+
+    The settings of all elements are stacked along a batch axis, see ``stack_scenario_settings``,
+    and the ``batch_cost`` evaluates the costs of all elements in a single pass, e.g., a cost
+    constructed with ``vectorized_nlocal_chain_cost_22``. Hence, each step differentiates the
+    sum of the unconverged costs with a single call of ``qml.grad``. Each element is updated
+    with its own step size. An element is marked converged and masked out of the batch when
+    its score changes by less than ``tol`` between two samples.
+
+    :param batch_cost: A function ``batch_cost(batch_settings, batch_ids)`` returning the cost
+                       of each of the elements ``batch_ids`` whose settings are stacked in the
+                       ``batch_settings``.
+    :type batch_cost: Function
+
+    :param init_settings: The initial scenario settings of each element.
+    :type init_settings: List[scenario settings]
+
+    :param num_steps: The maximum number of gradient descent iterations.
+    :type num_steps: optional, Int, default ``150``
+
+    :param step_size: The learning rate shared by all elements or a learning rate for each element.
+    :type step_size: optional, Float or List[Float], default ``0.1``
+
+    :param sample_width: The number of steps between sampled scores.
+    :type sample_width: optional, Int, default ``25``
+
+    :param tol: The score change between samples below which an element has converged.
+                If ``None``, all elements run for ``num_steps``.
+    :type tol: optional, Float, default ``None``
+
+    :param verbose: If ``True`` prints out progress.
+    :type verbose: optional, Bool, default ``True``
+
+    :returns: An optimization dictionary for each element with the same keys as
+              the output of ``qnetvo.gradient_descent`` and an additional key ``"converged"``.
+    :rtype: List[Dictionary]
+    """
+    num_elements = len(init_settings)
+    step_sizes = np.array(
+        step_size if np.ndim(step_size) == 1 else [step_size] * num_elements, requires_grad=False
+    )
+
+    start_datetime = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+    batch_settings = stack_scenario_settings(init_settings)
+    opt_dicts = [
+        {
+            "datetime": start_datetime,
+            "scores": [],
+            "samples": [],
+            "settings_history": [init_settings[i]],
+            "step_times": [],
+            "step_size": float(step_sizes[i]),
+            "converged": False,
+        }
+        for i in range(num_elements)
+    ]
+
+    active_ids = list(range(num_elements))
+    batch_grad = qml.grad(
+        lambda active_settings: np.sum(batch_cost(active_settings, active_ids)), argnum=0
+    )
+
+    elapsed = 0
+    for step in range(num_steps):
+        if step % sample_width == 0:
+            scores = -batch_cost(_batch_subset(batch_settings, active_ids), active_ids)
+            for i, score in zip(list(active_ids), scores):
+                prev_scores = opt_dicts[i]["scores"]
+                score_change = np.abs(score - prev_scores[-1]) if len(prev_scores) > 0 else np.inf
+                if tol is not None and score_change < tol:
+                    opt_dicts[i]["converged"] = True
+                    active_ids.remove(i)
+                else:
+                    prev_scores.append(float(score))
+                    opt_dicts[i]["samples"].append(step)
+
+            if verbose:
+                print("iteration : ", step, ", active : ", len(active_ids))
+
+        if len(active_ids) == 0:
+            break
+
+        start = time.time()
+        grads = batch_grad(_batch_subset(batch_settings, active_ids))
+        batch_settings = _batch_settings_step(batch_settings, grads, active_ids, step_sizes)
+        for i in active_ids:
+            opt_dicts[i]["settings_history"].append(unstack_scenario_settings(batch_settings, i))
+
+        elapsed = time.time() - start
+
+        if step % sample_width == 0:
+            for i in active_ids:
+                opt_dicts[i]["step_times"].append(elapsed)
+
+    opt_scores = -batch_cost(batch_settings, list(range(num_elements)))
+    for i in range(num_elements):
+        opt_score = float(opt_scores[i])
+
+        opt_dicts[i]["scores"].append(opt_score)
+        opt_dicts[i]["samples"].append(len(opt_dicts[i]["settings_history"]) - 1)
+        opt_dicts[i]["step_times"].append(elapsed)
+        opt_dicts[i]["opt_score"] = opt_score
+        opt_dicts[i]["opt_settings"] = unstack_scenario_settings(batch_settings, i)
+
+    return opt_dicts
+
+
+def _batch_gradient_descent_wrapper(
+    batch_cost, init_settings, keep_history="all", history_dir=None, **opt_kwargs
+):
+    """Wraps ``batch_gradient_descent`` in a try-except block to gracefully
+    handle errors during computation.
+
+    The ``keep_history`` and ``history_dir`` keywords are passed to ``retain_settings_history``.
+    Optimization errors will result in an empty optimization dictionary for each element.
+    """
+    try:
+        opt_dicts = batch_gradient_descent(batch_cost, init_settings, **opt_kwargs)
+    except Exception as err:
+        print("An error occurred during batch gradient descent.")
+        print(err)
+        opt_dicts = [
+            {
+                "opt_score": np.nan,
+                "opt_settings": [[], []],
+                "scores": [np.nan],
+                "samples": [0],
+                "settings_history": [[[], []]],
+            }
+            for settings in init_settings
+        ]
+
+    return [
+        retain_settings_history(opt_dict, keep_history=keep_history, history_dir=history_dir)
+        for opt_dict in opt_dicts
+    ]
+
+
+def early_stopping_gradient_descent(
+    cost,
+    init_settings,
+    num_steps=150,
+    step_size=0.1,
+    sample_width=25,
+    grad_fn=None,
+    verbose=True,
+    plateau_tol=None,
+    grad_tol=None,
+    target_score=None,
+    target_tol=1e-6,
+    patience=1,
+):
+    """Performs the gradient descent of ``qnetvo.gradient_descent`` and stops early
+    once the optimization has converged.
+
+    The optimization stops at the first of the following criteria:
+
+    * ``"target_score"``: A sampled score is within ``target_tol`` of the ``target_score``,
+      e.g., a known quantum bound.
+    * ``"plateau"``: For ``patience`` consecutive samples, the score improved by less
+      than ``plateau_tol`` over the previous sample.
+    * ``"grad_norm"``: For ``patience`` consecutive steps, the norm of the gradient is
+      less than ``grad_tol``.
+    * ``"num_steps"``: The maximum number of steps is reached.
+
+    Criteria set to ``None`` are not applied.
+
+    :param cost: The cost function to be minimized with gradient descent.
+    :type cost: Function
+
+    :param init_settings: The initial settings of the optimization.
+    :type init_settings: List[List[np.array]]
+
+    :param num_steps: The maximum number of gradient descent iterations.
+    :type num_steps: optional, Int, default ``150``
+
+    :param step_size: The learning rate of the gradient descent.
+    :type step_size: optional, Float, default ``0.1``
+
+    :param sample_width: The number of steps between sampled scores.
+    :type sample_width: optional, Int, default ``25``
+
+    :param grad_fn: A custom gradient function, by default ``qml.grad(cost, argnum=0)``.
+    :type grad_fn: optional, Function
+
+    :param verbose: If ``True`` prints out progress.
+    :type verbose: optional, Bool, default ``True``
+
+    :param plateau_tol: The minimum score improvement between samples.
+    :type plateau_tol: optional, Float, default ``None``
+
+    :param grad_tol: The minimum norm of the gradient.
+    :type grad_tol: optional, Float, default ``None``
+
+    :param target_score: The score at which the optimization is complete.
+    :type target_score: optional, Float, default ``None``
+
+    :param target_tol: The tolerance within which the ``target_score`` is reached.
+    :type target_tol: optional, Float, default ``1e-6``
+
+    :param patience: The number of consecutive plateaued samples or small gradients
+                     before the optimization stops.
+    :type patience: optional, Int, default ``1``
+
+    :returns: An optimization dictionary with the same keys as the output of
+              ``qnetvo.gradient_descent`` and the additional key ``"stop_reason"``.
+    :rtype: Dictionary
+    """
+    if grad_fn is None:
+        grad_fn = qml.grad(cost, argnum=0)
+
+    settings = init_settings
+    scores = []
+    samples = []
+    step_times = []
+    settings_history = [init_settings]
+
+    start_datetime = datetime.utcnow()
+    elapsed = 0
+
+    stop_reason = "num_steps"
+    num_plateaus = 0
+    num_small_grads = 0
+
+    step = 0
+    for step in range(num_steps):
+        if step % sample_width == 0:
+            score = -(cost(settings))
+
+            if plateau_tol is not None and len(scores) > 0 and score - scores[-1] < plateau_tol:
+                num_plateaus += 1
+            else:
+                num_plateaus = 0
+
+            scores.append(score)
+            samples.append(step)
+
+            if verbose:
+                print("iteration : ", step, ", score : ", score)
+
+            if target_score is not None and score >= target_score - target_tol:
+                stop_reason = "target_score"
+                break
+
+            if num_plateaus >= patience:
+                stop_reason = "plateau"
+                break
+
+        start = time.time()
+        grad = grad_fn(settings)
+        settings = _settings_step(settings, grad, step_size)
+        elapsed = time.time() - start
+
+        if step % sample_width == 0:
+            step_times.append(elapsed)
+
+            if verbose:
+                print("elapsed time : ", elapsed)
+
+        settings_history.append(settings)
+
+        if grad_tol is not None:
+            grad_norm = np.sqrt(
+                sum([np.sum(node_grad ** 2) for layer_grad in grad for node_grad in layer_grad])
+            )
+            num_small_grads = num_small_grads + 1 if grad_norm < grad_tol else 0
+
+            if num_small_grads >= patience:
+                stop_reason = "grad_norm"
+                step += 1
+                break
+    else:
+        step = num_steps
+
+    opt_score = -(cost(settings))
+    step_times.append(elapsed)
+
+    scores.append(opt_score)
+    samples.append(step)
+
+    if verbose:
+        print("stop reason : ", stop_reason)
+
+    return {
+        "datetime": start_datetime.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "opt_score": opt_score,
+        "opt_settings": settings,
+        "scores": scores,
+        "samples": samples,
+        "settings_history": settings_history,
+        "step_times": step_times,
+        "step_size": step_size,
+        "stop_reason": stop_reason,
+    }
+
+
+_EARLY_STOPPING_KWARGS = ["plateau_tol", "grad_tol", "target_score", "target_tol", "patience"]
+
+_BATCH_OPT_KWARGS = [
+    "num_steps",
+    "step_size",
+    "sample_width",
+    "verbose",
+    "keep_history",
+    "history_dir",
+]
+
+
+def _surrogate_pre_optimization(surrogate_cost, init_settings, surrogate_opt_kwargs):
+    """Optimizes the ``init_settings`` on the ``surrogate_cost``. If the optimization fails,
+    the returned optimization dictionary holds the ``init_settings`` as its optimal settings.
+    """
+    opt_dict = _gradient_descent_wrapper(surrogate_cost, init_settings, **surrogate_opt_kwargs)
+    if np.isnan(opt_dict["opt_score"]):
+        opt_dict["opt_settings"] = init_settings
+
+    return opt_dict
+
+
+def _network_opt_kwargs(opt_kwargs, network_ansatz):
+    """Adds the metric tensor of the ``network_ansatz`` to the ``opt_kwargs`` of
+    the natural gradient optimizer if no ``"metric_fn"`` is provided.
+    """
+    if opt_kwargs.get("optimizer", None) == "natural_gradient" and "metric_fn" not in opt_kwargs:
+        return {**opt_kwargs, "metric_fn": network_metric_tensor_fn(network_ansatz)}
+
+    return opt_kwargs
+
+
+def _compact_settings(settings):
+    """Converts the scenario ``settings`` into float64 arrays detached from autograd."""
+    return [
+        [np.array(node_settings, dtype=float, requires_grad=False) for node_settings in layer]
+        for layer in settings
+    ]
+
+
+def retain_settings_history(opt_dict, keep_history="all", history_dir=None):
+    """Reduces the ``"settings_history"`` of an optimization dictionary such that only
+    the settings needed downstream are kept in memory and sent between Dask workers.
+
+    The retained settings are stored as float64 arrays and the optimization step of each
+    retained settings is listed in the ``"settings_history_steps"`` of the dictionary.
+    The settings of the maximal sampled score are always retained.
+
+    :param opt_dict: The optimization dictionary, modified in place.
+    :type opt_dict: Dictionary
+
+    :param keep_history: ``"all"`` to keep the full history, ``"best"`` to keep only the
+                         settings of the maximal sampled score, or an integer ``k`` to keep
+                         every ``k``-th step along with the best and final steps.
+    :type keep_history: optional, String or Int, default ``"all"``
+
+    :param history_dir: If provided, the full history is written to a ``.npy`` file in this
+                        directory as a float64 array with one row of flattened settings per
+                        step. The path is stored as ``"settings_history_file"``.
+    :type history_dir: optional, String
+
+    :returns: The optimization dictionary.
+    :rtype: Dictionary
+    """
+    if (keep_history == "all" and history_dir is None) or np.isnan(opt_dict["opt_score"]):
+        return opt_dict
+
+    settings_history = opt_dict["settings_history"]
+    if history_dir is not None:
+        makedirs(history_dir, exist_ok=True)
+        filepath = join(history_dir, uuid.uuid4().hex + ".npy")
+        np.save(
+            filepath,
+            np.array([flatten_settings(settings)[0] for settings in settings_history], dtype=float),
+        )
+        opt_dict["settings_history_file"] = filepath
+
+    max_id = opt_dict["scores"].index(max(opt_dict["scores"]))
+    best_step = min(opt_dict["samples"][max_id], len(settings_history) - 1)
+
+    if keep_history == "all":
+        steps = list(range(len(settings_history)))
+    elif keep_history == "best":
+        steps = [best_step]
+    else:
+        steps = sorted(
+            set(range(0, len(settings_history), keep_history))
+            | {best_step, len(settings_history) - 1}
+        )
+
+    opt_dict["settings_history"] = [_compact_settings(settings_history[step]) for step in steps]
+    opt_dict["settings_history_steps"] = steps
+
+    return opt_dict
+
+
+def _max_score_settings(opt_dict):
+    """Returns the maximal sampled score, its sample, and the settings of that sample."""
+    max_score = max(opt_dict["scores"])
+    max_id = opt_dict["scores"].index(max_score)
+    max_sample = opt_dict["samples"][max_id]
+
+    steps = opt_dict.get(
+        "settings_history_steps", list(range(len(opt_dict["settings_history"])))
+    )
+    step = max_sample if max_sample in steps else steps[-1]
+
+    return max_score, max_sample, opt_dict["settings_history"][steps.index(step)]
+
+
+def _gradient_descent_wrapper(
+    *opt_args, optimizer="gradient_descent", keep_history="all", history_dir=None, **opt_kwargs
+):
     """Wraps ``qnetvo.gradient_descent`` in a try-except block to gracefully
     handle errors during computation.
 
     This function is called with the same parameters as ``qnetvo.gradient_descent``.
+    If any of the convergence criteria of ``early_stopping_gradient_descent`` are passed,
+    that function is used instead. Other optimizers are selected by name with the
+    ``optimizer`` keyword, see ``get_optimizer``. The ``keep_history`` and ``history_dir``
+    keywords are passed to ``retain_settings_history``.
     Optimization errors will result in an empty optimization dictionary.
+
+    :raises ValueError: If convergence criteria are passed to an optimizer other than
+                        ``"gradient_descent"``.
     """
+    early_stopping_keys = [key for key in _EARLY_STOPPING_KWARGS if key in opt_kwargs]
+    if len(early_stopping_keys) > 0 and optimizer != "gradient_descent":
+        raise ValueError(
+            "The convergence criteria "
+            + ", ".join(early_stopping_keys)
+            + ' are only supported by the "gradient_descent" optimizer, not by '
+            + optimizer
+            + "."
+        )
+
+    if len(early_stopping_keys) > 0:
+        gradient_descent = early_stopping_gradient_descent
+    else:
+        gradient_descent = get_optimizer(optimizer)
+
     try:
-        opt_dict = qnet.gradient_descent(*opt_args, **opt_kwargs)
+        opt_dict = gradient_descent(*opt_args, **opt_kwargs)
     except Exception as err:
         print("An error occurred during gradient descent.")
         print(err)
@@ -218,11 +1141,18 @@ def _gradient_descent_wrapper(*opt_args, **opt_kwargs):
             "settings_history": [[[], []]],
         }
 
-    return opt_dict
+    return retain_settings_history(opt_dict, keep_history=keep_history, history_dir=history_dir)
 
 
 def save_optimizations_one_param_scan(
-    data_filepath, opt_name, param_range, opt_dicts, quantum_bound=None, classical_bound=None
+    data_filepath,
+    opt_name,
+    param_range,
+    opt_dicts,
+    quantum_bound=None,
+    classical_bound=None,
+    scan_store_dir=None,
+    seed=None,
 ):
     """Saves json data and plots for optimizations scanned over single
     fixed parameter.
@@ -246,17 +1176,26 @@ def save_optimizations_one_param_scan(
     :param classical_bound: The theoretical classical bound for the scenario.
                             This is used for context in the plot.
     :type classical_bound: Optional, Float
+
+    :param scan_store_dir: If provided, the scan is also appended to the columnar
+                           store in this directory (see ``append_scan_store``).
+    :type scan_store_dir: Optional, String
+
+    :param seed: The seed of the optimizations, saved with the data and the scan store.
+    :type seed: Optional, Int
+
+    :returns: The path of the saved data without its file extension.
+    :rtype: String
     """
     json_data = {"noise_params": [], "max_scores": [], "opt_settings": []}
+    if seed != None:
+        json_data["seed"] = seed
 
     for i in range(len(param_range)):
         noise_param = float(param_range[i])
         json_data["noise_params"] += [noise_param]
 
-        max_score = max(opt_dicts[i]["scores"])
-        max_id = opt_dicts[i]["scores"].index(max_score)
-        max_sample = opt_dicts[i]["samples"][max_id]
-        opt_settings = opt_dicts[i]["settings_history"][max_id]
+        max_score, max_sample, opt_settings = _max_score_settings(opt_dicts[i])
 
         json_data["max_scores"] += [float(max_score)]
         json_data["opt_settings"] += [qnet.settings_to_list(opt_settings)]
@@ -277,6 +1216,16 @@ def save_optimizations_one_param_scan(
     with open(filename + ".json", "w") as file:
         file.write(json.dumps(json_data))
 
+    if scan_store_dir != None:
+        append_scan_store(
+            scan_store_dir,
+            json_data["noise_params"],
+            json_data["max_scores"],
+            json_data["opt_settings"],
+            seed=-1 if seed == None else seed,
+            run_name=opt_name + datetime_ext,
+        )
+
     if quantum_bound != None:
         plt.plot(
             opt_dicts[0]["samples"],
@@ -298,6 +1247,8 @@ def save_optimizations_one_param_scan(
     plt.savefig(filename)
     plt.clf()
 
+    return filename
+
 
 def save_optimizations_two_param_scan(
     data_filepath, opt_name, x_range, y_range, opt_dicts, quantum_bound=None, classical_bound=None,
@@ -340,10 +1291,7 @@ def save_optimizations_two_param_scan(
         for col_id in range(x_mesh.shape[1]):
             opt_id = col_id * x_mesh.shape[0] + row_id
 
-            max_score = max(opt_dicts[opt_id]["scores"])
-            max_id = opt_dicts[opt_id]["scores"].index(max_score)
-            max_sample = opt_dicts[opt_id]["samples"][max_id]
-            opt_settings = opt_dicts[opt_id]["settings_history"][max_id]
+            max_score, max_sample, opt_settings = _max_score_settings(opt_dicts[opt_id])
 
             json_data["max_scores"][row_id] += [float(max_score)]
             json_data["opt_settings"][row_id] += [qnet.settings_to_list(opt_settings)]
@@ -399,61 +1347,57 @@ def analyze_data_one_param_scan(data_files):
     * ``"std_errs"``: The standard error for each noise parameter over
         all optimizations.
     """
-    data_dicts = []
+    noise_params = []
+    scores = []
+    settings_list = []
     for filepath in data_files:
         with open(filepath) as file:
-            data_dicts.append(json.load(file))
-
-    results = {}
-    settings_results = {}
-
-    noise_params = []
-    for data_dict in data_dicts:
-        for i in range(len(data_dict["noise_params"])):
-            if np.isnan(data_dict["max_scores"][i]):
-                continue
-
-            noise_key = "{:.3f}".format(data_dict["noise_params"][i])
-
-            if noise_key in results:
-                results[noise_key].append(data_dict["max_scores"][i])
-                settings_results[noise_key].append(data_dict["opt_settings"][i])
-
-            else:
-                results[noise_key] = [data_dict["max_scores"][i]]
-                settings_results[noise_key] = [data_dict["opt_settings"][i]]
-
-                noise_params.append(np.round(data_dict["noise_params"][i], 5))
+            data_dict = json.load(file)
+
+        noise_params += data_dict["noise_params"]
+        scores += data_dict["max_scores"]
+        settings_list += data_dict["opt_settings"]
+
+    noise_params = np.array(noise_params, dtype=float, requires_grad=False)
+    scores = np.array(scores, dtype=float, requires_grad=False)
+
+    # failed optimizations are excluded from the analysis
+    row_ids = np.arange(len(scores))[~np.isnan(scores)]
+    if len(row_ids) == 0:
+        return {
+            "noise_params": np.array([]),
+            "max_scores": [],
+            "mean_scores": [],
+            "std_errs": [],
+            "opt_settings": [],
+        }
 
-    sorted_noise_params = np.sort(noise_params)
-    max_scores = [max(results["{:.3f}".format(noise_param)]) for noise_param in sorted_noise_params]
+    # grouping by rounded values merges floating point artifacts such as those of ``np.arange``
+    sorted_noise_params, group_ids = np.unique(
+        np.round(noise_params[row_ids], 10), return_inverse=True
+    )
 
-    mean_scores = [
-        np.mean(results["{:.3f}".format(noise_param)], axis=0)
-        for noise_param in sorted_noise_params
-    ]
+    # scatters the scores into a (noise params, runs) array padded with nan where the
+    # rows of each noise parameter retain the order of the data files
+    order = np.argsort(group_ids, kind="stable")
+    counts = np.bincount(group_ids, minlength=len(sorted_noise_params))
+    run_ids = np.arange(len(order)) - np.repeat(np.cumsum(counts) - counts, counts)
 
-    std_errs = [
-        np.std(results[noise_key], axis=0) / np.sqrt(len(results[noise_key]))
-        for noise_key in ["{:.3f}".format(noise_param) for noise_param in sorted_noise_params]
-    ]
+    scores_array = np.full((len(sorted_noise_params), max(counts)), np.nan)
+    scores_array[group_ids[order], run_ids] = scores[row_ids[order]]
 
-    max_score_ids = [
-        (results["{:.3f}".format(sorted_noise_params[i])]).index(max_scores[i])
-        for i in range(len(noise_params))
-    ]
+    rows_array = np.zeros(scores_array.shape, dtype=int)
+    rows_array[group_ids[order], run_ids] = row_ids[order]
 
-    opt_settings_list = [
-        settings_results["{:.3f}".format(sorted_noise_params[i])][max_score_ids[i]]
-        for i in range(len(noise_params))
-    ]
+    max_score_ids = np.nanargmax(scores_array, axis=1)
+    max_rows = rows_array[np.arange(len(sorted_noise_params)), max_score_ids]
 
     return {
-        "noise_params": sorted_noise_params,
-        "max_scores": max_scores,
-        "mean_scores": mean_scores,
-        "std_errs": std_errs,
-        "opt_settings": opt_settings_list,
+        "noise_params": np.round(sorted_noise_params, 5),
+        "max_scores": np.nanmax(scores_array, axis=1).tolist(),
+        "mean_scores": np.nanmean(scores_array, axis=1).tolist(),
+        "std_errs": (np.nanstd(scores_array, axis=1) / np.sqrt(counts)).tolist(),
+        "opt_settings": [settings_list[row_id] for row_id in max_rows],
     }
 
 
@@ -0,0 +1,485 @@
+import pennylane as qml
+from pennylane import numpy as np
+from pennylane import math
+import qnetvo as qnet
+
+from src.factorized_network import (
+    _reject_qnode_kwargs,
+    _node_ops,
+    _kraus_matrices,
+    _apply_operators,
+    network_sources,
+    contract_network,
+    _nlocal_chain_22_inputs,
+    _nlocal_chain_22_cost,
+    _nlocal_star_22_inputs,
+    _nlocal_star_22_cost,
+    factorized_nlocal_chain_cost_22,
+    factorized_nlocal_star_22_cost_fn,
+)
+
+
+_PAULI_MATRICES = {
+    "I": np.eye(2, requires_grad=False),
+    "X": qml.matrix(qml.PauliX(wires=0)),
+    "Y": qml.matrix(qml.PauliY(wires=0)),
+    "Z": qml.matrix(qml.PauliZ(wires=0)),
+}
+
+# the Pauli word generating each single-parameter rotation as exp(-i theta P / 2)
+_ROTATION_WORDS = {
+    "RX": lambda op: "X",
+    "RY": lambda op: "Y",
+    "RZ": lambda op: "Z",
+    "MultiRZ": lambda op: "Z" * len(op.wires),
+    "PauliRot": lambda op: op.parameters[1],
+}
+
+
+def _op_params(op):
+    """The numerical parameters of ``op`` flattened into a single array."""
+    params = op.parameters[0:1] if op.name == "PauliRot" else op.parameters
+    return np.concatenate([np.zeros(0)] + [np.ravel(np.array(param)) for param in params])
+
+
+def _pauli_word_matrix(word, op_wires, node_wires):
+    """The matrix of the Pauli ``word`` on the ``op_wires`` in the wire order ``node_wires``."""
+    word_matrix = np.eye(1, requires_grad=False)
+    for pauli in word:
+        word_matrix = np.kron(word_matrix, _PAULI_MATRICES[pauli])
+
+    return qml.operation.expand_matrix(word_matrix, op_wires, wire_order=node_wires)
+
+
+def _setting_id(param_a, param_b, markers_a, markers_b):
+    """Finds the setting ``i`` and sign ``c`` such that ``param = c * markers[i]`` for both
+    recordings of a node or returns ``None``."""
+    for i, (marker_a, marker_b) in enumerate(zip(markers_a, markers_b)):
+        for sign in [1, -1]:
+            if param_a == sign * marker_a and param_b == sign * marker_b:
+                return i, sign
+
+    return None
+
+
+def _compile_ops(ops_a, ops_b, markers_a, markers_b, node_wires):
+    """Compiles the operations recorded for two sets of marker settings into constant
+    gates and Pauli rotations by the settings, see ``vectorized_node_gates``."""
+    gates = []
+    for op_a, op_b in zip(ops_a, ops_b):
+        params_a, params_b = _op_params(op_a), _op_params(op_b)
+
+        if np.allclose(params_a, params_b, atol=0, rtol=0):
+            gates.append(("constant", qml.matrix(op_a, wire_order=node_wires)))
+            continue
+
+        if op_a.name in _ROTATION_WORDS:
+            setting = _setting_id(float(params_a[0]), float(params_b[0]), markers_a, markers_b)
+            if setting is not None:
+                word_matrix = _pauli_word_matrix(
+                    _ROTATION_WORDS[op_a.name](op_a), list(op_a.wires), node_wires
+                )
+                gates.append(("rotation", setting[0], setting[1], word_matrix))
+                continue
+
+        try:
+            decomp_a, decomp_b = op_a.decomposition(), op_b.decomposition()
+        except qml.operation.DecompositionUndefinedError:
+            raise ValueError(
+                "The operation " + op_a.name + " cannot be vectorized over its settings."
+            )
+
+        gates += _compile_ops(decomp_a, decomp_b, markers_a, markers_b, node_wires)
+
+    return gates
+
+
+def vectorized_node_gates(node):
+    """Compiles the quantum function of a network ``node`` into a sequence of gates whose
+    matrices are evaluated in closed form for a batch of settings.
+
+    The node is recorded twice with distinct random marker settings. Each recorded operation
+    whose parameters do not depend on the settings becomes a ``("constant", matrix)`` gate.
+    Each rotation :math:`e^{-i c\\theta_i P/2}` about a Pauli word :math:`P` by the setting
+    :math:`\\theta_i` with sign :math:`c=\\pm 1` becomes a ``("rotation", i, c, P)`` gate,
+    other operations are decomposed, e.g., ``qml.Rot`` or ``qml.ArbitraryUnitary``.
+
+    :param node: The network node to compile.
+    :type node: qnetvo.PrepareNode or qnetvo.MeasureNode
+
+    :returns: The gates in the order they are applied starting with a constant gate.
+              All matrices are expressed in the wire order of the ``node``.
+    :rtype: List[Tuple]
+
+    :raises ValueError: If an operation depends on the settings in any other way, e.g.,
+                        through a rescaled setting, or cannot be decomposed.
+    """
+    # the markers are drawn without advancing the global random state of a seeded optimization
+    rng = np.random.default_rng(0)
+    markers_a = rng.uniform(1, 2, node.num_settings)
+    markers_b = rng.uniform(1, 2, node.num_settings)
+
+    node_wires = list(node.wires)
+    ops_a = _node_ops(node, np.array(markers_a, requires_grad=False)).operations
+    ops_b = _node_ops(node, np.array(markers_b, requires_grad=False)).operations
+
+    gates = [("constant", np.eye(2 ** len(node_wires), dtype=complex, requires_grad=False))]
+    gates += _compile_ops(ops_a, ops_b, markers_a, markers_b, node_wires)
+
+    # consecutive constant gates are merged into a single matrix
+    merged_gates = []
+    for gate in gates:
+        if gate[0] == "constant" and len(merged_gates) > 0 and merged_gates[-1][0] == "constant":
+            merged_gates[-1] = ("constant", np.matmul(gate[1], merged_gates[-1][1]))
+        else:
+            merged_gates.append(gate)
+
+    return merged_gates
+
+
+def vectorized_node_unitaries(gates, batch_node_settings):
+    """Evaluates the unitary of a compiled node for each settings in a batch.
+
+    Each rotation gate is evaluated as :math:`\\cos(c\\theta_i/2)U - i\\sin(c\\theta_i/2)PU`,
+    hence, the settings are never passed through a PennyLane operation.
+
+    :param gates: The gates of the node as returned by ``vectorized_node_gates``.
+    :type gates: List[Tuple]
+
+    :param batch_node_settings: The settings of the node with shape
+                                ``(batch_size, num_settings)``.
+    :type batch_node_settings: np.array
+
+    :returns: The unitaries of the node with shape ``(batch_size, dim, dim)``.
+    :rtype: np.array
+    """
+    unitaries = gates[0][1]
+    for gate in gates[1:]:
+        if gate[0] == "constant":
+            unitaries = np.matmul(gate[1], unitaries)
+            continue
+
+        _, setting_id, sign, word_matrix = gate
+        half_angles = sign * batch_node_settings[:, setting_id] / 2
+        cos_factors = np.cos(half_angles)[:, None, None]
+        sin_factors = np.sin(half_angles)[:, None, None]
+
+        unitaries = cos_factors * unitaries - 1j * sin_factors * np.matmul(word_matrix, unitaries)
+
+    # nodes without settings apply the same unitary to each element
+    if math.ndim(unitaries) == 2:
+        unitaries = math.stack([unitaries] * math.shape(batch_node_settings)[0])
+
+    return unitaries
+
+
+def stack_scenario_settings(scenario_settings_batch):
+    """Stacks the scenario settings of each element of a batch such that the settings
+    of each node hold a leading batch axis.
+
+    :param scenario_settings_batch: The scenario settings of each element.
+    :type scenario_settings_batch: List[List[List[np.array]]]
+
+    :returns: The batch settings with the nested layout of the scenario settings.
+    :rtype: List[List[np.array]]
+    """
+    return [
+        [
+            np.stack([settings[layer_id][node_id] for settings in scenario_settings_batch])
+            for node_id in range(len(layer))
+        ]
+        for layer_id, layer in enumerate(scenario_settings_batch[0])
+    ]
+
+
+def unstack_scenario_settings(batch_settings, batch_id):
+    """Returns the scenario settings of a single element of the ``batch_settings``.
+
+    :param batch_settings: The batch settings, e.g., constructed with
+                           ``stack_scenario_settings``.
+    :type batch_settings: List[List[np.array]]
+
+    :param batch_id: The index of the element in the batch.
+    :type batch_id: Int
+
+    :returns: The scenario settings of the element.
+    :rtype: List[List[np.array]]
+    """
+    return [
+        [np.array(node_settings[batch_id], requires_grad=True) for node_settings in layer]
+        for layer in batch_settings
+    ]
+
+
+def _check_batch_nodes(network_ansatzes):
+    """Raises a ``ValueError`` if the ``network_ansatzes`` of a batch do not share the wires
+    and number of settings of their preparation and measurement nodes."""
+
+    def node_layout(network_ansatz):
+        return [
+            (list(node.wires), node.num_in, node.num_settings)
+            for node in network_ansatz.prepare_nodes + network_ansatz.measure_nodes
+        ]
+
+    if any(
+        node_layout(network_ansatz) != node_layout(network_ansatzes[0])
+        for network_ansatz in network_ansatzes
+    ):
+        raise ValueError("The network ansatzes in the batch must share their nodes.")
+
+
+def _batch_noise_kraus(network_ansatzes):
+    """Stacks the Kraus operators of the noise of each source over the ``network_ansatzes``.
+    Returns a list holding a ``(op_wires, kraus_ops)`` pair for each noise operation of each
+    source where ``kraus_ops`` has shape ``(num_kraus, batch_size, dim, dim)``.
+    """
+    batch_sources = [network_sources(network_ansatz) for network_ansatz in network_ansatzes]
+
+    source_noise = []
+    for source_id, source in enumerate(batch_sources[0]):
+        batch_ops = [
+            [
+                op
+                for noise_node in sources[source_id]["noise_nodes"]
+                for op in _node_ops(noise_node, []).operations
+            ]
+            for sources in batch_sources
+        ]
+
+        noise_ops = []
+        for op_id, op in enumerate(batch_ops[0]):
+            if any(
+                len(ops) != len(batch_ops[0]) or list(ops[op_id].wires) != list(op.wires)
+                for ops in batch_ops
+            ):
+                raise ValueError("The noise of each network ansatz in the batch must match.")
+
+            batch_kraus = [_kraus_matrices(ops[op_id]) for ops in batch_ops]
+            if any(len(kraus_ops) != len(batch_kraus[0]) for kraus_ops in batch_kraus):
+                raise ValueError("The noise of each network ansatz in the batch must match.")
+
+            noise_ops.append(
+                (
+                    list(op.wires),
+                    np.array(
+                        [
+                            [np.array(kraus_ops[k]) for kraus_ops in batch_kraus]
+                            for k in range(len(batch_kraus[0]))
+                        ],
+                        requires_grad=False,
+                    ),
+                )
+            )
+
+        source_noise.append(noise_ops)
+
+    return source_noise
+
+
+def vectorized_source_density_matrices_fn(network_ansatzes, prep_inputs=None):
+    """Constructs a function that evaluates the (noisy) density matrix prepared by each source
+    for a batch of network ansatzes that differ only in their noise, e.g., the points of a
+    noise parameter scan, or for copies of one ansatz, e.g., the starts of an optimization.
+
+    :param network_ansatzes: The network ansatz of each element in the batch.
+    :type network_ansatzes: List[qnetvo.NetworkAnsatz]
+
+    :param prep_inputs: The preparation node inputs.
+    :type prep_inputs: optional, List[Int], default all ``0``
+
+    :returns: A function ``source_density_matrices(batch_prep_settings, batch_ids=None)``
+              where ``batch_prep_settings`` are the preparation settings of the batch
+              settings, i.e., ``batch_settings[0]``, and ``batch_ids`` selects the elements
+              of the batch that are evaluated. The function returns a list holding the
+              density matrices of each source with shape ``(batch_size, dim, dim)``.
+    :rtype: Function
+
+    :raises ValueError: If the nodes or the noise of the ``network_ansatzes`` do not match.
+    """
+    _check_batch_nodes(network_ansatzes)
+
+    network_ansatz = network_ansatzes[0]
+    sources = network_sources(network_ansatz)
+    source_noise = _batch_noise_kraus(network_ansatzes)
+
+    prep_inputs = prep_inputs or [0] * len(network_ansatz.prepare_nodes)
+    prep_node_ids = {id(node): i for i, node in enumerate(network_ansatz.prepare_nodes)}
+    prep_gates = [vectorized_node_gates(node) for node in network_ansatz.prepare_nodes]
+
+    def source_density_matrices(batch_prep_settings, batch_ids=None):
+        batch_ids = list(range(len(network_ansatzes))) if batch_ids is None else batch_ids
+        batch_size = len(batch_ids)
+
+        states = []
+        for source, noise_ops in zip(sources, source_noise):
+            wires = source["wires"]
+            prep_node = source["prep_node"]
+
+            if prep_node is None:
+                rho = math.stack([np.array([[1, 0], [0, 0]], dtype=complex)] * batch_size)
+            else:
+                i = prep_node_ids[id(prep_node)]
+                unitaries = vectorized_node_unitaries(
+                    prep_gates[i], batch_prep_settings[i][:, prep_inputs[i], :]
+                )
+                rho = np.einsum("bi,bj->bij", unitaries[:, :, 0], np.conj(unitaries[:, :, 0]))
+
+            for op_wires, kraus_ops in noise_ops:
+                rho = _apply_operators(rho, kraus_ops[:, batch_ids], op_wires, wires, batched=True)
+
+            states.append(rho)
+
+        return states
+
+    return source_density_matrices
+
+
+def vectorized_parity_expval_fn(network_ansatzes, meas_inputs_batch, prep_inputs=None):
+    """Constructs a function that evaluates the global parity expectation values of
+    ``factorized_batch_parity_expval_fn`` for a batch of network ansatzes in a single pass.
+
+    Each node unitary is evaluated for all elements of the batch with
+    ``vectorized_node_unitaries`` and the tensor network is contracted once per
+    measurement input combination for the whole batch. The costs of the elements
+    are therefore differentiated with a single call of ``qml.grad``.
+
+    :param network_ansatzes: The network ansatz of each element in the batch. The ansatzes
+                             must share their preparation and measurement nodes and differ
+                             only in the parameters of their noise.
+    :type network_ansatzes: List[qnetvo.NetworkAnsatz]
+
+    :param meas_inputs_batch: The measurement node inputs of each circuit.
+    :type meas_inputs_batch: List[List[Int]]
+
+    :param prep_inputs: The preparation node inputs shared by all circuits.
+    :type prep_inputs: optional, List[Int], default all ``0``
+
+    :returns: A function ``parity_expvals(batch_settings, batch_ids=None)`` where
+              ``batch_settings`` are constructed with ``stack_scenario_settings`` for the
+              elements ``batch_ids`` of the batch. The function returns an array of shape
+              ``(len(meas_inputs_batch), batch_size)``.
+    :rtype: Function
+
+    :raises ValueError: If the nodes or the noise of the ``network_ansatzes`` do not match.
+    """
+    network_ansatz = network_ansatzes[0]
+    sources = network_sources(network_ansatz)
+    source_density_matrices = vectorized_source_density_matrices_fn(
+        network_ansatzes, prep_inputs=prep_inputs
+    )
+
+    meas_gates = [vectorized_node_gates(node) for node in network_ansatz.measure_nodes]
+    node_wires = [list(node.wires) for node in network_ansatz.measure_nodes]
+    parity_diags = [qnet.parity_vector(len(wires)) for wires in node_wires]
+    node_inputs = [
+        sorted(set([meas_inputs[i] for meas_inputs in meas_inputs_batch]))
+        for i in range(len(network_ansatz.measure_nodes))
+    ]
+
+    def parity_expvals(batch_settings, batch_ids=None):
+        states = source_density_matrices(batch_settings[0], batch_ids=batch_ids)
+
+        observables = []
+        for i, gates in enumerate(meas_gates):
+            node_observables = {}
+            for x in node_inputs[i]:
+                unitaries = vectorized_node_unitaries(gates, batch_settings[1][i][:, x, :])
+                node_observables[x] = np.einsum(
+                    "bji,j,bjk->bik", np.conj(unitaries), parity_diags[i], unitaries
+                )
+
+            observables.append(node_observables)
+
+        expvals = [
+            contract_network(
+                states,
+                sources,
+                [node_observables[x] for node_observables, x in zip(observables, meas_inputs)],
+                node_wires,
+                batched=True,
+            )
+            for meas_inputs in meas_inputs_batch
+        ]
+
+        return np.real(math.stack(expvals))
+
+    return parity_expvals
+
+
+def vectorized_nlocal_chain_cost_22(network_ansatzes, **qnode_kwargs):
+    """Constructs the cost of ``factorized_nlocal_chain_cost_22`` for a batch of
+    :math:`n`-local chain ansatzes, see ``vectorized_parity_expval_fn``.
+
+    :param network_ansatzes: The ansatz of each element in the batch.
+    :type network_ansatzes: List[qnetvo.NetworkAnsatz]
+
+    :param qnode_kwargs: Accepted for compatibility with qnode-based cost functions and must
+                         be empty.
+    :type qnode_kwargs: Dictionary
+
+    :returns: A cost function evaluated as ``cost(batch_settings, batch_ids=None)`` returning
+              the cost of each element.
+    :rtype: Function
+
+    :raises ValueError: If any ``qnode_kwargs`` are passed.
+    """
+    _reject_qnode_kwargs("vectorized_nlocal_chain_cost_22", qnode_kwargs)
+
+    chain_expvals = vectorized_parity_expval_fn(
+        network_ansatzes, _nlocal_chain_22_inputs(network_ansatzes[0])
+    )
+
+    def cost(batch_settings, batch_ids=None):
+        return _nlocal_chain_22_cost(chain_expvals(batch_settings, batch_ids=batch_ids))
+
+    return cost
+
+
+def vectorized_nlocal_star_22_cost_fn(network_ansatzes, **qnode_kwargs):
+    """Constructs the cost of ``factorized_nlocal_star_22_cost_fn`` for a batch of
+    :math:`n`-local star ansatzes, see ``vectorized_parity_expval_fn``.
+
+    :param network_ansatzes: The ansatz of each element in the batch.
+    :type network_ansatzes: List[qnetvo.NetworkAnsatz]
+
+    :param qnode_kwargs: Accepted for compatibility with qnode-based cost functions and must
+                         be empty.
+    :type qnode_kwargs: Dictionary
+
+    :returns: A cost function evaluated as ``cost(batch_settings, batch_ids=None)`` returning
+              the cost of each element.
+    :rtype: Function
+
+    :raises ValueError: If any ``qnode_kwargs`` are passed.
+    """
+    _reject_qnode_kwargs("vectorized_nlocal_star_22_cost_fn", qnode_kwargs)
+
+    n = len(network_ansatzes[0].prepare_nodes)
+    x_inputs, J22_scalars = _nlocal_star_22_inputs(n)
+    star_expvals = vectorized_parity_expval_fn(network_ansatzes, x_inputs)
+
+    def cost(batch_settings, batch_ids=None):
+        return _nlocal_star_22_cost(
+            star_expvals(batch_settings, batch_ids=batch_ids), J22_scalars, n
+        )
+
+    return cost
+
+
+VECTORIZED_COST_FNS = {
+    factorized_nlocal_chain_cost_22: vectorized_nlocal_chain_cost_22,
+    factorized_nlocal_star_22_cost_fn: vectorized_nlocal_star_22_cost_fn,
+}
+
+
+def get_vectorized_cost_fn(cost_fn):
+    """Returns the vectorized counterpart of the cost function factory ``cost_fn``.
+
+    :param cost_fn: A cost function factory, e.g., ``factorized_nlocal_chain_cost_22``.
+    :type cost_fn: Function
+
+    :returns: The vectorized cost function factory or ``None`` if ``cost_fn`` has no
+              vectorized counterpart.
+    :rtype: Function
+    """
+    return VECTORIZED_COST_FNS.get(cost_fn, None)